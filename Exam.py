@@ -1,66 +1,199 @@
 # Exam.py
-import re
+import atexit
+import math
+import os
+import random
+import threading
 import urllib.parse
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, List, Tuple
 
 import streamlit as st
 import streamlit.components.v1 as components
-
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import metrics
+
+from analytics import EventLog
+from answers import is_correct, review_markdown, review_positions, score
+from bank import load_exam, load_exam_cached, open_bank
+from explanations import ExplanationStore
+from irt import AdaptiveTest, ItemParams, load_params
+from mock_exam import BankIndex, ExamSelection, build_bank_index, sample_exam
+from parse_cache import ParseCache
+from perf import rerun_timer
+from search import SearchIndex
+from srs import Scheduler, question_uid
+from tagger import DOMAINS, SERVICE_NAMES, TagIndex
+from store import letters_to_mask, mask_to_letters
+from watcher import ExamWatcher, scan
 from core import (
+    ExamIndex,
     Option,
     Question,
-    parse_exam,
     build_prompt,
+    question_hash,
+    load_all_exams,
     LANGS,
 )
 
 
 # ========================= Caching & IO ========================= #
 
-@st.cache_data(show_spinner=False)
-def load_exam_files(exam_folder: Path) -> List[str]:
-    if not exam_folder.exists():
-        return []
-    return sorted(
-        [f.name for f in exam_folder.glob("*.md")],
-        key=lambda s: int(re.search(r"(\d+)", s).group(1)) if re.search(r"(\d+)", s) else 0,
-    )
+@st.cache_resource(show_spinner=False)
+def warm_exam_index(exam_folder: Path) -> "Future[ExamIndex]":
+    """Start loading the whole folder in the background, each file from the bank or the parse cache
+    when they are current, as the watcher's first snapshot; everything that needs the index waits on
+    this one future. The result is a view over the snapshot's stores, with the load timings."""
+    watcher = load_watcher(exam_folder)
+    future: "Future[ExamIndex]" = Future()
+
+    def run():
+        try:
+            stats = scan(exam_folder)
+            loaded = load_all_exams(exam_folder, loader=load_exam_cached)
+            watcher.seed(loaded.files, stats)
+            index = watcher.snapshot.exam_index()
+            index.timings.update(loaded.timings)
+            future.set_result(index)
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="exam-index-warmup", daemon=True).start()
+    return future
 
 
 @st.cache_resource(show_spinner=False)
+def load_bank():
+    return open_bank()
+
+
+@st.cache_resource(show_spinner=False)
+def load_parse_cache() -> ParseCache:
+    cache = ParseCache()
+    for key in ("hits", "misses", "writes", "evictions"):
+        metrics.register(f"clf_parse_cache_{key}_total", lambda key=key: cache.stats[key], kind="counter")
+    return cache
+
+
+@metrics.timed("clf_load_questions_seconds")
 def load_questions(path: Path) -> List[Question]:
-    text = path.read_text(encoding="utf-8")
-    return parse_exam(text)
+    return load_exam(path, load_bank(), load_parse_cache())
 
 
-# ========================= UI ========================= #
+@st.cache_resource(show_spinner=False)
+def load_watcher(exam_folder: Path) -> ExamWatcher:
+    """Parsed exams that follow edits to the folder; see watcher.py. The first snapshot is seeded
+    by warm_exam_index, and the watcher only starts refreshing after that."""
+    watcher = ExamWatcher(exam_folder, loader=load_questions)
 
-def main():
-    st.set_page_config(page_title="AWS Exam Practice", layout="wide")
+    def drop_bank_caches(snapshot, changes):
+        # rebuilt from the new snapshot on next use; running exams keep the index they hold
+        load_bank_index.clear()
+        load_uid_map.clear()
+        load_item_params.clear()
 
-    version = Path("version.txt").read_text(encoding="utf-8").strip() if Path("version.txt").exists() else "dev"
-    st.title(f"📘 AWS Certified Cloud Practitioner Practice Exam  (v{version})")
+    watcher.on_change(drop_bank_caches)
+    return watcher.start()
 
-    # Sidebar
-    with st.sidebar:
-        st.header("Settings")
-        lang = st.selectbox("🌐 Explanation language", LANGS, index=LANGS.index("English") if "English" in LANGS else 0)
-        mode = st.radio("Mode", ["Practice", "Exam"], horizontal=True, index=0)
 
-        exam_folder = Path("exams")
-        files = load_exam_files(exam_folder)
-        if not files:
-            st.error("The exams folder is empty or missing. Add .md files with exams.")
-            st.stop()
-        selected_file = st.selectbox("Exam file", files)
+def current_exam_index(exam_folder: Path) -> ExamIndex:
+    """The watcher's current snapshot as an index, once the background load has seeded it."""
+    warm_exam_index(exam_folder).result()
+    return load_watcher(exam_folder).snapshot.exam_index()
+
+
+@st.cache_resource(show_spinner=False)
+def load_search_index(exam_folder: Path) -> SearchIndex:
+    """Search index that re-indexes each edited, added or removed exam file in place."""
+    search = SearchIndex()
+    lock = threading.Lock()  # an edit during the first build is applied after it
+
+    def update(snapshot, changes):
+        with lock:
+            for name in changes.removed:
+                search.remove_file(name)
+            for name in changes.added + changes.changed:
+                if name in snapshot.questions:
+                    search.update_file(name, snapshot.questions[name])
+
+    warm_exam_index(exam_folder).result()  # seeded before listening, outside the lock
+    with lock:
+        load_watcher(exam_folder).on_change(update)
+        for name, qs in current_exam_index(exam_folder).files.items():
+            search.update_file(name, qs)
+    return search
+
+
+@st.cache_resource(show_spinner=False)
+def load_bank_index(exam_folder: Path) -> BankIndex:
+    index = current_exam_index(exam_folder)
+    return build_bank_index(index, tags=TagIndex().tag_files(index.files))
+
+
+@st.cache_resource(show_spinner=False)
+def load_uid_map(exam_folder: Path) -> Dict[str, int]:
+    """Stable question id -> global id in the bank index."""
+    bank = load_bank_index(exam_folder)
+    return {question_uid(bank.file_name(gid), q): gid for gid, q in enumerate(bank.store)}
+
+
+@st.cache_resource(show_spinner=False)
+def load_item_params(exam_folder: Path) -> ItemParams:
+    """2PL parameters (see irt.py) by global id in the bank index."""
+    return ItemParams.for_bank(load_params(), load_uid_map(exam_folder), len(load_bank_index(exam_folder)))
+
+
+@st.cache_resource(show_spinner=False)
+def load_scheduler() -> Scheduler:
+    scheduler = Scheduler()
+    atexit.register(scheduler.flush)
+    return scheduler
 
-    # ===== Bug report banner & floating action button =====
-    REPO = "https://github.com/k30medvedev/aws-clf-exam-prep"
 
-    def make_bug_url(version_str: str, exam_file: str) -> str:
-        title = f"[bug] v{version_str} · {exam_file}"
-        body = f"""**Version**: v{version_str}
+@st.cache_resource(show_spinner=False)
+def load_event_log() -> EventLog:
+    log = EventLog()
+    atexit.register(log.flush)
+    return log
+
+
+@st.cache_resource(show_spinner=False)
+def load_explanations() -> ExplanationStore:
+    return ExplanationStore()
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    port = os.environ.get("CLF_METRICS_PORT")
+    if metrics.ENABLED and port:
+        metrics.serve(int(port))
+
+
+@st.cache_data(show_spinner=False, max_entries=50_000)
+def explanation_url(question: str, options: Tuple[Tuple[str, str], ...], correct: Tuple[str, ...], lang: str) -> str:
+    q = Question(number=0, question=question, options=[Option(L, t) for L, t in options], correct=list(correct))
+    return "https://chat.openai.com/?q=" + urllib.parse.quote(build_prompt(q, lang))
+
+
+REVIEW_PAGE_SIZE = 10
+
+
+# ========================= Static chrome ========================= #
+
+REPO = "https://github.com/k30medvedev/aws-clf-exam-prep"
+
+
+@st.cache_data(show_spinner=False)
+def read_version() -> str:
+    return Path("version.txt").read_text(encoding="utf-8").strip() if Path("version.txt").exists() else "dev"
+
+
+@st.cache_data(show_spinner=False)
+def make_bug_url(version_str: str, exam_file: str) -> str:
+    title = f"[bug] v{version_str} · {exam_file}"
+    body = f"""**Version**: v{version_str}
 **Exam file**: {exam_file}
 
 **Steps to reproduce**
@@ -75,18 +208,17 @@ def main():
 
 **Screenshots / logs**
 -"""
-        return (
-            f"{REPO}/issues/new"
-            f"?labels=bug"
-            f"&title={urllib.parse.quote_plus(title)}"
-            f"&body={urllib.parse.quote_plus(body)}"
-        )
-
-    bug_url = make_bug_url(version, selected_file)
+    return (
+        f"{REPO}/issues/new"
+        f"?labels=bug"
+        f"&title={urllib.parse.quote_plus(title)}"
+        f"&body={urllib.parse.quote_plus(body)}"
+    )
 
-    st.info(f"🐞 Found a typo or bug? [Create an issue]({bug_url}) — it takes a minute.")
 
-    components.html(f"""
+@st.cache_data(show_spinner=False)
+def bug_fab_html(bug_url: str) -> str:
+    return f"""
     <style>
     .bug-fab {{
       position: fixed; right: 18px; bottom: 18px; z-index: 9999;
@@ -97,124 +229,12 @@ def main():
     .bug-fab:hover {{ opacity:.92 }}
     </style>
     <a class="bug-fab" href="{bug_url}" target="_blank" rel="noopener">🐞 Report a bug</a>
-    """, height=0)
-
-    # Init state on file change
-    if st.session_state.get("last_exam") != selected_file:
-        qs = load_questions(Path("exams") / selected_file)
-        st.session_state.questions = qs
-        st.session_state.current = 0
-        st.session_state.answers_by_num = {}  # number -> answer dict
-        st.session_state.score = 0
-        st.session_state.last_exam = selected_file
-        st.session_state.show_answer = False
-        st.session_state.selections = {}  # question_number -> list[str]
-
-    questions: List[Question] = st.session_state.get("questions", [])
-    if not questions:
-        st.warning("Failed to parse questions. Check the .md format.")
-        st.stop()
-
-    current = st.session_state.current
-
-    # Progress + restart
-    a, b = st.columns([3, 1])
-    with a:
-        st.write(f"Progress: **{min(current + 1, len(questions))} / {len(questions)}**")
-        st.progress((current) / max(len(questions), 1))
-    with b:
-        if st.button("🔁 Restart exam", use_container_width=True):
-            for k in list(st.session_state.keys()):
-                del st.session_state[k]
-            st.rerun()
-
-    # ===== Render current question =====
-    if current < len(questions):
-        q = questions[current]
-        st.subheader(f"Question {q.number}")
-        st.write(q.question)
-
-        is_multi = len(q.correct) > 1
-        if is_multi:
-            st.caption(f"Correct count: choose {len(q.correct)}")
+    """
 
-        # Pretty labels
-        letter_to_text: Dict[str, str] = {o.letter: o.text for o in q.options}
-        letters = [o.letter for o in q.options]
 
-        with st.form(key=f"qform_{q.number}", clear_on_submit=False):
-            if is_multi:
-                default = st.session_state.selections.get(q.number, [])
-                selected_letters = st.multiselect(
-                    "Select all that apply:",
-                    letters,
-                    default=default,
-                    format_func=lambda L: f"{L}. {letter_to_text[L]}",
-                )
-            else:
-                default = st.session_state.selections.get(q.number, [letters[0]])
-                def_idx = letters.index(default[0]) if default and default[0] in letters else 0
-                selected_letter = st.radio(
-                    "Select one answer:",
-                    letters,
-                    index=def_idx,
-                    format_func=lambda L: f"{L}. {letter_to_text[L]}",
-                )
-                selected_letters = [selected_letter]
-
-            c1, c2, c3 = st.columns([1, 1, 1])
-            peek = c1.form_submit_button("👁 Show answer", disabled=(mode != "Practice"))
-            prev = c2.form_submit_button("◀ Previous", disabled=(current == 0 or mode != "Practice"))
-            submit = c3.form_submit_button("Submit answer")
-
-        # Persist selection
-        st.session_state.selections[q.number] = selected_letters
-
-        # Controls
-        if peek and mode == "Practice":
-            st.session_state.show_answer = True
-
-        if prev and mode == "Practice":
-            st.session_state.show_answer = False
-            st.session_state.current = max(0, current - 1)
-            st.rerun()
-
-        if st.session_state.get("show_answer", False) and mode == "Practice":
-            st.info(f"💡 **Correct answer:** {', '.join(q.correct)}")
-
-        def do_submit(sel_letters: List[str]):
-            if is_multi and not sel_letters:
-                st.warning("You have not selected any options.")
-                return
-            correct_set = set(q.correct)
-            user_set = set(sel_letters)
-            is_correct = user_set == correct_set
-
-            payload = {
-                "number": q.number,
-                "question": q.question,
-                "options": [f"{o.letter}. {o.text}" for o in q.options],
-                "selected": sel_letters,
-                "correct": q.correct,
-                "is_correct": is_correct,
-            }
-            st.session_state.answers_by_num[q.number] = payload
-            st.session_state.score = sum(1 for v in st.session_state.answers_by_num.values() if v["is_correct"])
-            st.session_state.current += 1
-            st.session_state.show_answer = False
-            st.rerun()
-
-        if submit:
-            do_submit(selected_letters)
-
-        # Copy prompt
-        st.markdown("---")
-        st.markdown("**Need help understanding this question?**")
-        prompt = build_prompt(q, lang)
-        safe_prompt = prompt.replace("</", "</ ")
-
-        components.html(
-            f"""
+def copy_prompt_html(prompt: str) -> str:
+    safe_prompt = prompt.replace("</", "</ ")
+    return f"""
             <textarea id="prompt-text" style="position:absolute; left:-9999px;">{safe_prompt}</textarea>
             <button id="copy-btn" style="margin-top:10px;">📋 Copy prompt</button>
             <script>
@@ -232,67 +252,342 @@ def main():
                 }}
             }});
             </script>
-            """,
-            height=48,
-        )
+            """
 
-    # ===== Results =====
-    else:
-        st.success("✅ Exam Completed!")
-        total = len(questions)
-        answered = len(st.session_state.answers_by_num)
-        correct = st.session_state.score
-        percent = (correct / total) * 100 if total else 0.0
-        st.write(f"**Answered:** {answered} / {total}")
-        st.write(f"**Correct:** {correct} / {total}")
-        st.write(f"**Percentage:** {percent:.2f}%")
-        if percent >= 75:
-            st.success("🎉 You passed the exam!")
-        else:
-            st.warning("❌ You did not reach the passing score (75%).")
 
-        st.markdown("---")
-        st.subheader("📋 Review of Your Answers")
-        show_only_incorrect = st.checkbox("Show only incorrect answers")
-
-        for num in sorted(st.session_state.answers_by_num.keys()):
-            ans = st.session_state.answers_by_num[num]
-            if show_only_incorrect and ans["is_correct"]:
-                continue
-
-            st.markdown(f"### Question {ans['number']} — {'✅ Correct' if ans['is_correct'] else '❌ Incorrect'}")
-            st.markdown(f"**{ans['question']}**")
-
-            st.markdown("**Options:**")
-            for opt in ans["options"]:
-                letter = opt.split(".")[0]
-                if letter in ans["correct"] and letter in ans["selected"]:
-                    st.markdown(f"- ✔️ **{opt}**")
-                elif letter in ans["correct"]:
-                    st.markdown(f"- ✅ {opt}")
-                elif letter in ans["selected"]:
-                    st.markdown(f"- ❌ {opt}")
+def restart_session():
+    for k in list(st.session_state.keys()):
+        del st.session_state[k]
+    st.rerun()
+
+
+# ========================= Question panel ========================= #
+
+def _selected_mask(pos: int, is_multi: bool) -> int:
+    value = st.session_state.get(f"answer_{pos}")
+    if is_multi:
+        return letters_to_mask(value or [])
+    return letters_to_mask([value]) if value else 0
+
+
+def submit_answer(q, q_file: str, profile: str, exam_file: str):
+    pos = st.session_state.current
+    selected = _selected_mask(pos, len(q.correct) > 1)
+    st.session_state.selections[pos] = selected
+    if not selected:
+        st.session_state.flash = "You have not selected any options."
+        return
+    uid = question_uid(q_file, q)
+    load_scheduler().review(profile, uid, grade=4 if is_correct(q, selected) else 1)
+
+    log = load_event_log()
+    if st.session_state.get("attempt") is None:
+        st.session_state.attempt = log.start_attempt(exam_file, profile)
+    log.record(st.session_state.attempt, uid, selected, letters_to_mask(q.correct))
+    if st.session_state.get("adaptive") is not None:
+        st.session_state.adaptive.answer(is_correct(q, selected))  # appends the next question unless done
+
+    st.session_state.answers_by_pos[pos] = selected
+    st.session_state.score = score(st.session_state.questions, st.session_state.answers_by_pos)
+    st.session_state.current += 1
+    st.session_state.show_answer = False
+
+
+def previous_question(is_multi: bool):
+    pos = st.session_state.current
+    st.session_state.selections[pos] = _selected_mask(pos, is_multi)
+    st.session_state.show_answer = False
+    st.session_state.current = max(0, pos - 1)
+
+
+def peek_answer(is_multi: bool):
+    pos = st.session_state.current
+    st.session_state.selections[pos] = _selected_mask(pos, is_multi)
+    st.session_state.show_answer = True
+
+
+@st.fragment
+def question_panel(questions, mode: str, lang: str, profile: str, exam_file: str):
+    """The current question and its controls.
+
+    Runs as a fragment: the form buttons update session state in callbacks, so
+    answering or going back reruns only this function, not the sidebar and page
+    chrome. Finishing the exam triggers one full rerun for the results page.
+    """
+    with rerun_timer("question") as timer:
+        current = st.session_state.current
+        if current >= len(questions):
+            st.rerun()
+        adaptive = st.session_state.get("adaptive")
+        total = adaptive.max_items if adaptive is not None else len(questions)
+
+        with timer.section("progress"):
+            a, b = st.columns([3, 1])
+            with a:
+                if adaptive is not None and adaptive.params.calibrated:
+                    st.write(f"Progress: **{current + 1}** (adaptive, at most {total})")
                 else:
-                    st.markdown(f"- {opt}")
-
-            st.markdown(f"**Your answer:** {', '.join(ans['selected']) or '—'}")
-            st.markdown(f"**Correct answer:** {', '.join(ans['correct'])}")
-
-            q_for_prompt = Question(
-                number=ans["number"],
-                question=ans["question"],
-                options=[Option(letter=o.split(".")[0], text=o.split(".", 1)[1].strip()) for o in ans["options"]],
-                correct=ans["correct"],
-            )
-            prompt = build_prompt(q_for_prompt, lang)
-            chat_url = "https://chat.openai.com/?q=" + urllib.parse.quote(prompt)
-            st.markdown(f"[💬 Ask ChatGPT for explanation]({chat_url})", unsafe_allow_html=True)
+                    st.write(f"Progress: **{min(current + 1, total)} / {total}**")
+                st.progress(current / max(total, 1))
+            with b:
+                if st.button("🔁 Restart exam", use_container_width=True):
+                    restart_session()
+
+        with timer.section("form"):
+            q = questions[current]
+            if isinstance(questions, ExamSelection):
+                q_file = questions.bank.file_name(questions.ids[current])
+                st.subheader(f"Question {current + 1}")
+                st.caption(f"{q_file} · question {q.number}")
+            else:
+                q_file = exam_file
+                st.subheader(f"Question {q.number}")
+            st.write(q.question)
+
+            is_multi = len(q.correct) > 1
+            if is_multi:
+                st.caption(f"Correct count: choose {len(q.correct)}")
+
+            # Pretty labels
+            letter_to_text: Dict[str, str] = {o.letter: o.text for o in q.options}
+            letters = [o.letter for o in q.options]
+
+            with st.form(key=f"qform_{current}", clear_on_submit=False):
+                if is_multi:
+                    default = mask_to_letters(st.session_state.selections.get(current, 0))
+                    st.multiselect(
+                        "Select all that apply:",
+                        letters,
+                        default=[L for L in default if L in letters],
+                        format_func=lambda L: f"{L}. {letter_to_text[L]}",
+                        key=f"answer_{current}",
+                    )
+                else:
+                    default = mask_to_letters(st.session_state.selections.get(current, 0))
+                    def_idx = letters.index(default[0]) if default and default[0] in letters else 0
+                    st.radio(
+                        "Select one answer:",
+                        letters,
+                        index=def_idx,
+                        format_func=lambda L: f"{L}. {letter_to_text[L]}",
+                        key=f"answer_{current}",
+                    )
+
+                c1, c2, c3 = st.columns([1, 1, 1])
+                c1.form_submit_button("👁 Show answer", disabled=(mode != "Practice"),
+                                      on_click=peek_answer, args=(is_multi,))
+                c2.form_submit_button("◀ Previous", disabled=(current == 0 or mode != "Practice" or adaptive is not None),
+                                      on_click=previous_question, args=(is_multi,))
+                c3.form_submit_button("Submit answer", on_click=submit_answer,
+                                      args=(q, q_file, profile, exam_file))
+
+        flash = st.session_state.pop("flash", None)
+        if flash:
+            st.warning(flash)
+
+        if st.session_state.get("show_answer", False) and mode == "Practice":
+            st.info(f"💡 **Correct answer:** {', '.join(q.correct)}")
+
+        # Copy prompt
+        with timer.section("prompt"):
             st.markdown("---")
+            st.markdown("**Need help understanding this question?**")
+            components.html(copy_prompt_html(build_prompt(q, lang)), height=48)
 
-        if st.button("🔁 Restart Exam"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
-            st.rerun()
+
+# ========================= UI ========================= #
+
+def main():
+    st.set_page_config(page_title="AWS Exam Practice", layout="wide")
+
+    if metrics.ENABLED:
+        start_metrics_server()
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            metrics.touch_session(ctx.session_id)
+
+    with rerun_timer("full") as timer:
+        with timer.section("chrome"):
+            version = read_version()
+            st.title(f"📘 AWS Certified Cloud Practitioner Practice Exam  (v{version})")
+
+        # Sidebar
+        with timer.section("sidebar"), st.sidebar:
+            st.header("Settings")
+            lang = st.selectbox("🌐 Explanation language", LANGS,
+                                index=LANGS.index("English") if "English" in LANGS else 0)
+            mode = st.radio("Mode", ["Practice", "Exam"], horizontal=True, index=0)
+
+            exam_folder = Path("exams")
+            warmup = warm_exam_index(exam_folder)
+            if not warmup.done():
+                with st.spinner("Loading exams…"):
+                    warmup.result()
+            index = warmup.result()
+            snapshot = load_watcher(exam_folder).snapshot
+            files = snapshot.files
+            if not files:
+                st.error("The exams folder is empty or missing. Add .md files with exams.")
+                st.stop()
+            profile = st.text_input("👤 Study profile", value="default").strip() or "default"
+            source = st.radio("Questions", ["Exam file", "Random mock exam", "Review due", "Adaptive exam"],
+                              horizontal=True)
+            if source == "Exam file":
+                selected_file = st.selectbox("Exam file", files)
+                exam_key = selected_file
+            elif source == "Random mock exam":
+                if "mock_seed" not in st.session_state:
+                    st.session_state.mock_seed = random.randrange(1_000_000)
+                seed = int(st.number_input("Seed (same seed, same exam)", min_value=0, step=1, key="mock_seed"))
+                stratify = st.checkbox("Keep the bank's single/multi-answer mix", value=True)
+                domains = tuple(st.multiselect("Domains (all if empty)", DOMAINS))
+                services = tuple(st.multiselect("AWS services (all if empty)", SERVICE_NAMES))
+                selected_file = f"mock exam (seed {seed})"
+                exam_key = ("mock", seed, stratify, domains, services)
+            elif source == "Review due":
+                due_count = load_scheduler().due_count(profile, known=load_uid_map(exam_folder))
+                st.caption(f"{due_count} cards due for “{profile}”")
+                if st.button("🔄 Load due cards"):
+                    st.session_state.review_round = st.session_state.get("review_round", 0) + 1
+                selected_file = "review due"
+                exam_key = ("review", profile, st.session_state.get("review_round", 0))
+            else:
+                if load_item_params(exam_folder).calibrated:
+                    st.caption("Each question is picked for your estimated ability; the exam ends once "
+                               "pass or fail is clear.")
+                else:
+                    st.caption("⚠️ Question difficulties are not calibrated yet (run `python irt.py fit` once "
+                               "enough answers are logged), so this is a fixed-length exam of random questions "
+                               "scored by percentage.")
+                if st.button("🔄 New adaptive exam"):
+                    st.session_state.adaptive_round = st.session_state.get("adaptive_round", 0) + 1
+                selected_file = "adaptive exam"
+                exam_key = ("adaptive", st.session_state.get("adaptive_round", 0))
+            search_query = st.text_input("🔎 Search all questions", placeholder="e.g. trusted advisor")
+
+            cache_stats = load_parse_cache().stats
+            st.caption(f"Parse cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses")
+            with st.expander(f"Question bank: {index.total} questions, {sum(index.timings.values()):.2f}s load"):
+                for name, seconds in index.timings.items():
+                    st.caption(f"{name}: {len(index.files[name])} questions in {seconds * 1000:.0f} ms")
+
+        # ===== Bug report banner & floating action button =====
+        with timer.section("chrome"):
+            bug_url = make_bug_url(version, selected_file)
+            st.info(f"🐞 Found a typo or bug? [Create an issue]({bug_url}) — it takes a minute.")
+            components.html(bug_fab_html(bug_url), height=0)
+
+        if search_query.strip():
+            with timer.section("search"):
+                hits = load_search_index(exam_folder).search(search_query)
+                with st.expander(f"Search results for “{search_query}” ({len(hits)})", expanded=True):
+                    if not hits:
+                        st.write("No matching questions.")
+                    for hit in hits:
+                        st.markdown(f"**{hit.file} · Question {hit.question.number}** — {hit.question.question}")
+                        st.caption(" · ".join(f"{o.letter}. {o.text}" for o in hit.question.options)
+                                   + f" — Correct: {', '.join(hit.question.correct)}")
+
+        # Init state on exam change
+        with timer.section("state"):
+            if st.session_state.get("last_exam") != exam_key:
+                adaptive = None
+                if source == "Exam file":
+                    qs = snapshot.questions[selected_file]
+                elif source == "Review due":
+                    uid_map = load_uid_map(exam_folder)
+                    due = load_scheduler().due(profile, limit=100, known=uid_map)
+                    qs = ExamSelection(load_bank_index(exam_folder), [uid_map[u] for u in due])
+                elif source == "Adaptive exam":
+                    adaptive = AdaptiveTest(load_item_params(exam_folder))
+                    adaptive.start()
+                    qs = ExamSelection(load_bank_index(exam_folder), adaptive.ids)  # grows as questions are picked
+                else:
+                    bank = load_bank_index(exam_folder)
+                    qs = ExamSelection(bank, sample_exam(bank, seed=seed, stratify=stratify, tags=domains or None,
+                                                         services=services or None))
+                st.session_state.questions = qs
+                st.session_state.current = 0
+                st.session_state.answers_by_pos = {}  # position in exam -> selected-letters bitmask
+                st.session_state.score = 0
+                st.session_state.last_exam = exam_key
+                st.session_state.show_answer = False
+                st.session_state.selections = {}  # position in exam -> selected-letters bitmask
+                st.session_state.attempt = None  # analytics attempt id, set on the first answer
+                st.session_state.adaptive = adaptive
+
+        questions: List[Question] = st.session_state.get("questions", [])
+        if source == "Exam file" and snapshot.questions.get(selected_file) is not questions:
+            st.caption("✏️ This exam file was edited. Restart the exam to load the new version.")
+        if not questions and source == "Review due":
+            st.success("🎉 Nothing due for review right now. Answer more questions or come back later.")
+            st.stop()
+        if not questions and source == "Random mock exam":
+            st.info("No questions match the chosen domains and services.")
+            st.stop()
+        if not questions:
+            st.warning("Failed to parse questions. Check the .md format.")
+            st.stop()
+
+        # ===== Render current question =====
+        if st.session_state.current < len(questions):
+            with timer.section("question"):
+                question_panel(questions, mode, lang, profile, selected_file)
+
+        # ===== Results =====
+        else:
+            with timer.section("results"):
+                render_results(questions, lang)
+
+
+def render_results(questions, lang: str):
+    st.success("✅ Exam Completed!")
+    total = len(questions)
+    answered = len(st.session_state.answers_by_pos)
+    correct = st.session_state.score
+    percent = (correct / total) * 100 if total else 0.0
+    st.write(f"**Answered:** {answered} / {total}")
+    st.write(f"**Correct:** {correct} / {total}")
+    st.write(f"**Percentage:** {percent:.2f}%")
+    adaptive = st.session_state.get("adaptive")
+    if adaptive is not None and adaptive.params.calibrated:
+        ability, sd = adaptive.ability
+        st.write(f"**Estimated ability:** {ability:+.2f} ± {sd:.2f} (pass mark {adaptive.params.cut:+.2f}) · "
+                 f"**Pass probability:** {adaptive.pass_probability:.0%}")
+        if adaptive.pass_probability >= 0.5:
+            st.success("🎉 You would likely pass the exam!")
+        else:
+            st.warning("❌ You would likely not reach the passing score (75%).")
+    elif percent >= 75:
+        st.success("🎉 You passed the exam!")
+    else:
+        st.warning("❌ You did not reach the passing score (75%).")
+
+    st.markdown("---")
+    st.subheader("📋 Review of Your Answers")
+    show_only_incorrect = st.checkbox("Show only incorrect answers")
+
+    answers = st.session_state.answers_by_pos
+    explanations = load_explanations()
+    positions = review_positions(questions, answers, show_only_incorrect)
+    pages = max(1, math.ceil(len(positions) / REVIEW_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = int(st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1,
+                                   key=f"review_page_{show_only_incorrect}"))
+    for pos in positions[(page - 1) * REVIEW_PAGE_SIZE:page * REVIEW_PAGE_SIZE]:
+        q, selected = questions[pos], answers[pos]
+        st.markdown(review_markdown(q, selected))
+        explanation = explanations.get(question_hash(q), lang)
+        if explanation:
+            with st.expander("💡 Explanation", expanded=not is_correct(q, selected)):
+                st.markdown(explanation)
+        chat_url = explanation_url(q.question, tuple((o.letter, o.text) for o in q.options), tuple(q.correct), lang)
+        st.markdown(f"[💬 Ask ChatGPT for explanation]({chat_url})", unsafe_allow_html=True)
+        st.markdown("---")
+
+    if st.button("🔁 Restart Exam"):
+        restart_session()
 
 
 if __name__ == "__main__":
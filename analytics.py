@@ -0,0 +1,308 @@
+# analytics.py
+"""Answer analytics: an append-only submission log and incremental rollups.
+
+    python analytics.py [--top 20]   # hardest questions and their most picked distractor
+
+Every submitted answer is appended to a SQLite database (WAL mode; buffered
+and written in one transaction per batch, like srs.Scheduler). Question ids
+(srs.question_uid) and exam attempts are interned into small tables, so an
+event row is a handful of integers.
+
+``Rollup.refresh`` reads only events past the last id it has seen, in chunks,
+and folds them in place into numpy arrays: per-question answer, correct and
+per-letter pick counts indexed by question id, plus a compact (attempt,
+question, correct) item table that grows by doubling, so a refresh costs
+O(new events). Reports are vectorized over those with pandas:
+
+- accuracy: share of submitted answers that were correct;
+- pick rates: share of answers that selected each letter;
+- discrimination: accuracy in the top 27% of attempts by score minus accuracy
+  in the bottom 27% (attempts with at least ``min_answered`` answers);
+- score distribution: attempt scores per exam in 10-point bins.
+
+Configure the location with CLF_ANALYTICS_DB (default data/analytics.sqlite3).
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DB_PATH = Path(os.environ.get("CLF_ANALYTICS_DB", "data/analytics.sqlite3"))
+LETTERS = "ABCDEF"
+GROUP_SHARE = 0.27  # upper/lower group size for the discrimination index
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    qid TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    exam TEXT NOT NULL,
+    user TEXT NOT NULL,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    attempt INTEGER NOT NULL,
+    question INTEGER NOT NULL,
+    selected INTEGER NOT NULL,  -- bitmask, bit 0 = "A"
+    correct INTEGER NOT NULL    -- bitmask of the right answer
+);
+"""
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+class EventLog:
+    """Append-only submission log; thread-safe, one instance per process is enough."""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, batch_size: int = 64, max_delay: float = 5.0):
+        self.db = _connect(path)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._question_ids: Dict[str, int] = {}
+        self._pending: List[Tuple[float, int, str, int, int]] = []
+        self._oldest_pending = 0.0
+
+    def start_attempt(self, exam: str, user: str, now: Optional[float] = None) -> int:
+        """Id of a new exam attempt; pass it to every ``record`` of that attempt."""
+        now = time.time() if now is None else now
+        with self._lock, self.db:
+            return self.db.execute("INSERT INTO attempts (exam, user, started) VALUES (?, ?, ?)",
+                                   (exam, user, now)).lastrowid
+
+    def record(self, attempt: int, qid: str, selected: int, correct: int, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            self._pending.append((now, attempt, qid, selected, correct))
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._oldest_pending >= self.max_delay):
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        with self.db:
+            new = {qid for _, _, qid, _, _ in self._pending if qid not in self._question_ids}
+            if new:
+                self.db.executemany("INSERT OR IGNORE INTO questions (qid) VALUES (?)", [(q,) for q in new])
+                for qid in new:
+                    (self._question_ids[qid],) = self.db.execute(
+                        "SELECT id FROM questions WHERE qid=?", (qid,)).fetchone()
+            self.db.executemany(
+                "INSERT INTO submissions (ts, attempt, question, selected, correct) VALUES (?, ?, ?, ?, ?)",
+                [(ts, attempt, self._question_ids[qid], selected, correct)
+                 for ts, attempt, qid, selected, correct in self._pending],
+            )
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
+class Rollup:
+    """Incremental aggregates over an EventLog database; thread-safe."""
+
+    _COUNTS = ["answered", "correct"] + [f"pick_{L}" for L in LETTERS]
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, chunk_size: int = 500_000):
+        self.db = _connect(path)
+        self.chunk_size = chunk_size
+        self.last_id = 0
+        self._lock = threading.Lock()
+        # per question id (SQLite ids are dense from 1): running counts and the last correct mask
+        self._counts = np.zeros((0, len(self._COUNTS)), dtype=np.int64)
+        self._correct_mask = np.zeros(0, dtype=np.int64)
+        # item table (attempt, question, correct) in event order; capacity doubles as it fills
+        self._n = 0
+        self._attempt = np.zeros(0, dtype=np.int64)
+        self._question = np.zeros(0, dtype=np.int32)
+        self._correct = np.zeros(0, dtype=bool)
+        self._last: Optional[pd.DataFrame] = None
+        self._qids = pd.Series(dtype="object")
+        self._exams = pd.Series(dtype="object")
+
+    @property
+    def events(self) -> int:
+        return self._n
+
+    def refresh(self) -> int:
+        """Fold in events written since the last refresh; returns how many were new."""
+        with self._lock:
+            new = 0
+            while True:
+                rows = self.db.execute(
+                    "SELECT id, attempt, question, selected, correct FROM submissions "
+                    "WHERE id > ? ORDER BY id LIMIT ?", (self.last_id, self.chunk_size)).fetchall()
+                if not rows:
+                    break
+                self._fold(np.array(rows, dtype=np.int64))
+                self.last_id = int(rows[-1][0])
+                new += len(rows)
+            if new:
+                self._last = None
+                self._qids = self._read_names("SELECT id, qid FROM questions WHERE id > ?", self._qids)
+                self._exams = self._read_names("SELECT id, exam FROM attempts WHERE id > ?", self._exams)
+            return new
+
+    def _read_names(self, sql: str, known: pd.Series) -> pd.Series:
+        rows = self.db.execute(sql, (int(known.index.max()) if len(known) else 0,)).fetchall()
+        if not rows:
+            return known
+        ids, names = zip(*rows)
+        return pd.concat([known, pd.Series(names, index=ids, dtype="object")])
+
+    def _fold(self, a: np.ndarray):
+        """Add one chunk of events in place: O(chunk + questions), not O(history)."""
+        attempt, question, selected, correct_mask = a[:, 1], a[:, 2], a[:, 3], a[:, 4]
+        correct = selected == correct_mask
+
+        n_questions = int(question.max()) + 1
+        if n_questions > len(self._counts):
+            size = max(n_questions, 2 * len(self._counts))
+            self._counts = np.concatenate([self._counts, np.zeros((size - len(self._counts), len(self._COUNTS)),
+                                                                  dtype=np.int64)])
+            self._correct_mask = np.concatenate([self._correct_mask,
+                                                 np.zeros(size - len(self._correct_mask), dtype=np.int64)])
+        size = len(self._counts)
+        self._counts[:, 0] += np.bincount(question, minlength=size)
+        self._counts[:, 1] += np.bincount(question, weights=correct, minlength=size).astype(np.int64)
+        for bit in range(len(LETTERS)):
+            picked = (selected >> bit) & 1
+            self._counts[:, 2 + bit] += np.bincount(question, weights=picked, minlength=size).astype(np.int64)
+        last = len(question) - 1 - np.unique(question[::-1], return_index=True)[1]
+        self._correct_mask[question[last]] = correct_mask[last]
+
+        end = self._n + len(a)
+        if end > len(self._attempt):
+            size = max(end, 2 * len(self._attempt))
+            self._attempt = np.resize(self._attempt, size)
+            self._question = np.resize(self._question, size)
+            self._correct = np.resize(self._correct, size)
+        self._attempt[self._n:end] = attempt
+        self._question[self._n:end] = question
+        self._correct[self._n:end] = correct
+        self._n = end
+
+    # ---- reports ----
+    def _last_answers(self) -> pd.DataFrame:
+        """One row per (attempt, question): the answer that counted; kept until the next refresh."""
+        if self._last is None:
+            items = pd.DataFrame({"attempt": self._attempt[:self._n], "question": self._question[:self._n],
+                                  "correct": self._correct[:self._n]})
+            self._last = items.drop_duplicates(["attempt", "question"], keep="last")
+        return self._last
+
+    def _question_counts(self) -> pd.DataFrame:
+        """Running counts and correct mask of every question answered so far, by question id."""
+        seen = np.flatnonzero(self._counts[:, 0])
+        q = pd.DataFrame(self._counts[seen], index=seen, columns=self._COUNTS)
+        q["correct_mask"] = self._correct_mask[seen]
+        return q
+
+    def responses(self) -> pd.DataFrame:
+        """The answer that counted per (attempt, question): attempt, qid and correct."""
+        with self._lock:
+            last = self._last_answers()
+            return pd.DataFrame({"attempt": last["attempt"].to_numpy(),
+                                 "qid": last["question"].map(self._qids).to_numpy(),
+                                 "correct": last["correct"].to_numpy()})
+
+    def attempt_scores(self, min_answered: int = 10) -> pd.DataFrame:
+        """Per attempt: exam, answered, correct and score (0..100)."""
+        with self._lock:
+            return self._attempt_scores(self._last_answers(), min_answered)
+
+    def _attempt_scores(self, last: pd.DataFrame, min_answered: int) -> pd.DataFrame:
+        scores = last.groupby("attempt")["correct"].agg(answered="size", correct="sum")
+        scores = scores[scores["answered"] >= min_answered]
+        scores.insert(0, "exam", scores.index.map(self._exams))
+        scores["score"] = scores["correct"] / scores["answered"] * 100
+        return scores
+
+    def question_stats(self, min_answered: int = 10) -> pd.DataFrame:
+        """Per question: accuracy, pick rate per letter, top distractor and discrimination.
+
+        ``min_answered`` is the smallest attempt counted for discrimination.
+        """
+        with self._lock:
+            q = self._question_counts()
+            out = pd.DataFrame(index=q.index)
+            out["qid"] = q.index.map(self._qids)
+            out["answered"] = q["answered"]
+            out["accuracy"] = q["correct"] / q["answered"]
+            picks = pd.DataFrame({L: q[f"pick_{L}"] / q["answered"] for L in LETTERS}, index=q.index)
+            masks = q["correct_mask"].to_numpy()
+            wrong = pd.DataFrame({L: (masks >> bit) & 1 == 0 for bit, L in enumerate(LETTERS)}, index=q.index)
+            distractors = picks.where(wrong, -1.0)
+            out["top_distractor"] = distractors.idxmax(axis=1).where(distractors.max(axis=1) > 0)
+            out["top_distractor_rate"] = distractors.max(axis=1).clip(lower=0)
+            out[[f"pick_{L}" for L in LETTERS]] = picks.to_numpy()
+            out["discrimination"] = self._discrimination(min_answered, q.index)
+            return out.sort_values("accuracy")
+
+    def _discrimination(self, min_answered: int, questions: pd.Index) -> pd.Series:
+        last = self._last_answers()
+        scores = self._attempt_scores(last, min_answered)
+        if len(scores) < 2:
+            return pd.Series(np.nan, index=questions)
+        rank = scores["score"].rank(method="first", pct=True)
+        group = pd.Series(np.select([rank > 1 - GROUP_SHARE, rank <= GROUP_SHARE], [1, -1], 0), index=rank.index)
+        g = last["attempt"].map(group).fillna(0).to_numpy()
+        grouped = last[g != 0].assign(group=g[g != 0])
+        acc = grouped.groupby(["question", "group"])["correct"].mean().unstack()
+        if 1 not in acc or -1 not in acc:
+            return pd.Series(np.nan, index=questions)
+        return (acc[1] - acc[-1]).reindex(questions)
+
+    def score_distribution(self, min_answered: int = 10, bin_width: int = 10) -> pd.DataFrame:
+        """Attempts per exam (rows) and score bin (columns, lower bound of the bin)."""
+        scores = self.attempt_scores(min_answered)
+        bins = (scores["score"] // bin_width * bin_width).clip(upper=100 - bin_width).astype(int)
+        return pd.crosstab(scores["exam"], bins).reindex(columns=range(0, 100, bin_width), fill_value=0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Hardest questions from the answer log.")
+    ap.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--min-answered", type=int, default=10, help="smallest attempt counted for discrimination")
+    args = ap.parse_args()
+
+    rollup = Rollup(args.db)
+    t0 = time.perf_counter()
+    rollup.refresh()
+    stats = rollup.question_stats(args.min_answered)
+    print(f"{rollup.events} answers, {len(stats)} questions in {time.perf_counter() - t0:.2f}s")
+    for _, row in stats.head(args.top).iterrows():
+        distractor = (f"{row.top_distractor} picked {row.top_distractor_rate:.0%}"
+                      if isinstance(row.top_distractor, str) else "—")
+        print(f"{row.accuracy:6.1%}  D={row.discrimination:+.2f}  n={row.answered:<6} {row.qid}  ({distractor})")
+
+
+if __name__ == "__main__":
+    main()
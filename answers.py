@@ -0,0 +1,56 @@
+# answers.py
+"""Compact per-session answer state.
+
+A session keeps, per exam position, only the letters it selected as a bitmask
+(bit 0 = "A", see store.letters_to_mask). Question text and options are never
+copied into session state: they are read from the shared, read-only question
+sequence the session points at (a watcher snapshot list or an ExamSelection
+over the bank's QuestionStore), and review markdown is built per shown page.
+"""
+from typing import Dict, List, Sequence
+
+from core import Question
+from store import letters_to_mask, mask_to_letters
+
+AnswerSheet = Dict[int, int]  # position in exam -> selected-letters bitmask
+
+
+def is_correct(q: Question, selected: int) -> bool:
+    return selected == letters_to_mask(q.correct)
+
+
+def score(questions: Sequence[Question], answers: AnswerSheet) -> int:
+    return sum(1 for pos, selected in answers.items() if is_correct(questions[pos], selected))
+
+
+def review_markdown(q: Question, selected: int) -> str:
+    """Markdown for one answered question in the results review."""
+    chosen = mask_to_letters(selected)
+    lines = [
+        f"### Question {q.number} — {'✅ Correct' if is_correct(q, selected) else '❌ Incorrect'}",
+        f"**{q.question}**",
+        "",
+        "**Options:**",
+        "",
+    ]
+    for o in q.options:
+        opt = f"{o.letter}. {o.text}"
+        if o.letter in q.correct and o.letter in chosen:
+            lines.append(f"- ✔️ **{opt}**")
+        elif o.letter in q.correct:
+            lines.append(f"- ✅ {opt}")
+        elif o.letter in chosen:
+            lines.append(f"- ❌ {opt}")
+        else:
+            lines.append(f"- {opt}")
+    lines += [
+        "",
+        f"**Your answer:** {', '.join(chosen) or '—'}",
+        "",
+        f"**Correct answer:** {', '.join(q.correct)}",
+    ]
+    return "\n".join(lines)
+
+
+def review_positions(questions: Sequence[Question], answers: AnswerSheet, only_incorrect: bool) -> List[int]:
+    return sorted(p for p, selected in answers.items() if not (only_incorrect and is_correct(questions[p], selected)))
@@ -0,0 +1,222 @@
+# bank.py
+"""Precompiled question bank.
+
+All exams/*.md files are compiled into one binary file so a cold worker can
+serve questions without running the markdown parser:
+
+    python bank.py [--exams exams] [--out exams.bank]
+
+Layout (little-endian, every integer is u32):
+
+    header   MAGIC, VERSION, PARSER_VERSION, n_sources, n_questions, n_options, n_strings
+    strings  n_strings + 1 offsets into the UTF-8 blob (string table)
+    sources  n_sources x (name, sha256, first question, end question)
+    qs       n_questions x (number, text, correct letters)
+    q_opts   n_questions + 1 offsets into the options array
+    options  n_options x (letter, text)
+    blob     interned UTF-8 strings
+
+Fields named as text are string-table ids, so repeated strings are stored once.
+A bank compiled by another core.PARSER_VERSION is ignored like a stale file hash.
+"""
+import argparse
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import metrics
+from core import PARSER_VERSION, Option, Question, parse_exam
+from parse_cache import ParseCache
+
+MAGIC = b"CLFBANK\0"
+VERSION = 2
+DEFAULT_BANK_PATH = Path("exams.bank")
+
+_HEADER = struct.Struct("<8s6I")
+_SOURCE_WIDTH = 4
+_QUESTION_WIDTH = 3
+_OPTION_WIDTH = 2
+
+
+def file_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+# ---- build ----
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.offsets = array("I", [0])
+        self.blob = bytearray()
+
+    def add(self, s: str) -> int:
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = len(self.ids)
+            self.ids[s] = sid
+            self.blob += s.encode("utf-8")
+            self.offsets.append(len(self.blob))
+        return sid
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def build_bank(exam_files: List[Path], out_path: Path = DEFAULT_BANK_PATH) -> Path:
+    strings = _StringTable()
+    sources = array("I")
+    qs = array("I")
+    q_opts = array("I", [0])
+    options = array("I")
+
+    n_questions = 0
+    for path in exam_files:
+        data = path.read_bytes()
+        first = n_questions
+        for q in parse_exam(data.decode("utf-8")):
+            qs.extend((q.number, strings.add(q.question), strings.add("".join(q.correct))))
+            for o in q.options:
+                options.extend((strings.add(o.letter), strings.add(o.text)))
+            q_opts.append(len(options) // _OPTION_WIDTH)
+            n_questions += 1
+        sources.extend((strings.add(path.name), strings.add(file_hash(data)), first, n_questions))
+
+    header = _HEADER.pack(MAGIC, VERSION, PARSER_VERSION, len(exam_files), n_questions,
+                          len(options) // _OPTION_WIDTH, len(strings.ids))
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for arr in (strings.offsets, sources, qs, q_opts, options):
+            f.write(_le(arr))
+        f.write(strings.blob)
+    tmp_path.replace(out_path)
+    return out_path
+
+
+# ---- load ----
+def _blob_size(mm: mmap.mmap, n_strings: int) -> int:
+    """End of the last string in the blob: the last entry of the string offsets."""
+    return struct.unpack_from("<I", mm, _HEADER.size + 4 * n_strings)[0]
+
+
+class QuestionBank:
+    """Read-only view over a compiled bank file, backed by mmap."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.parser_version,
+         n_sources, n_questions, n_options, n_strings) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path}: not a v{VERSION} question bank")
+        # the header's counts and the last string offset give the exact file size
+        words = (n_strings + 1 + n_sources * _SOURCE_WIDTH + n_questions * (_QUESTION_WIDTH + 1) + 1
+                 + n_options * _OPTION_WIDTH)
+        blob_start = _HEADER.size + 4 * words
+        if blob_start > len(self._mm) or blob_start + _blob_size(self._mm, n_strings) != len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path}: truncated question bank")
+
+        pos = _HEADER.size
+
+        def u32s(count: int):
+            nonlocal pos
+            view = memoryview(self._mm)[pos:pos + count * 4]
+            pos += count * 4
+            if sys.byteorder == "little":
+                return view.cast("I")
+            arr = array("I", view.tobytes())
+            arr.byteswap()
+            return arr
+
+        self._str_offsets = u32s(n_strings + 1)
+        self._sources = u32s(n_sources * _SOURCE_WIDTH)
+        self._qs = u32s(n_questions * _QUESTION_WIDTH)
+        self._q_opts = u32s(n_questions + 1)
+        self._options = u32s(n_options * _OPTION_WIDTH)
+        self._blob_start = pos
+
+        self.sources: Dict[str, int] = {}
+        for i in range(n_sources):
+            self.sources[self._string(self._sources[i * _SOURCE_WIDTH])] = i
+
+    def _string(self, sid: int) -> str:
+        start = self._blob_start + self._str_offsets[sid]
+        end = self._blob_start + self._str_offsets[sid + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._q_opts) - 1
+
+    def source_hash(self, name: str) -> Optional[str]:
+        i = self.sources.get(name)
+        return None if i is None else self._string(self._sources[i * _SOURCE_WIDTH + 1])
+
+    def question(self, idx: int) -> Question:
+        number, text_sid, correct_sid = self._qs[idx * _QUESTION_WIDTH:(idx + 1) * _QUESTION_WIDTH]
+        o = self._options
+        options = [
+            Option(self._string(o[j * _OPTION_WIDTH]), self._string(o[j * _OPTION_WIDTH + 1]))
+            for j in range(self._q_opts[idx], self._q_opts[idx + 1])
+        ]
+        return Question(number=number, question=self._string(text_sid), options=options,
+                        correct=list(self._string(correct_sid)))
+
+    def questions(self, name: str) -> List[Question]:
+        i = self.sources[name]
+        first, end = self._sources[i * _SOURCE_WIDTH + 2:i * _SOURCE_WIDTH + 4]
+        return [self.question(idx) for idx in range(first, end)]
+
+
+def open_bank(path: Path = DEFAULT_BANK_PATH) -> Optional[QuestionBank]:
+    """Open a compiled bank, or return None if it is missing or unreadable."""
+    try:
+        return QuestionBank(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def load_exam(path: Path, bank: Optional[QuestionBank], cache=None) -> List[Question]:
+    """Questions for one exam file: from the bank while the file's hash matches, else
+    from the parse cache (a parse_cache.ParseCache) if given, else parsed. A bank built
+    by another parser version counts as stale."""
+    data = path.read_bytes()
+    if (bank is not None and bank.parser_version == PARSER_VERSION
+            and bank.source_hash(path.name) == file_hash(data)):
+        metrics.inc("clf_exam_loads_total", source="bank")
+        return bank.questions(path.name)
+    if cache is not None:
+        metrics.inc("clf_exam_loads_total", source="parse_cache")
+        return cache.parse(path, data)
+    metrics.inc("clf_exam_loads_total", source="parse")
+    return parse_exam(data.decode("utf-8"))
+
+
+_process_sources = None  # (bank, parse cache) of this process, opened on first use
+
+
+def load_exam_cached(path: Path) -> List[Question]:
+    """``load_exam`` with the default bank and parse cache; a loader for core.load_all_exams workers."""
+    global _process_sources
+    if _process_sources is None:
+        _process_sources = (open_bank(), ParseCache())
+    return load_exam(path, *_process_sources)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Compile exams/*.md into a binary question bank.")
+    ap.add_argument("--exams", type=Path, default=Path("exams"))
+    ap.add_argument("--out", type=Path, default=DEFAULT_BANK_PATH)
+    args = ap.parse_args()
+    files = sorted(args.exams.glob("*.md"))
+    build_bank(files, args.out)
+    print(f"Wrote {args.out} ({len(files)} files, {args.out.stat().st_size} bytes)")
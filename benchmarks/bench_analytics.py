@@ -0,0 +1,55 @@
+# benchmarks/bench_analytics.py
+"""Answer-log rollups: python -m benchmarks.bench_analytics [n_events]
+
+Writes n synthetic submissions (65-answer attempts over a 1,500-question bank)
+to a temporary database, then times a cold Rollup.refresh, the reports, and
+an incremental refresh after one more batch of events.
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from analytics import EventLog, Rollup
+
+
+def _fill(log: EventLog, n: int, rng: random.Random, bank: int = 1_500, length: int = 65):
+    for start in range(0, n, length):
+        attempt = log.start_attempt(f"practice-exam-{rng.randint(1, 23)}.md", "student", now=0.0)
+        skill = rng.random()
+        for i in range(min(length, n - start)):
+            q = rng.randrange(bank)
+            correct = 1 << (q % 4)
+            selected = correct if rng.random() < skill else 1 << rng.randrange(4)
+            log.record(attempt, f"q{q}", selected, correct, now=0.0)
+    log.flush()
+
+
+def main(n: int = 1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "analytics.sqlite3"
+        log = EventLog(db, batch_size=50_000, max_delay=3600)
+        rng = random.Random(0)
+        t0 = time.perf_counter()
+        _fill(log, n, rng)
+        print(f"wrote {n} events in {time.perf_counter() - t0:.1f}s")
+
+        rollup = Rollup(db)
+        t0 = time.perf_counter()
+        rollup.refresh()
+        print(f"cold refresh: {time.perf_counter() - t0:.2f}s")
+        t0 = time.perf_counter()
+        stats = rollup.question_stats()
+        dist = rollup.score_distribution()
+        print(f"reports: {time.perf_counter() - t0:.2f}s ({len(stats)} questions, {int(dist.to_numpy().sum())} attempts)")
+
+        _fill(log, 10_000, rng)
+        t0 = time.perf_counter()
+        rollup.refresh()
+        print(f"incremental refresh of 10000 events: {time.perf_counter() - t0:.3f}s")
+        log.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
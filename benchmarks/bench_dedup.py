@@ -0,0 +1,33 @@
+# benchmarks/bench_dedup.py
+"""Dedup at scale: python -m benchmarks.bench_dedup [n_questions]
+
+Builds a synthetic bank where every tenth question is a reworded copy of an
+earlier one and times dedup.find_duplicates on it.
+"""
+import random
+import sys
+import time
+
+from benchmarks.corpus import synthetic_exam
+from core import Question, parse_exam
+from dedup import find_duplicates
+
+
+def main(n: int = 100_000):
+    qs = parse_exam(synthetic_exam(n - n // 10))
+    rng = random.Random(0)
+    for i in range(n // 10):
+        src = qs[rng.randrange(len(qs))]
+        words = src.question.split()
+        words[rng.randrange(len(words))] = "reworded"
+        qs.append(Question(len(qs) + 1, " ".join(words), src.options, src.correct))
+
+    t0 = time.perf_counter()
+    clusters = find_duplicates(qs)
+    sec = time.perf_counter() - t0
+    found = sum(len(c) - 1 for c in clusters)
+    print(f"{n} questions: {sec:.2f}s, {len(clusters)} clusters, {found} duplicates found ({n // 10} planted)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
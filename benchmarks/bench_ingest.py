@@ -0,0 +1,37 @@
+# benchmarks/bench_ingest.py
+"""Bulk ingestion scaling: python -m benchmarks.bench_ingest [n_files] [questions_per_file]
+
+Writes a synthetic exams directory and times core.load_all_exams with 1 worker
+and then up to os.cpu_count() workers.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import synthetic_exam
+from core import load_all_exams
+
+
+def main(n_files: int = 64, per_file: int = 2_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        for i in range(1, n_files + 1):
+            (folder / f"practice-exam-{i}.md").write_text(synthetic_exam(per_file, seed=i), encoding="utf-8")
+
+        cpus = os.cpu_count() or 1
+        workers = sorted({1, *(w for w in (2, 4, 8, 16, 32) if w <= cpus), cpus})
+        print(f"{n_files} files x {per_file} questions, {cpus} CPUs")
+        base = None
+        for w in workers:
+            t0 = time.perf_counter()
+            index = load_all_exams(folder, max_workers=w)
+            sec = time.perf_counter() - t0
+            base = base or sec
+            print(f"workers={w:<3} {sec:7.2f}s  speedup {base / sec:4.1f}x  ({index.total / sec:,.0f} questions/s)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,37 @@
+# benchmarks/bench_irt.py
+"""Adaptive item selection: python -m benchmarks.bench_irt [n_items]
+
+Runs simulated adaptive exams over a bank of n random 2PL items and times
+each next-item pick (one vectorized information pass over the bank) and the
+number of questions asked before the pass/fail decision.
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from irt import AdaptiveTest, ItemParams
+
+
+def main(n: int = 100_000, exams: int = 20):
+    rng = np.random.default_rng(0)
+    params = ItemParams(rng.uniform(0.5, 2.0, n), rng.normal(0, 1.2, n))
+    latencies, lengths = [], []
+    for _ in range(exams):
+        theta = rng.normal()
+        test = AdaptiveTest(params)
+        gid = test.start()
+        while gid is not None:
+            correct = rng.random() < 1 / (1 + np.exp(-params.a[gid] * (theta - params.b[gid])))
+            t0 = time.perf_counter()
+            gid = test.answer(correct)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        lengths.append(len(test.ids))
+    print(f"{n} items, {exams} exams: answer+pick p50 {statistics.median(latencies):.2f} ms, "
+          f"max {max(latencies):.2f} ms; questions asked p50 {statistics.median(lengths):.0f}, "
+          f"max {max(lengths)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,75 @@
+# benchmarks/bench_memory.py
+"""Memory per question: python -m benchmarks.bench_memory [n_questions]
+
+Compares the original dict-backed dataclasses, the current slotted
+core.Question and the columnar store.QuestionStore on the same questions.
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List
+
+from benchmarks.corpus import synthetic_exam
+from core import Option, Question, parse_exam
+from store import QuestionStore
+
+
+@dataclass
+class DictOption:
+    letter: str
+    text: str
+
+
+@dataclass
+class DictQuestion:
+    number: int
+    question: str
+    options: List[DictOption]
+    correct: List[str]
+
+
+def _as_dict_dataclasses(qs: List[Question]) -> List[DictQuestion]:
+    # copy every string, as separately parsed files would
+    return [
+        DictQuestion(q.number, "".join(q.question), [DictOption(o.letter, "".join(o.text)) for o in q.options],
+                     list(q.correct))
+        for q in qs
+    ]
+
+
+def _as_slotted(qs: List[Question]) -> List[Question]:
+    return [
+        Question(q.number, "".join(q.question), [Option(o.letter, "".join(o.text)) for o in q.options],
+                 list(q.correct))
+        for q in qs
+    ]
+
+
+def _peak(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        keep = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del keep
+    return current
+
+
+def main(n: int = 50_000):
+    text = synthetic_exam(n)
+    qs = parse_exam(text)
+    rows = [
+        ("dict dataclasses", lambda: _as_dict_dataclasses(qs)),
+        ("slotted dataclasses", lambda: _as_slotted(qs)),
+        ("QuestionStore", lambda: QuestionStore.from_questions(qs)),
+    ]
+    print(f"{n} questions")
+    print(f"{'storage':<22} {'MiB':>8} {'bytes/question':>15}")
+    for name, build in rows:
+        size = _peak(build)
+        print(f"{name:<22} {size / 2**20:>8.1f} {size / n:>15.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,37 @@
+# benchmarks/bench_parser.py
+"""Parser scaling check: python -m benchmarks.bench_parser
+
+Times core.parse_exam on synthetic exams from 1k to 100k questions, with and
+without a missing </details>. Time per question must stay flat (linear total).
+"""
+import time
+
+from benchmarks.corpus import synthetic_exam
+from core import parse_exam
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def _time(text: str) -> float:
+    t0 = time.perf_counter()
+    parse_exam(text)
+    return time.perf_counter() - t0
+
+
+def main():
+    print(f"{'questions':>10} {'variant':>10} {'seconds':>9} {'us/question':>12}")
+    per_q = []
+    for n in SIZES:
+        text = synthetic_exam(n)
+        # drop the first </details> so the rest of the file is one malformed block for a backtracking parser
+        broken = text.replace("</details>", "", 1)
+        for variant, body in (("clean", text), ("broken", broken)):
+            sec = _time(body)
+            per_q.append(sec / n)
+            print(f"{n:>10} {variant:>10} {sec:>9.3f} {sec / n * 1e6:>12.2f}")
+    ratio = max(per_q) / min(per_q)
+    print(f"max/min time per question: {ratio:.2f}x ({'linear' if ratio < 3 else 'NOT linear'})")
+
+
+if __name__ == "__main__":
+    main()
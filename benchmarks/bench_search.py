@@ -0,0 +1,41 @@
+# benchmarks/bench_search.py
+"""Search latency: python -m benchmarks.bench_search [n_questions]
+
+The synthetic vocabulary is tiny, so most terms match most questions: a
+worst case for posting-list length.
+"""
+import statistics
+import sys
+import time
+
+from benchmarks.corpus import synthetic_exam
+from core import parse_exam
+from search import SearchIndex
+
+QUERIES = ("cloudtrail", "security compliance", "availability zone instance", "bill*", "s3 storage enc",
+           "customer responsibility plan support")
+
+
+def main(n: int = 100_000):
+    t0 = time.perf_counter()
+    index = SearchIndex()
+    index.update_file("synthetic.md", parse_exam(synthetic_exam(n)))
+    print(f"indexed {n} questions in {time.perf_counter() - t0:.1f}s")
+
+    index.search("warm up")
+    for q in QUERIES:
+        index.search(q)  # freeze postings once, as a long-running app would
+
+    latencies = []
+    for _ in range(20):
+        for q in QUERIES:
+            t0 = time.perf_counter()
+            index.search(q)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"query latency: p50 {statistics.median(latencies):.2f} ms, p99 {p99:.2f} ms, max {latencies[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,72 @@
+# benchmarks/bench_session.py
+"""Answer state per session: python -m benchmarks.bench_session [sessions]
+
+Simulates sessions that answered a whole 65-question mock exam drawn from the
+shared QuestionStore, and compares the old per-answer payload dicts (question
+text, option strings and review markdown copied into session state) with the
+current answers.AnswerSheet of bitmasks.
+"""
+import random
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+from answers import AnswerSheet, review_markdown
+from benchmarks.corpus import synthetic_exam
+from core import parse_exam, question_hash
+from mock_exam import EXAM_LENGTH
+from store import QuestionStore, letters_to_mask, mask_to_letters
+
+
+def _answer(rng: random.Random, q) -> int:
+    letters = [o.letter for o in q.options]
+    return letters_to_mask(rng.sample(letters, len(q.correct)))
+
+
+def payload_session(store: QuestionStore, ids: List[int], rng: random.Random) -> Dict[int, Dict]:
+    """The session state as it was: one dict of copied question content per answer."""
+    answers = {}
+    for pos, gid in enumerate(ids):
+        q = store[gid]
+        selected = _answer(rng, q)
+        answers[pos] = {
+            "number": q.number,
+            "hash": question_hash(q),
+            "question": q.question,
+            "options": tuple((o.letter, o.text) for o in q.options),
+            "selected": mask_to_letters(selected),
+            "correct": tuple(q.correct),
+            "is_correct": selected == letters_to_mask(q.correct),
+            "review_md": review_markdown(q, selected),
+        }
+    return answers
+
+
+def sheet_session(store: QuestionStore, ids: List[int], rng: random.Random) -> AnswerSheet:
+    return {pos: _answer(rng, store[gid]) for pos, gid in enumerate(ids)}
+
+
+def bytes_per_session(build: Callable, store: QuestionStore, sessions: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    exams = [rng.sample(range(len(store)), EXAM_LENGTH) for _ in range(sessions)]
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        keep = [build(store, ids, rng) for ids in exams]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del keep
+    return (current - base) // sessions
+
+
+def main(sessions: int = 200):
+    store = QuestionStore.from_questions(parse_exam(synthetic_exam(2_000)))
+    print(f"{sessions} sessions x {EXAM_LENGTH} answers")
+    print(f"{'answer state':<22} {'KiB/session':>12}")
+    for name, build in (("payload dicts", payload_session), ("AnswerSheet", sheet_session)):
+        print(f"{name:<22} {bytes_per_session(build, store, sessions) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
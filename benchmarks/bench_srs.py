@@ -0,0 +1,46 @@
+# benchmarks/bench_srs.py
+"""Due-card latency: python -m benchmarks.bench_srs [n_cards]
+
+Fills a temporary database with n cards for one user (plus other users) and
+times Scheduler.due for the next 20 cards and Scheduler.due_count, both on
+their own and filtered to the ids of a bank (``known``) that lost one
+question in a hundred.
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from srs import DAY, Scheduler
+
+
+def main(n: int = 50_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        s = Scheduler(Path(tmp) / "srs.sqlite3", batch_size=5_000)
+        rng = random.Random(0)
+        t0 = time.perf_counter()
+        for user in ("student", "other-1", "other-2"):
+            for i in range(n):
+                s.review(user, f"practice-exam-{i % 23 + 1}.md#{i}#{i:016x}", rng.choice((1, 4, 5)),
+                         now=rng.uniform(0, 60 * DAY))
+        s.flush()
+        print(f"wrote {3 * n} reviews in {time.perf_counter() - t0:.1f}s")
+
+        known = {f"practice-exam-{i % 23 + 1}.md#{i}#{i:016x}" for i in range(n) if i % 100}
+        for label, call in (("due()", lambda: s.due("student", now=30 * DAY)),
+                            ("due(known=)", lambda: s.due("student", now=30 * DAY, known=known)),
+                            ("due_count()", lambda: s.due_count("student", now=30 * DAY)),
+                            ("due_count(known=)", lambda: s.due_count("student", now=30 * DAY, known=known))):
+            latencies = []
+            for _ in range(200):
+                t0 = time.perf_counter()
+                call()
+                latencies.append((time.perf_counter() - t0) * 1000)
+            print(f"{label}: p50 {statistics.median(latencies):.3f} ms, max {max(latencies):.3f} ms")
+        s.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
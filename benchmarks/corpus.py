@@ -0,0 +1,37 @@
+# benchmarks/corpus.py
+"""Synthetic exam markdown in the same shape as exams/*.md."""
+import random
+from typing import List
+
+_WORDS = (
+    "AWS EC2 S3 CloudTrail IAM VPC Lambda RDS DynamoDB CloudFront Route53 billing region "
+    "availability zone instance scaling security compliance cost support plan service "
+    "customer responsibility storage database network encryption monitoring"
+).split()
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n)).capitalize()
+
+
+def synthetic_question(rng: random.Random, number: int) -> str:
+    n_options = rng.choice((4, 4, 4, 5))
+    letters = "ABCDE"[:n_options]
+    correct = sorted(rng.sample(letters, 2 if n_options == 5 else 1))
+    lines = [f"{number}. {_sentence(rng, 18)}?" + (" (Choose TWO)" if len(correct) > 1 else "")]
+    lines += [f"    - {L}. {_sentence(rng, 10)}." for L in letters]
+    lines += [
+        "",
+        "    <details markdown=1><summary markdown='span'>Answer</summary>",
+        f"      Correct answer: {', '.join(correct)}",
+        "    </details>",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def synthetic_exam(n_questions: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = ["---", "layout: exam", "---", "", "# Synthetic Exam", ""]
+    parts += [synthetic_question(rng, i) for i in range(1, n_questions + 1)]
+    return "\n".join(parts)
@@ -0,0 +1,214 @@
+# benchmarks/loadtest.py
+"""Multi-user load test of the app: python -m benchmarks.loadtest [--users 50] [--processes 1]
+
+Every simulated user is a headless Streamlit session (AppTest) that opens the
+app, picks a random exam file, answers it and pages through the review. All
+users of a process stay alive at once and take turns rerunning, one rerun at
+a time. AppTest is not thread-safe, and a Streamlit server runs its script
+threads under one GIL anyway. ``--processes`` splits the users across worker
+processes, like running several app replicas, to load more cores.
+
+The report gives p50/p95/p99 rerun latency (overall and per action), reruns
+per second, and memory per session. Memory is measured with tracemalloc in a
+separate pass: once for the whole session (widget tree included) and once for
+st.session_state alone. Everything runs offline against temporary databases.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+APP = ROOT / "Exam.py"
+
+Sample = Tuple[str, float]  # (action, seconds)
+
+
+def _isolate_state():
+    """Point every on-disk store of the app at a throwaway directory."""
+    os.chdir(ROOT)  # the app reads exams/ relative to the working directory
+    tmp = tempfile.mkdtemp(prefix="clf-loadtest-")
+    os.environ.setdefault("CLF_SRS_DB", os.path.join(tmp, "srs.sqlite3"))
+    os.environ.setdefault("CLF_EXPLANATIONS_DB", os.path.join(tmp, "explanations.sqlite3"))
+    os.environ.setdefault("CLF_PARSE_CACHE_DIR", os.path.join(tmp, "parse"))
+    os.environ.setdefault("CLF_ANALYTICS_DB", os.path.join(tmp, "analytics.sqlite3"))
+    os.environ.setdefault("CLF_IRT_PARAMS", os.path.join(tmp, "irt_params.npz"))
+    os.environ.setdefault("CLF_TAGS_PATH", os.path.join(tmp, "tags.json"))
+
+
+def _by_label(elements, label: str):
+    return next(e for e in elements if e.label.startswith(label))
+
+
+def _letters(widget) -> List[str]:
+    """Raw values of an answer widget; its options are the formatted "A. text" labels."""
+    return [o.split(".", 1)[0] for o in widget.options]
+
+
+def _rerun(at, action: str) -> Sample:
+    t0 = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{action}: {at.exception[0].message}")
+    return action, elapsed
+
+
+def user_session(rng: random.Random, answers: Optional[int], review_pages: int, out: list) -> Iterator[Sample]:
+    """One simulated user; yields after every rerun and appends its AppTest to ``out``."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=120)
+    out.append(at)
+    yield _rerun(at, "open")
+
+    exam_file = _by_label(at.selectbox, "Exam file")
+    exam_file.set_value(rng.choice(exam_file.options))
+    yield _rerun(at, "select file")
+
+    answered = 0
+    while (answers is None or answered < answers) and any(b.label == "Submit answer" for b in at.button):
+        if at.multiselect:
+            choice = at.multiselect[0]
+            choice.set_value(rng.sample(_letters(choice), 2))
+        else:
+            choice = _by_label(at.radio, "Select one answer")
+            choice.set_value(rng.choice(_letters(choice)))
+        _by_label(at.button, "Submit answer").click()
+        yield _rerun(at, "answer")
+        answered += 1
+
+    pager = [n for n in at.number_input if n.label.startswith("Page (of")]
+    if pager:
+        for page in range(2, min(int(pager[0].max), review_pages + 1) + 1):
+            _by_label(at.number_input, "Page (of").set_value(page)
+            yield _rerun(at, "review page")
+        _by_label(at.checkbox, "Show only incorrect answers").check()
+        yield _rerun(at, "review filter")
+
+
+def drive(users: int, answers: Optional[int] = None, review_pages: int = 2, seed: int = 0,
+          keep: Optional[list] = None) -> List[Sample]:
+    """Run ``users`` sessions round-robin until all are done; returns every rerun timing."""
+    sessions = [user_session(random.Random(seed * 100_003 + i), answers, review_pages,
+                             keep if keep is not None else [])
+                for i in range(users)]
+    samples: List[Sample] = []
+    while sessions:
+        alive = []
+        for s in sessions:
+            sample = next(s, None)
+            if sample is not None:
+                samples.append(sample)
+                alive.append(s)
+        sessions = alive
+    return samples
+
+
+def _worker(args) -> Tuple[List[Sample], float]:
+    users, answers, review_pages, seed = args
+    _isolate_state()
+    drive(1, answers, review_pages, seed=-1 - seed)  # warm the shared caches
+    t0 = time.perf_counter()
+    samples = drive(users, answers, review_pages, seed)
+    return samples, time.perf_counter() - t0
+
+
+def measure_memory(users: int, answers: Optional[int] = None, review_pages: int = 2) -> Dict[str, int]:
+    """Bytes retained per session: whole AppTest session, and its session_state alone."""
+    drive(1, answers, review_pages, seed=-1)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        apps: list = []
+        drive(users, answers, review_pages, seed=1, keep=apps)
+        gc.collect()
+        session, _ = tracemalloc.get_traced_memory()
+        states = [at.session_state.to_dict() for at in apps]
+        del apps
+        gc.collect()
+        state, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del states
+    return {"session_bytes": (session - base) // users, "state_bytes": (state - base) // users}
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if len(values) < 2:
+        v = values[0] * 1000 if values else 0.0
+        return {"p50_ms": v, "p95_ms": v, "p99_ms": v}
+    q = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50_ms": q[49] * 1000, "p95_ms": q[94] * 1000, "p99_ms": q[98] * 1000}
+
+
+def summarize(samples: List[Sample], wall: float, users: int) -> Dict:
+    by_action: Dict[str, List[float]] = {}
+    for action, seconds in samples:
+        by_action.setdefault(action, []).append(seconds)
+    return {
+        "users": users,
+        "reruns": len(samples),
+        "wall_s": wall,
+        "reruns_per_s": len(samples) / wall if wall else 0.0,
+        **_percentiles([s for _, s in samples]),
+        "actions": {a: {"count": len(v), **_percentiles(v)} for a, v in by_action.items()},
+    }
+
+
+def run_load(users: int, processes: int = 1, answers: Optional[int] = None, review_pages: int = 2,
+             seed: int = 0) -> Dict:
+    _isolate_state()
+    shares = [users // processes + (i < users % processes) for i in range(processes)]
+    tasks = [(n, answers, review_pages, seed + i) for i, n in enumerate(shares) if n]
+    t0 = time.perf_counter()
+    if len(tasks) == 1:
+        results = [_worker(tasks[0])]
+        wall = results[0][1]
+    else:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+            results = list(pool.map(_worker, tasks))
+        wall = time.perf_counter() - t0
+    return summarize([s for samples, _ in results for s in samples], wall, users)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless multi-user load test of Exam.py.")
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--processes", type=int, default=1, help="app replicas (worker processes)")
+    ap.add_argument("--answers", type=int, help="answers per user (default: the whole exam)")
+    ap.add_argument("--review-pages", type=int, default=2, help="review pages to visit after the exam")
+    ap.add_argument("--memory-users", type=int, default=10, help="sessions in the memory pass (0 skips it)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = ap.parse_args()
+
+    report = run_load(args.users, args.processes, args.answers, args.review_pages, args.seed)
+    if args.memory_users:
+        report.update(measure_memory(args.memory_users, args.answers, args.review_pages))
+
+    print(f"{report['users']} users, {report['reruns']} reruns in {report['wall_s']:.1f}s "
+          f"({report['reruns_per_s']:.1f} reruns/s)")
+    print(f"rerun latency: p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms, "
+          f"p99 {report['p99_ms']:.1f} ms")
+    for action, r in report["actions"].items():
+        print(f"  {action:14} n={r['count']:<6} p50 {r['p50_ms']:7.1f}  p95 {r['p95_ms']:7.1f}  "
+              f"p99 {r['p99_ms']:7.1f} ms")
+    if "session_bytes" in report:
+        print(f"memory per session: {report['session_bytes'] / 1024:.0f} KiB "
+              f"(session_state alone: {report['state_bytes'] / 1024:.1f} KiB)")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# benchmarks/suite.py
+"""Hot-path benchmark suite.
+
+    python -m benchmarks.suite                   # run and compare with baseline.json
+    python -m benchmarks.suite --save            # run and overwrite baseline.json
+    python -m benchmarks.suite --scales 1,10     # only some corpus sizes
+
+Scale 1 is the real exams/ corpus; scale N repeats it N times. Each result
+reports throughput (items/s) and tracemalloc peak memory.
+
+Each case is timed back to back with a fixed calibration loop (regex, split
+and dict work that does not touch the app code) and also reports its
+throughput relative to that loop. The regression gate compares those ratios,
+so a baseline saved on one machine still holds on faster or slower hardware
+and through clock changes during a run. Every timing repeats its call for at
+least MIN_SAMPLE_SECONDS, so millisecond cases at 1x are not at the mercy of
+timer noise.
+"""
+import re
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from core import (
+    Question,
+    _extract_correct_letters,
+    build_prompt,
+    build_question,
+    iter_blocks,
+    load_i18n_prompts,
+    parse_exam,
+    parse_options,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SCALES = (1, 10, 100, 1000)
+MIN_SAMPLE_SECONDS = 0.2
+SAMPLES = 3
+_CALIBRATION_LINES = [f"{i}. Which service stores objects? - A. S3 - B. EC2 key{i % 97}" for i in range(2_000)]
+_CALIBRATION_RE = re.compile(r"^(\d+)\.\s*(.*?)\s*-\s*A\.")
+
+
+# ---- corpus ----
+def load_corpus(exams_dir: Path = ROOT / "exams") -> List[str]:
+    return [p.read_text(encoding="utf-8") for p in sorted(exams_dir.glob("*.md"))]
+
+
+def _blocks(texts: List[str]) -> Tuple[List[str], List[Tuple[str, set]], List[Question]]:
+    """Raw option blocks, (details, allowed letters) pairs and parsed questions of a corpus."""
+    options_raw: List[str] = []
+    details: List[Tuple[str, set]] = []
+    questions: List[Question] = []
+    for text in texts:
+        for block in iter_blocks(text.split("\n")):
+            q = build_question(block)
+            options_raw.append(block.options_raw)
+            details.append((block.details_raw, {o.letter for o in q.options}))
+            questions.append(q)
+    return options_raw, details, questions
+
+
+# ---- cases ----
+def _cases(texts: List[str], scale: int) -> Dict[str, Tuple[int, Callable[[], None]]]:
+    """name -> (items processed per call, callable) for one corpus scale."""
+    options_raw, details, questions = _blocks(texts)
+    n = len(questions) * scale
+    corpus = texts * scale
+
+    def run_parse_exam():
+        for text in corpus:
+            parse_exam(text)
+
+    def run_parse_options():
+        for _ in range(scale):
+            for raw in options_raw:
+                parse_options(raw)
+
+    def run_extract_correct():
+        for _ in range(scale):
+            for raw, allowed in details:
+                _extract_correct_letters(raw, allowed)
+
+    def run_build_prompt():
+        for _ in range(scale):
+            for q in questions:
+                build_prompt(q, "English")
+
+    def run_load_i18n():
+        for _ in range(scale):
+            load_i18n_prompts()
+
+    return {
+        "parse_exam": (n, run_parse_exam),
+        "parse_options": (n, run_parse_options),
+        "_extract_correct_letters": (n, run_extract_correct),
+        "build_prompt": (n, run_build_prompt),
+        "load_i18n_prompts": (scale, run_load_i18n),
+    }
+
+
+def _run_calibration():
+    counts: Dict[str, int] = {}
+    for line in _CALIBRATION_LINES:
+        m = _CALIBRATION_RE.match(line)
+        for word in m.group(2).lower().split():
+            counts[word] = counts.get(word, 0) + 1
+        "|".join(line.split(" - "))
+
+
+def _time_per_call(fn: Callable[[], None], min_seconds: float = MIN_SAMPLE_SECONDS) -> float:
+    """Mean seconds per call over as many calls as fit in min_seconds (at least one)."""
+    calls = 0
+    t0 = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def _measure(items: int, fn: Callable[[], None], samples: int = SAMPLES) -> Dict[str, float]:
+    best, relative = float("inf"), 0.0
+    for _ in range(samples):
+        seconds = _time_per_call(fn)
+        calibration = _time_per_call(_run_calibration)  # timed next to fn, so both see the same clock
+        best = min(best, seconds)
+        relative = max(relative, items / seconds * calibration / len(_CALIBRATION_LINES))
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"items": items, "seconds": best, "items_per_s": items / best, "relative": relative,
+            "peak_kib": peak / 1024}
+
+
+def run_suite(scales=DEFAULT_SCALES, texts: List[str] = None) -> Dict[str, Dict[str, float]]:
+    """Results keyed by "<hot path>@<scale>x"."""
+    texts = load_corpus() if texts is None else texts
+    results: Dict[str, Dict[str, float]] = {}
+    for scale in scales:
+        for name, (items, fn) in _cases(texts, scale).items():
+            results[f"{name}@{scale}x"] = _measure(items, fn)
+    return results
+
+
+# ---- baseline ----
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path = BASELINE_PATH):
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def is_calibrated(baseline) -> bool:
+    return bool(baseline) and all("relative" in r for r in baseline.values())
+
+
+def regressions(results, baseline, max_regression_pct: float) -> List[str]:
+    """Human-readable lines for every result whose throughput relative to the calibration loop
+    dropped below the baseline's by more than the allowed percent."""
+    out: List[str] = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        drop = (1 - r["relative"] / base["relative"]) * 100
+        if drop > max_regression_pct:
+            out.append(f"{key}: {r['items_per_s']:.0f}/s vs baseline {base['items_per_s']:.0f}/s "
+                       f"(-{drop:.1f}% after calibration)")
+    return out
+
+
+def _report(results, baseline):
+    print(f"{'benchmark':<32} {'items/s':>12} {'peak KiB':>10} {'vs base':>8}")
+    for key, r in results.items():
+        base = baseline.get(key)
+        delta = f"{(r['relative'] / base['relative'] - 1) * 100:+.1f}%" if base and "relative" in base else "-"
+        print(f"{key:<32} {r['items_per_s']:>12.0f} {r['peak_kib']:>10.0f} {delta:>8}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark parser and prompt hot paths.")
+    ap.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)))
+    ap.add_argument("--save", action="store_true", help="write results to baseline.json")
+    ap.add_argument("--max-regression", type=float, default=25.0, help="allowed slowdown in percent")
+    args = ap.parse_args()
+
+    results = run_suite([int(s) for s in args.scales.split(",")])
+    baseline = load_baseline()
+    _report(results, baseline)
+    if args.save:
+        save_baseline({**baseline, **results} if is_calibrated(baseline) else results)
+        print(f"Saved {BASELINE_PATH}")
+    else:
+        failed = regressions(results, baseline, args.max_regression)
+        for line in failed:
+            print("REGRESSION", line)
+        raise SystemExit(1 if failed else 0)
@@ -1,36 +1,68 @@
 # core.py
+import hashlib
 import json
+import os
 import re
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from metrics import timed
 
 # ---- types ----
-@dataclass
+@dataclass(slots=True)
 class Option:
     letter: str
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     number: int
     question: str
     options: List[Option]
     correct: List[str]  # e.g. ["A", "C"]
 
+
+@dataclass(slots=True)
+class RawBlock:
+    line: int  # 1-based line of the "N." question line
+    number: int
+    question: str
+    options_raw: str
+    details_raw: str
+
+
+@dataclass(slots=True)
+class ParseIssue:
+    line: int  # 1-based line where the malformed block starts
+    message: str
+    code: str = ""  # "no-answer-block" or "unclosed-details"
+
 # ---- regex ----
 OPTION_LINE_RE = re.compile(r"^\s*[-*]?\s*([A-Fa-f])[\.)]\s*(.+?)\s*$")
-QUESTION_BLOCK_RE = re.compile(
-    r"(\d+)\.\s*(.*?)\n(.*?)<details[^>]*?>\s*<summary[^>]*?>\s*Answer\s*</summary>(.*?)</details>",
-    re.DOTALL | re.IGNORECASE,
+QUESTION_LINE_RE = re.compile(r"^\s*(\d+)\.\s*(.*)$")
+DETAILS_OPEN_RE = re.compile(
+    r"<details[^>]*?>\s*<summary[^>]*?>\s*Answer\s*</summary>",
+    re.IGNORECASE,
 )
+DETAILS_CLOSE_RE = re.compile(r"</details>", re.IGNORECASE)
 CORRECT_LINE_RE = re.compile(
     r"^\s*Correct\s*answer\s*:\s*(.+)$",
     re.IGNORECASE | re.MULTILINE,
 )
+WORD_RE = re.compile(r"[a-z0-9]+")
 
 # ---- parsing ----
+PARSER_VERSION = 3  # bump whenever parse output changes; invalidates on-disk caches
+
+_SEEK, _OPTIONS, _DETAILS = range(3)
+
+
 def parse_options(options_raw: str) -> List[Option]:
     options: List[Option] = []
     for line in options_raw.strip().splitlines():
@@ -61,22 +93,205 @@ def _extract_correct_letters(details_raw: str, allowed: set[str]) -> List[str]:
     return out
 
 
+def _block(line: int, number: int, q_text: str, option_lines: List[str], details_lines: List[str]) -> RawBlock:
+    return RawBlock(line, number, q_text, "\n".join(option_lines), "\n".join(details_lines))
+
+
+def iter_blocks(lines: Iterable[str], on_issue: Optional[Callable[[ParseIssue], None]] = None) -> Iterator[RawBlock]:
+    """Single-pass scanner over lines of an exam (a file object works too).
+
+    Every line is looked at once, so scan time is linear even for broken input.
+    A question without an answer block is skipped; one whose </details> is
+    missing is still yielded. Both are reported to ``on_issue``.
+
+    A numbered line inside an answer block may be a list in the explanation or
+    the next question after a missing </details>. It is kept as answer text
+    and also tracked as a candidate question; the candidate wins only if its
+    own <details> opens before the current block closes.
+    """
+    def issue(line: int, code: str, message: str):
+        if on_issue is not None:
+            on_issue(ParseIssue(line, message, code))
+
+    state = _SEEK
+    start = number = 0
+    q_text = ""
+    option_lines: List[str] = []
+    details_lines: List[str] = []
+    candidate: Optional[Tuple[int, int, str]] = None  # (line, number, text) of a numbered line in _DETAILS
+    candidate_options: List[str] = []
+    cut = 0  # len(details_lines) before the candidate's line
+
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+
+        if state == _DETAILS:
+            if candidate is not None and DETAILS_OPEN_RE.search(line):
+                issue(start, "unclosed-details", f"question {number}: missing </details>")
+                yield _block(start, number, q_text, option_lines, details_lines[:cut])
+                (start, number, q_text), option_lines, candidate = candidate, candidate_options, None
+                state = _OPTIONS  # and read this line's <details> below
+            else:
+                m = DETAILS_CLOSE_RE.search(line)
+                if m:
+                    details_lines.append(line[:m.start()])
+                    yield _block(start, number, q_text, option_lines, details_lines)
+                    state, candidate = _SEEK, None
+                    continue
+                details_lines.append(line)
+                q = QUESTION_LINE_RE.match(line)
+                if q:
+                    cut = len(details_lines) - 1
+                    candidate, candidate_options = (lineno, int(q.group(1)), q.group(2)), []
+                elif candidate is not None:
+                    candidate_options.append(line)
+                continue
+        if state == _OPTIONS:
+            m = DETAILS_OPEN_RE.search(line)
+            if m:
+                option_lines.append(line[:m.start()])
+                rest = line[m.end():]
+                end = DETAILS_CLOSE_RE.search(rest)
+                if end:
+                    yield _block(start, number, q_text, option_lines, [rest[:end.start()]])
+                    state = _SEEK
+                else:
+                    details_lines = [rest]
+                    state = _DETAILS
+                continue
+            if not QUESTION_LINE_RE.match(line):
+                option_lines.append(line)
+                continue
+            issue(start, "no-answer-block", f"question {number}: no answer block, skipped")
+
+        m = QUESTION_LINE_RE.match(line)
+        if m:
+            start, number, q_text = lineno, int(m.group(1)), m.group(2)
+            option_lines, details_lines = [], []
+            state = _OPTIONS
+        else:
+            state = _SEEK
+
+    if state == _OPTIONS:
+        issue(start, "no-answer-block", f"question {number}: no answer block, skipped")
+    elif state == _DETAILS:
+        issue(start, "unclosed-details", f"question {number}: missing </details>")
+        if candidate is None:
+            yield _block(start, number, q_text, option_lines, details_lines)
+        else:
+            yield _block(start, number, q_text, option_lines, details_lines[:cut])
+            issue(candidate[0], "no-answer-block", f"question {candidate[1]}: no answer block, skipped")
+
+
+def build_question(block: RawBlock) -> Question:
+    options = parse_options(block.options_raw)
+    allowed = {o.letter for o in options}
+    return Question(
+        number=block.number,
+        question=block.question.strip(),
+        options=options,
+        correct=_extract_correct_letters(block.details_raw, allowed),
+    )
+
+
+def iter_exam(lines: Iterable[str], on_issue: Optional[Callable[[ParseIssue], None]] = None) -> Iterator[Question]:
+    """Yield questions one at a time from lines of an exam; see ``iter_blocks``."""
+    for block in iter_blocks(lines, on_issue):
+        yield build_question(block)
+
+
+@timed("clf_parse_exam_seconds")
 def parse_exam(markdown_text: str) -> List[Question]:
-    out: List[Question] = []
-    for number_str, q_text, options_raw, details_raw in QUESTION_BLOCK_RE.findall(markdown_text):
-        options = parse_options(options_raw)
-        allowed = {o.letter for o in options}
-        correct = _extract_correct_letters(details_raw, allowed)
-
-        out.append(
-            Question(
-                number=int(number_str),
-                question=q_text.strip(),
-                options=options,
-                correct=correct,
-            )
-        )
-    return out
+    return list(iter_exam(markdown_text.split("\n")))
+
+
+def format_exam(questions: Iterable[Question], title: str = "") -> str:
+    """Markdown in the exams/*.md layout; parse_exam reads it back unchanged."""
+    parts: List[str] = ["---", "layout: exam", "---", ""]
+    if title:
+        parts += [f"# {title}", ""]
+    for q in questions:
+        parts.append(f"{q.number}. {q.question}")
+        parts += [f"    - {o.letter}. {o.text}" for o in q.options]
+        parts += [
+            "",
+            "    <details markdown=1><summary markdown='span'>Answer</summary>",
+            f"      Correct answer: {', '.join(q.correct)}",
+            "    </details>",
+            "",
+        ]
+    return "\n".join(parts)
+
+
+def question_hash(q: Question) -> str:
+    """Content hash of a question: text, options and answer. Stable across files and renumbering."""
+    h = hashlib.sha256(q.question.encode("utf-8"))
+    for o in q.options:
+        h.update(f"\0{o.letter}\0{o.text}".encode("utf-8"))
+    h.update(("\0" + ",".join(q.correct)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric words, as used by search and dedup."""
+    return WORD_RE.findall(text.lower())
+
+
+# ---- bulk loading ----
+def exam_sort_key(name: str) -> int:
+    m = re.search(r"(\d+)", name)
+    return int(m.group(1)) if m else 0
+
+
+@dataclass
+class ExamIndex:
+    files: Dict[str, List[Question]]  # file name -> questions, in exam order
+    offsets: Dict[str, int]           # file name -> global id of its first question
+    timings: Dict[str, float]         # file name -> parse seconds (in its worker)
+    total: int = 0
+
+    def global_id(self, name: str, i: int) -> int:
+        return self.offsets[name] + i
+
+    def lookup(self, gid: int) -> Tuple[str, Question]:
+        for name, start in self.offsets.items():
+            if start <= gid < start + len(self.files[name]):
+                return name, self.files[name][gid - start]
+        raise KeyError(gid)
+
+
+def _parse_file(path: Path) -> List[Question]:
+    return parse_exam(path.read_text(encoding="utf-8"))
+
+
+def _load_file(path: Path, loader: Callable[[Path], List[Question]] = _parse_file) -> Tuple[str, List[Question], float]:
+    t0 = time.perf_counter()
+    qs = loader(path)
+    return path.name, qs, time.perf_counter() - t0
+
+
+def load_all_exams(exam_folder: Path, max_workers: Optional[int] = None,
+                   loader: Optional[Callable[[Path], List[Question]]] = None) -> ExamIndex:
+    """Load every *.md in the folder with a process pool (``max_workers=1`` loads inline).
+
+    ``loader`` reads one file (default: parse it); it must be a module-level
+    function so the workers can unpickle it, e.g. bank.load_exam_cached.
+    """
+    paths = sorted(exam_folder.glob("*.md"), key=lambda p: exam_sort_key(p.name))
+    load = partial(_load_file, loader=loader or _parse_file)
+    if max_workers == 1 or len(paths) < 2:
+        results = [load(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(load, paths, chunksize=max(1, len(paths) // (4 * (os.cpu_count() or 1)))))
+
+    index = ExamIndex(files={}, offsets={}, timings={})
+    for name, qs, seconds in results:
+        index.files[name] = qs
+        index.offsets[name] = index.total
+        index.timings[name] = seconds
+        index.total += len(qs)
+    return index
 
 # ---- i18n ----
 def load_i18n_prompts():
@@ -136,10 +351,43 @@ def load_i18n_prompts():
     return defaults
 
 
+class PromptTemplate:
+    """A prompt template split once into literal text and field names.
+
+    ``render`` is a join over the precomputed segments, so templates are not
+    re-parsed per call. Templates using conversions or format specs fall back
+    to ``str.format``.
+    """
+    __slots__ = ("template", "segments")
+
+    def __init__(self, template: str):
+        self.template = template
+        segments: Optional[List[Tuple[str, Optional[str]]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            if spec or conversion:
+                segments = None
+                break
+            segments.append((literal, field))
+        self.segments = segments
+
+    def render(self, **fields: str) -> str:
+        if self.segments is None:
+            return self.template.format(**fields)
+        out: List[str] = []
+        for literal, field in self.segments:
+            out.append(literal)
+            if field is not None:
+                out.append(fields[field])
+        return "".join(out)
+
+
 PROMPT_TEMPLATES = load_i18n_prompts()
 LANGS = list(PROMPT_TEMPLATES.keys())
+COMPILED_PROMPTS = {lang: PromptTemplate(t) for lang, t in PROMPT_TEMPLATES.items()}
+
 
+@timed("clf_build_prompt_seconds")
 def build_prompt(q: Question, lang: str) -> str:
     opts_text = "\n".join(f"{o.letter}. {o.text}" for o in q.options)
-    template = PROMPT_TEMPLATES.get(lang) or PROMPT_TEMPLATES["English"]
-    return template.format(question=q.question, options=opts_text, correct=", ".join(q.correct))
+    template = COMPILED_PROMPTS.get(lang) or COMPILED_PROMPTS["English"]
+    return template.render(question=q.question, options=opts_text, correct=", ".join(q.correct))
@@ -0,0 +1,210 @@
+# dedup.py
+"""Near-duplicate questions across exams.
+
+    python dedup.py [--threshold 0.8] [--report dups.json] [--merged merged.md]
+
+Each question (text plus its options, order-independent) is normalized and
+cut into word 3-gram shingles. MinHash signatures are computed with numpy and
+banded into an LSH index, so only questions that share a band are compared:
+the work grows with the bank size, not with the number of pairs. Exact
+copies are merged before banding, so a question reposted many times does not
+make a huge bucket; every pair within a bucket is then checked, and questions
+are only merged when their correct answers (as option text, so reordered
+options still match) are the same.
+"""
+import argparse
+import json
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core import ExamIndex, Question, format_exam, load_all_exams, tokenize
+
+NUM_BINS = 64
+BANDS = 16
+SHINGLE = 3  # words per shingle
+
+_EMPTY = np.uint64(np.iinfo(np.uint64).max)
+
+
+def question_words(q: Question) -> List[str]:
+    """Normalized words of the question followed by its options in text order."""
+    return tokenize(" ".join([q.question, *sorted(o.text for o in q.options)]))
+
+
+def answer_key(q: Question) -> Tuple[str, ...]:
+    """Normalized text of the correct options, independent of their letters and order."""
+    correct = set(q.correct)
+    return tuple(sorted(" ".join(tokenize(o.text)) for o in q.options if o.letter in correct))
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, elementwise on uint64 (wraps mod 2**64)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def shingle_hashes(questions: Sequence[Question]) -> Tuple[np.ndarray, np.ndarray]:
+    """64-bit hashes of every word 3-gram and the question index each one belongs to.
+
+    Each question is padded as [0, words..., 0, 0], so it has len(words) + 1
+    shingles and never none.
+    """
+    word_ids: Dict[str, int] = {}
+    ids: List[int] = []
+    lengths = np.empty(len(questions), dtype=np.int64)
+    for qi, q in enumerate(questions):
+        words = question_words(q)
+        ids.append(0)
+        for w in words:
+            wid = word_ids.get(w)
+            if wid is None:
+                wid = word_ids[w] = zlib.crc32(w.encode()) | 1 << 32  # never 0, the pad id
+            ids.append(wid)
+        ids += (0, 0)
+        lengths[qi] = len(words) + 3
+    ids += (0, 0)
+
+    tokens = np.array(ids, dtype=np.uint64)
+    combined = _mix(_mix(tokens[:-2]) + tokens[1:-1] * np.uint64(0x100000001B3)) ^ tokens[2:]
+    starts_ok = np.ones(len(combined), dtype=bool)
+    ends = np.cumsum(lengths)
+    starts_ok[ends - 1] = starts_ok[ends - 2] = False  # windows running into the next question
+    owners = np.repeat(np.arange(len(questions)), lengths)
+    return _mix(combined[starts_ok]), owners[starts_ok]
+
+
+def signatures(questions: Sequence[Question], num_bins: int = NUM_BINS) -> np.ndarray:
+    """(n, num_bins) one-permutation MinHash signatures with rotation densification.
+
+    Each shingle hash lands in one bin (low bits) and each bin keeps its minimum,
+    so the cost is one pass over the shingles instead of one pass per hash
+    function. Empty bins borrow the nearest non-empty bin to their right.
+    """
+    hashes, owners = shingle_hashes(questions)
+    shift = np.uint64(num_bins.bit_length() - 1)
+    sigs = np.full(len(questions) * num_bins, _EMPTY, dtype=np.uint64)
+    np.minimum.at(sigs, owners * num_bins + (hashes & np.uint64(num_bins - 1)).astype(np.int64), hashes >> shift)
+    sigs = sigs.reshape(len(questions), num_bins)
+
+    original = sigs.copy()
+    empty = sigs == _EMPTY
+    step = 1
+    while empty.any() and step < num_bins:
+        donor = np.roll(original, -step, axis=1)
+        fill = empty & (donor != _EMPTY)
+        sigs[fill] = donor[fill] + np.uint64(step * 0x9E3779B97F4A7C15 % 2**64)
+        empty &= ~fill
+        step += 1
+    return sigs
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def find_duplicates(questions: Sequence[Question], threshold: float = 0.8,
+                    num_bins: int = NUM_BINS, bands: int = BANDS) -> List[List[int]]:
+    """Clusters (lists of indices, smallest first) of questions whose estimated Jaccard >= threshold
+    and whose correct answers match."""
+    if not questions:
+        return []
+    all_sigs = signatures(questions, num_bins)
+    answer_ids: Dict[Tuple[str, ...], int] = {}
+    all_answers = np.array([answer_ids.setdefault(answer_key(q), len(answer_ids)) for q in questions],
+                           dtype=np.uint64)
+    uf = _UnionFind(len(questions))
+    # exact copies (same signature and answer) join their first member up front, and only that
+    # representative enters the buckets: k reposts of a question cost O(k log k), not O(k^2)
+    _, first, inverse = np.unique(np.column_stack([all_sigs, all_answers]), axis=0,
+                                  return_index=True, return_inverse=True)
+    for x, rep in enumerate(first[inverse.ravel()].tolist()):
+        if x != rep:
+            uf.union(x, rep)
+    reps = np.sort(first)
+    sigs, answers = all_sigs[reps], all_answers[reps]
+
+    rows = num_bins // bands
+    for band in range(bands):
+        key = np.zeros(len(reps), dtype=np.uint64)
+        for col in range(band * rows, (band + 1) * rows):
+            key = _mix(key ^ sigs[:, col])
+        # every pair in a bucket: after sorting by key, positions p and p + d share a bucket
+        # for d = 1, 2, ... until no bucket is that large
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        for d in range(1, len(order)):
+            same = sorted_key[:-d] == sorted_key[d:]
+            if not same.any():
+                break
+            i, j = order[:-d][same], order[d:][same]
+            similar = np.count_nonzero(sigs[i] == sigs[j], axis=1) >= threshold * num_bins
+            keep = similar & (answers[i] == answers[j])
+            for x, y in zip(reps[i[keep]].tolist(), reps[j[keep]].tolist()):
+                uf.union(x, y)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(questions)):
+        clusters.setdefault(uf.find(i), []).append(i)
+    return [c for c in clusters.values() if len(c) > 1]
+
+
+@dataclass
+class DedupReport:
+    items: List[Tuple[str, Question]]  # (file name, question) in global id order
+    clusters: List[List[int]]          # indices into items
+
+    def to_json(self) -> List[dict]:
+        return [
+            [{"id": i, "file": self.items[i][0], "number": self.items[i][1].number,
+              "question": self.items[i][1].question} for i in c]
+            for c in self.clusters
+        ]
+
+    def unique_questions(self) -> List[Question]:
+        """Every question except later copies of a duplicate, renumbered from 1."""
+        dropped = {i for c in self.clusters for i in c[1:]}
+        kept = [q for i, (_, q) in enumerate(self.items) if i not in dropped]
+        return [Question(n, q.question, q.options, q.correct) for n, q in enumerate(kept, 1)]
+
+
+def dedup_index(index: ExamIndex, threshold: float = 0.8) -> DedupReport:
+    items = [(name, q) for name, qs in index.files.items() for q in qs]
+    return DedupReport(items, find_duplicates([q for _, q in items], threshold))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Find near-duplicate questions across exam files.")
+    ap.add_argument("--exams", type=Path, default=Path("exams"))
+    ap.add_argument("--threshold", type=float, default=0.8, help="minimum estimated Jaccard similarity")
+    ap.add_argument("--report", type=Path, help="write duplicate clusters as JSON")
+    ap.add_argument("--merged", type=Path, help="write a deduplicated merged exam (markdown)")
+    args = ap.parse_args()
+
+    report = dedup_index(load_all_exams(args.exams), args.threshold)
+    for cluster in report.to_json():
+        print(" = ".join(f"{d['file']}#{d['number']}" for d in cluster))
+    print(f"{len(report.clusters)} duplicate clusters, {len(report.items)} questions")
+    if args.report:
+        args.report.write_text(json.dumps(report.to_json(), ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.merged:
+        unique = report.unique_questions()
+        args.merged.write_text(format_exam(unique, "Merged Exam"), encoding="utf-8")
+        print(f"Wrote {args.merged} ({len(unique)} questions)")
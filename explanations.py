@@ -0,0 +1,195 @@
+# explanations.py
+"""Offline explanation store keyed by (question content hash, language).
+
+    python explanations.py ingest explanations.jsonl [...]
+    python explanations.py stub prompts/*.jsonl      # placeholders, into a separate stub database
+
+Explanations live in one SQLite database (WAL mode, so every app worker reads
+it while an ingest writes) with (hash, lang) as the primary key. Each process
+keeps a bounded LRU of recent hits in front of it, so the results page looks
+up the same answers on every rerun without reading explanation rows. Before
+each lookup the store checks SQLite's data_version and drops the LRU when
+another process has written, so a re-ingest shows up at once. The hash is
+core.question_hash, so an edited question gets no stale explanation.
+
+Placeholders from ``stub`` go to CLF_EXPLANATIONS_STUB_DB (default
+data/explanations.stub.sqlite3); the command refuses to write them into the
+app's database.
+
+Ingested JSONL records need "hash", "lang" and "explanation" (records from
+export_prompts.py carry hash and lang already). Configure the location with
+CLF_EXPLANATIONS_DB (default data/explanations.sqlite3).
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_DB_PATH = Path(os.environ.get("CLF_EXPLANATIONS_DB", "data/explanations.sqlite3"))
+STUB_DB_PATH = Path(os.environ.get("CLF_EXPLANATIONS_STUB_DB", "data/explanations.stub.sqlite3"))
+DEFAULT_LRU_SIZE = 2048
+INGEST_BATCH = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS explanations (
+    hash TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    explanation TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (hash, lang)
+) WITHOUT ROWID;
+"""
+
+Key = Tuple[str, str]  # (question hash, language)
+
+
+class ExplanationStore:
+    """Thread-safe; one instance per process is enough."""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, lru_size: int = DEFAULT_LRU_SIZE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[Key, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._data_version = self._read_data_version()
+        self.stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "invalidations": 0}
+
+    def _read_data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def get(self, question_hash: str, lang: str) -> Optional[str]:
+        key = (question_hash, lang)
+        with self._lock:
+            version = self._read_data_version()
+            if version != self._data_version:
+                self._data_version = version
+                if self._lru:
+                    self._lru.clear()
+                    self.stats["invalidations"] += 1
+            text = self._lru.get(key)
+            if text is not None:
+                self._lru.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return text
+            row = self.db.execute(
+                "SELECT explanation FROM explanations WHERE hash=? AND lang=?", key
+            ).fetchone()
+            if row is None:
+                # misses are not remembered: another process may ingest the answer meanwhile
+                self.stats["misses"] += 1
+                return None
+            self.stats["db_hits"] += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def _remember(self, key: Key, text: str):
+        self._lru[key] = text
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def put_many(self, rows: Iterable[Tuple[str, str, str, str]]) -> int:
+        """Insert or replace (hash, lang, explanation, source) rows in batched transactions."""
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= INGEST_BATCH:
+                written += self._write(batch)
+                batch = []
+        return written + self._write(batch)
+
+    def _write(self, batch) -> int:
+        if not batch:
+            return 0
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO explanations (hash, lang, explanation, source) VALUES (?, ?, ?, ?)", batch
+            )
+            for h, lang, text, _ in batch:
+                if (h, lang) in self._lru:
+                    self._lru[(h, lang)] = text
+        return len(batch)
+
+    def put(self, question_hash: str, lang: str, explanation: str, source: str = ""):
+        self.put_many([(question_hash, lang, explanation, source)])
+
+    def __contains__(self, key: Key) -> bool:
+        with self._lock:
+            return key in self._lru or self.db.execute(
+                "SELECT 1 FROM explanations WHERE hash=? AND lang=?", key
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def read_jsonl(paths: Iterable[Path]) -> Iterator[dict]:
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def ingest(store: ExplanationStore, records: Iterable[dict], source: str = "") -> int:
+    """Load records with "hash", "lang" and "explanation"; others are skipped."""
+    return store.put_many(
+        (r["hash"], r["lang"], r["explanation"], r.get("source", source))
+        for r in records
+        if r.get("hash") and r.get("lang") and r.get("explanation")
+    )
+
+
+def stub_explanation(prompt: str) -> str:
+    """Deterministic stand-in for a model: echoes the prompt's correct-answer line."""
+    lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+    answer = next((line for line in reversed(lines) if ":" in line and len(line) < 80), "")
+    return f"(offline placeholder) {answer}"
+
+
+def generate(store: ExplanationStore, prompt_records: Iterable[dict],
+             generator: Callable[[str], str] = stub_explanation, source: str = "stub") -> int:
+    """Explain exported prompts (see export_prompts.py) that have no explanation yet."""
+    return store.put_many(
+        (r["hash"], r["lang"], generator(r["prompt"]), source)
+        for r in prompt_records
+        if (r["hash"], r["lang"]) not in store
+    )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Manage the offline explanation store.")
+    ap.add_argument("--db", type=Path, help=f"default {DEFAULT_DB_PATH}, or {STUB_DB_PATH} for stub")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="load explanations from JSONL files")
+    p_ingest.add_argument("files", nargs="+", type=Path)
+    p_ingest.add_argument("--source", default="", help="label stored with each explanation")
+    p_stub = sub.add_parser("stub", help="fill missing explanations for exported prompts with placeholders")
+    p_stub.add_argument("files", nargs="+", type=Path)
+    args = ap.parse_args()
+
+    if args.command == "stub" and (args.db or STUB_DB_PATH).resolve() == DEFAULT_DB_PATH.resolve():
+        ap.error(f"placeholders do not go into the app's database {DEFAULT_DB_PATH}")
+    db_path = args.db or (STUB_DB_PATH if args.command == "stub" else DEFAULT_DB_PATH)
+    store = ExplanationStore(db_path)
+    if args.command == "ingest":
+        n = ingest(store, read_jsonl(args.files), args.source)
+    else:
+        n = generate(store, read_jsonl(args.files))
+    print(f"Wrote {n} explanations ({len(store)} in {db_path})")
+    store.close()
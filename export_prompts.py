@@ -0,0 +1,118 @@
+# export_prompts.py
+"""Explanation prompts for every question in every language, as sharded JSONL.
+
+    python export_prompts.py --out prompts [--langs English Russian] [--shard-size 100000] [--workers 4]
+
+Each exam file is one task for a process pool. A worker streams its file
+through the parser and writes prompts straight into its own shards
+(<exam>-00000.jsonl, <exam>-00001.jsonl, ...), so memory stays at one question
+plus a write buffer however many prompts come out. A shard gets its final name
+only once complete; manifest.json lists all of them at the end.
+
+One record per line: {"file", "number", "hash", "lang", "prompt"}, where hash
+is core.question_hash.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core import COMPILED_PROMPTS, LANGS, exam_sort_key, iter_exam, question_hash
+
+DEFAULT_SHARD_SIZE = 100_000  # records per shard
+
+
+class ShardWriter:
+    """Writes lines into <prefix>-NNNNN.jsonl files of at most ``shard_size`` lines."""
+
+    def __init__(self, out_dir: Path, prefix: str, shard_size: int):
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.shards: List[Tuple[str, int]] = []  # (file name, records)
+        self._fh = None
+        self._count = 0
+
+    def write(self, line: str):
+        if self._fh is None or self._count == self.shard_size:
+            self._finish()
+            self._tmp = self.out_dir / f"{self.prefix}-{len(self.shards):05d}.jsonl.tmp"
+            self._fh = open(self._tmp, "w", encoding="utf-8")
+        self._fh.write(line)
+        self._count += 1
+
+    def _finish(self):
+        if self._fh is None:
+            return
+        self._fh.close()
+        final = self._tmp.with_suffix("")
+        os.replace(self._tmp, final)
+        self.shards.append((final.name, self._count))
+        self._fh = None
+        self._count = 0
+
+    def close(self) -> List[Tuple[str, int]]:
+        self._finish()
+        return self.shards
+
+
+def export_file(path: Path, out_dir: Path, langs: Sequence[str], shard_size: int) -> List[Tuple[str, int]]:
+    """Write the prompts of one exam file; returns its shards."""
+    for stale in out_dir.glob(f"{path.stem}-[0-9][0-9][0-9][0-9][0-9].jsonl"):
+        stale.unlink()
+    templates = [(json.dumps(lang), COMPILED_PROMPTS[lang]) for lang in langs]
+    name = json.dumps(path.name, ensure_ascii=False)
+    writer = ShardWriter(out_dir, path.stem, shard_size)
+    try:
+        with open(path, encoding="utf-8") as f:
+            for q in iter_exam(f):
+                fields = {
+                    "question": q.question,
+                    "options": "\n".join(f"{o.letter}. {o.text}" for o in q.options),
+                    "correct": ", ".join(q.correct),
+                }
+                head = f'{{"file": {name}, "number": {q.number}, "hash": "{question_hash(q)}"'
+                for lang_json, template in templates:
+                    prompt = json.dumps(template.render(**fields), ensure_ascii=False)
+                    writer.write(f'{head}, "lang": {lang_json}, "prompt": {prompt}}}\n')
+    finally:
+        shards = writer.close()
+    return shards
+
+
+def export_prompts(exam_folder: Path, out_dir: Path, langs: Optional[Sequence[str]] = None,
+                   shard_size: int = DEFAULT_SHARD_SIZE, max_workers: Optional[int] = None) -> Dict:
+    """Export every exam in the folder and write manifest.json (``max_workers=1`` runs inline)."""
+    langs = list(langs or LANGS)
+    unknown = [lang for lang in langs if lang not in COMPILED_PROMPTS]
+    if unknown:
+        raise ValueError(f"unknown languages: {', '.join(unknown)}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = sorted(exam_folder.glob("*.md"), key=lambda p: exam_sort_key(p.name))
+    task = partial(export_file, out_dir=out_dir, langs=langs, shard_size=shard_size)
+    if max_workers == 1 or len(paths) < 2:
+        results = [task(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(task, paths))
+
+    shards = [{"file": name, "records": n} for file_shards in results for name, n in file_shards]
+    manifest = {"langs": langs, "records": sum(s["records"] for s in shards), "shards": shards}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Export explanation prompts for all questions and languages.")
+    ap.add_argument("--exams", type=Path, default=Path("exams"))
+    ap.add_argument("--out", type=Path, default=Path("prompts"))
+    ap.add_argument("--langs", nargs="+", choices=LANGS, help="default: all languages")
+    ap.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="records per shard")
+    ap.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = ap.parse_args()
+
+    manifest = export_prompts(args.exams, args.out, args.langs, args.shard_size, args.workers)
+    print(f"Wrote {manifest['records']} prompts in {len(manifest['shards'])} shards to {args.out}")
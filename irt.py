@@ -0,0 +1,227 @@
+# irt.py
+"""Two-parameter logistic (2PL) item response model for the adaptive exam.
+
+    python irt.py fit [--db data/analytics.sqlite3] [--out data/irt_params.npz]
+
+``fit_2pl`` estimates a discrimination ``a`` and difficulty ``b`` per
+question from the analytics answer log (joint maximum likelihood, a few
+vectorized Newton steps with weak priors so items everyone gets right stay
+finite). The parameters are saved keyed by srs.question_uid and aligned to
+the bank's global ids once per process (``ItemParams.for_bank``); questions
+without enough history get a=1, b=0. While fewer than half of the items
+have fitted parameters (always, before the first ``irt.py fit``), the bank is
+not calibrated: ability estimates would only reflect the N(0, 1) prior and a
+pass mark derived from placeholder difficulties.
+
+An ``AdaptiveTest`` keeps the candidate's ability posterior on a fixed grid.
+The next question is the unasked one with the most Fisher information
+a²·p·(1-p) at the current estimate, one numpy pass over the bank, with ties
+broken by the session's random generator. The test
+stops once the posterior puts more than ``confidence`` on one side of the
+pass mark: the ability at which the expected score over the whole bank is
+75%. On an uncalibrated bank the test instead runs its full ``max_items``
+with items drawn at random, and the app scores it by percentage.
+
+Configure the parameter file with CLF_IRT_PARAMS (default data/irt_params.npz).
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_PARAMS_PATH = Path(os.environ.get("CLF_IRT_PARAMS", "data/irt_params.npz"))
+PASS_SCORE = 0.75
+THETA = np.linspace(-4.0, 4.0, 81)  # ability grid for the posterior
+MIN_RESPONSES = 5  # fewer answers than this and an item keeps the default parameters
+MIN_FITTED_SHARE = 0.5  # share of items with fitted parameters for a calibrated bank
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def fit_2pl(attempt: np.ndarray, item: np.ndarray, correct: np.ndarray, n_items: int,
+            iterations: int = 30) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(a, b, theta) from response triples; ``attempt`` and ``item`` are 0-based codes."""
+    y = correct.astype(np.float64)
+    n_attempts = int(attempt.max()) + 1 if len(attempt) else 0
+    theta = np.zeros(n_attempts)
+    counts = np.bincount(item, minlength=n_items)
+    acc = (np.bincount(item, weights=y, minlength=n_items) + 0.5) / (counts + 1.0)
+    b = -np.log(acc / (1 - acc))
+    a = np.ones(n_items)
+    for _ in range(iterations):
+        # abilities, with a N(0, 1) prior
+        p = _sigmoid(a[item] * (theta[attempt] - b[item]))
+        grad = np.bincount(attempt, weights=a[item] * (y - p), minlength=n_attempts) - theta
+        hess = np.bincount(attempt, weights=a[item] ** 2 * p * (1 - p), minlength=n_attempts) + 1.0
+        theta = np.clip(theta + grad / hess, THETA[0], THETA[-1])
+        theta = (theta - theta.mean()) / (theta.std() or 1.0)
+
+        # difficulties, N(0, 2²) prior
+        p = _sigmoid(a[item] * (theta[attempt] - b[item]))
+        grad = -np.bincount(item, weights=a[item] * (y - p), minlength=n_items) - b / 4
+        hess = np.bincount(item, weights=a[item] ** 2 * p * (1 - p), minlength=n_items) + 0.25
+        b = np.clip(b + grad / hess, THETA[0], THETA[-1])
+
+        # discriminations, N(1, 1) prior
+        p = _sigmoid(a[item] * (theta[attempt] - b[item]))
+        d = theta[attempt] - b[item]
+        grad = np.bincount(item, weights=d * (y - p), minlength=n_items) - (a - 1)
+        hess = np.bincount(item, weights=d * d * p * (1 - p), minlength=n_items) + 1.0
+        a = np.clip(a + grad / hess, 0.2, 3.0)
+    return a, b, theta
+
+
+def save_params(path: Path, qids: List[str], a: np.ndarray, b: np.ndarray):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez(f, qids=np.array(qids, dtype=str), a=a, b=b)
+
+
+def load_params(path: Path = DEFAULT_PARAMS_PATH) -> Dict[str, Tuple[float, float]]:
+    """qid -> (a, b); empty when nothing has been fitted yet."""
+    if not Path(path).exists():
+        return {}
+    with np.load(path) as data:
+        return {str(q): (float(a), float(b)) for q, a, b in zip(data["qids"], data["a"], data["b"])}
+
+
+@dataclass
+class ItemParams:
+    """Item parameters by global id, plus the ability that maps to the pass mark."""
+    a: np.ndarray
+    b: np.ndarray
+    fitted: Optional[np.ndarray] = None  # per item: parameters come from a fit (None: all of them)
+    cut: float = field(init=False)
+
+    def __post_init__(self):
+        self.cut = pass_mark(self.a, self.b)
+
+    @classmethod
+    def for_bank(cls, params: Dict[str, Tuple[float, float]], uid_map: Dict[str, int], n: int) -> "ItemParams":
+        a, b, fitted = np.ones(n), np.zeros(n), np.zeros(n, dtype=bool)
+        for uid, gid in uid_map.items():
+            if uid in params:
+                a[gid], b[gid] = params[uid]
+                fitted[gid] = True
+        return cls(a, b, fitted)
+
+    @property
+    def calibrated(self) -> bool:
+        """Enough items have fitted parameters for ability estimates and the pass mark to mean something."""
+        return self.fitted is None or (len(self.fitted) > 0 and self.fitted.mean() >= MIN_FITTED_SHARE)
+
+    def __len__(self) -> int:
+        return len(self.a)
+
+
+def pass_mark(a: np.ndarray, b: np.ndarray, score: float = PASS_SCORE) -> float:
+    """Ability whose expected share of correct answers over all items is ``score``."""
+    lo, hi = THETA[0] * 2, THETA[-1] * 2
+    for _ in range(50):
+        mid = (lo + hi) / 2
+        if _sigmoid(a * (mid - b)).mean() < score:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+class AdaptiveTest:
+    """One candidate's adaptive exam: asked ids and the ability posterior on THETA."""
+
+    def __init__(self, params: ItemParams, min_items: int = 10, max_items: int = 65, confidence: float = 0.95,
+                 rng: Optional[np.random.Generator] = None):
+        self.params = params
+        self.rng = np.random.default_rng() if rng is None else rng  # per session: breaks ties differently
+        self.max_items = min(max_items, len(params))
+        # uncalibrated: a fixed-length exam, since the posterior cannot say pass or fail yet
+        self.min_items = min_items if params.calibrated else self.max_items
+        self.confidence = confidence
+        self.ids: List[int] = []
+        self.log_post = -THETA ** 2 / 2  # N(0, 1) prior
+
+    @property
+    def _weights(self) -> np.ndarray:
+        w = np.exp(self.log_post - self.log_post.max())
+        return w / w.sum()
+
+    @property
+    def ability(self) -> Tuple[float, float]:
+        """Posterior mean and standard deviation of the ability."""
+        w = self._weights
+        mean = float(w @ THETA)
+        return mean, float(np.sqrt(w @ (THETA - mean) ** 2))
+
+    @property
+    def pass_probability(self) -> float:
+        return float(self._weights[THETA >= self.params.cut].sum())
+
+    @property
+    def done(self) -> bool:
+        if len(self.ids) >= self.max_items:
+            return True
+        p = self.pass_probability
+        return len(self.ids) >= self.min_items and max(p, 1 - p) >= self.confidence
+
+    def next_item(self) -> int:
+        """Unasked global id with the most information at the current ability estimate.
+
+        Ties (every item while no parameters are fitted, or mirrored difficulties)
+        are broken at random, so sessions do not all start at global id 0.
+        """
+        a, b = self.params.a, self.params.b
+        p = _sigmoid(a * (self.ability[0] - b))
+        info = a * a * p * (1 - p)
+        info[self.ids] = -1.0
+        best = np.flatnonzero(info >= info.max() * (1 - 1e-9))
+        return int(best[self.rng.integers(len(best))])
+
+    def start(self) -> Optional[int]:
+        if not self.ids and len(self.params):
+            self.ids.append(self.next_item())
+        return self.ids[-1] if self.ids else None
+
+    def answer(self, correct: bool) -> Optional[int]:
+        """Update the posterior with the answer to the last asked item; returns the next id, or None when done."""
+        gid = self.ids[-1]
+        p = _sigmoid(self.params.a[gid] * (THETA - self.params.b[gid]))
+        self.log_post = self.log_post + np.log(p if correct else 1 - p)
+        if self.done:
+            return None
+        self.ids.append(self.next_item())
+        return self.ids[-1]
+
+
+def main():
+    from analytics import DEFAULT_DB_PATH, Rollup
+
+    ap = argparse.ArgumentParser(description="Fit 2PL item parameters from the answer log.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    fit = sub.add_parser("fit")
+    fit.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    fit.add_argument("--out", type=Path, default=DEFAULT_PARAMS_PATH)
+    fit.add_argument("--min-responses", type=int, default=MIN_RESPONSES)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    rollup = Rollup(args.db)
+    rollup.refresh()
+    responses = rollup.responses()
+    qids, item = np.unique(responses["qid"].to_numpy(dtype=str), return_inverse=True)
+    _, attempt = np.unique(responses["attempt"].to_numpy(), return_inverse=True)
+    a, b, _ = fit_2pl(attempt, item, responses["correct"].to_numpy(), len(qids))
+    keep = np.bincount(item, minlength=len(qids)) >= args.min_responses
+    save_params(args.out, list(qids[keep]), a[keep], b[keep])
+    print(f"fitted {int(keep.sum())} of {len(qids)} questions from {len(responses)} answers "
+          f"in {time.perf_counter() - t0:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
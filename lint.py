@@ -0,0 +1,211 @@
+# lint.py
+"""Validation of exam markdown, for CI and pre-commit.
+
+    python lint.py [PATH ...] [--format text|json] [--strict] [-j N]
+
+PATHs are .md files or folders of them (default: exams). Every file is
+checked with the same single-pass scanner the app uses (core.iter_blocks), in
+a process pool when there are several files. Diagnostics print as
+``file:line: severity code message``. The exit status is 1 when there is an
+error, or any diagnostic at all with --strict.
+
+Errors mark questions the app drops or scores wrongly: skipped blocks,
+missing answers, answer letters that are not options, a "Correct answer:"
+line with anything besides letters and separators (the app reads every letter
+on it), a parsed answer that differs from the letters on that line, duplicate
+option letters or question numbers (a file that numbers every question "1." is
+fine), fewer than two options and a "(Choose TWO)" that disagrees with the
+answer count. Warnings mark input the parser guesses
+at: option lines without a letter, an answer block with no "Correct answer:"
+line, a missing </details> and multi-answer questions that do not say so.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core import CORRECT_LINE_RE, OPTION_LINE_RE, ParseIssue, RawBlock, build_question, iter_blocks
+
+CHOOSE_RE = re.compile(r"\(\s*(?:choose|select)\s+(\w+)\s*\.?\s*\)", re.IGNORECASE)
+ANSWER_SEPARATOR_RE = re.compile(r"[\s,;/&]+")
+COUNT_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
+
+ERROR, WARNING = "error", "warning"
+PARSE_ISSUE_SEVERITY = {"no-answer-block": ERROR, "unclosed-details": WARNING}
+
+
+@dataclass(slots=True)
+class Diagnostic:
+    path: str
+    line: int
+    severity: str
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.severity} {self.code} {self.message}"
+
+
+def _answer_letters(answer: str, allowed: Set[str]) -> Tuple[Set[str], bool]:
+    """Letters listed on a "Correct answer:" line and whether it lists nothing else.
+
+    A token is a letter list when it is one letter, a run of capitals ("AC") or
+    a run of option letters ("Ac"); , ; / & and spaces separate them. "and" is
+    not a separator: the app would read its a and d as answers too.
+    """
+    letters: Set[str] = set()
+    clean = True
+    for token in ANSWER_SEPARATOR_RE.split(answer.strip().rstrip(".")):
+        if not token:
+            continue
+        if token.isascii() and token.isalpha() and (
+                len(token) == 1 or token.isupper() or set(token.upper()) <= allowed):
+            letters.update(token.upper())
+        else:
+            clean = False
+    return letters, clean
+
+
+def _choose_count(question: str) -> Optional[int]:
+    m = CHOOSE_RE.search(question)
+    if not m:
+        return None
+    word = m.group(1).lower()
+    return int(word) if word.isdigit() else COUNT_WORDS.get(word)
+
+
+def check_block(block: RawBlock, report) -> None:
+    """Report problems in one question block; ``report(line, severity, code, message)``."""
+    q = build_question(block)
+    label = f"question {block.number}"
+
+    letters: Dict[str, int] = {}
+    option_lines = block.options_raw.split("\n")
+    for i, line in enumerate(option_lines):
+        if not line.strip():
+            continue
+        lineno = block.line + 1 + i
+        m = OPTION_LINE_RE.match(line.rstrip())
+        if not m:
+            report(lineno, WARNING, "unlabeled-option",
+                   f"{label}: option line without a letter, read as an extra option: {line.strip()[:60]!r}")
+            continue
+        letter = m.group(1).upper()
+        if letter in letters:
+            report(lineno, ERROR, "duplicate-option", f"{label}: option {letter} also on line {letters[letter]}")
+        else:
+            letters[letter] = lineno
+    if len(q.options) < 2:
+        report(block.line, ERROR, "too-few-options", f"{label}: {len(q.options)} option(s)")
+
+    details_line = block.line + len(option_lines)  # the line with <details>
+    m = CORRECT_LINE_RE.search(block.details_raw)
+    if m is None:
+        report(details_line, WARNING, "no-correct-line",
+               f"{label}: no 'Correct answer:' line, letters taken from the whole answer block")
+    else:
+        lineno = details_line + block.details_raw.count("\n", 0, m.start(1))
+        answer = m.group(1).strip()
+        allowed = {o.letter for o in q.options}
+        given, clean = _answer_letters(answer, allowed)
+        if not clean:
+            report(lineno, ERROR, "malformed-answer-line",
+                   f"{label}: 'Correct answer:' should list only option letters, got {answer[:60]!r}")
+        unknown = sorted(given - allowed)
+        if unknown:
+            report(lineno, ERROR, "unknown-answer-letter",
+                   f"{label}: answer {', '.join(unknown)} is not among options {''.join(sorted(allowed))}")
+        if set(q.correct) != given & allowed:
+            report(lineno, ERROR, "answer-mismatch",
+                   f"{label}: parsed as {', '.join(q.correct) or 'nothing'} "
+                   f"but the line says {', '.join(sorted(given & allowed)) or 'nothing'}")
+    if not q.correct:
+        report(details_line, ERROR, "missing-answer", f"{label}: no correct answer")
+        return
+
+    expected = _choose_count(q.question)
+    if expected is not None and expected != len(q.correct):
+        report(block.line, ERROR, "choose-count",
+               f"{label}: asks to choose {expected} but has {len(q.correct)} correct answer(s)")
+    elif expected is None and len(q.correct) > 1:
+        report(block.line, WARNING, "multi-answer-unmarked",
+               f"{label}: {len(q.correct)} correct answers but no '(Choose N)' in the question")
+
+
+def lint_text(text: str, path: str = "<string>") -> List[Diagnostic]:
+    out: List[Diagnostic] = []
+
+    def report(line: int, severity: str, code: str, message: str):
+        out.append(Diagnostic(path, line, severity, code, message))
+
+    def on_issue(issue: ParseIssue):
+        report(issue.line, PARSE_ISSUE_SEVERITY.get(issue.code, ERROR), issue.code or "parse", issue.message)
+
+    blocks = list(iter_blocks(text.split("\n"), on_issue))
+    lazy = all(b.number == 1 for b in blocks)  # "1." everywhere: markdown numbers the list itself
+    numbers: Dict[int, int] = {}
+    for block in blocks:
+        if block.number in numbers and not lazy:
+            report(block.line, ERROR, "duplicate-number",
+                   f"question {block.number}: number already used on line {numbers[block.number]}")
+        else:
+            numbers[block.number] = block.line
+        check_block(block, report)
+    out.sort(key=lambda d: d.line)
+    return out
+
+
+def lint_file(path: Path) -> List[Diagnostic]:
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return [Diagnostic(str(path), 1, ERROR, "unreadable", str(e))]
+    return lint_text(text, str(path))
+
+
+def expand(paths: Iterable[Path]) -> List[Path]:
+    out: List[Path] = []
+    for p in paths:
+        out += sorted(p.glob("*.md")) if p.is_dir() else [p]
+    return out
+
+
+def lint_paths(paths: List[Path], max_workers: Optional[int] = None) -> List[Diagnostic]:
+    """Diagnostics for every file, in input order (``max_workers=1`` lints inline)."""
+    if max_workers == 1 or len(paths) < 2:
+        results = [lint_file(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunksize = max(1, len(paths) // (4 * (max_workers or os.cpu_count() or 1)))
+            results = list(pool.map(lint_file, paths, chunksize=chunksize))
+    return [d for file_diagnostics in results for d in file_diagnostics]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Check exam markdown for malformed questions.")
+    ap.add_argument("paths", nargs="*", type=Path, default=[Path("exams")], help=".md files or folders")
+    ap.add_argument("--format", choices=("text", "json"), default="text")
+    ap.add_argument("--strict", action="store_true", help="fail on warnings too")
+    ap.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per CPU)")
+    args = ap.parse_args(argv)
+
+    files = expand(args.paths)
+    diagnostics = lint_paths(files, args.jobs)
+    if args.format == "json":
+        print(json.dumps([asdict(d) for d in diagnostics], ensure_ascii=False, indent=2))
+    else:
+        for d in diagnostics:
+            print(d)
+        errors = sum(d.severity == ERROR for d in diagnostics)
+        print(f"{len(files)} files: {errors} errors, {len(diagnostics) - errors} warnings", file=sys.stderr)
+    failing = diagnostics if args.strict else [d for d in diagnostics if d.severity == ERROR]
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# metrics.py
+"""In-process latency histograms and counters in Prometheus text format.
+
+Off unless CLF_METRICS=1. When off, ``timed`` returns the function unchanged
+and ``observe``/``inc`` return on their first line, so instrumented code pays
+nothing measurable. When on, the numbers are shown on the Metrics page, and
+with CLF_METRICS_PORT also served at http://127.0.0.1:<port>/metrics for a
+Prometheus scraper.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+ENABLED = os.environ.get("CLF_METRICS", "") not in ("", "0")
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SESSION_TTL = 300.0  # a session counts as active this long after its last rerun
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_histograms: Dict[str, Dict[Labels, Histogram]] = {}
+_counters: Dict[str, Dict[Labels, float]] = {}
+_callbacks: Dict[str, Tuple[str, Callable[[], float]]] = {}  # name -> (type, fn)
+_sessions: Dict[str, float] = {}
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def observe(name: str, seconds: float, **labels: str):
+    if not ENABLED:
+        return
+    key = _labels(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = Histogram()
+        hist.observe(seconds)
+
+
+def inc(name: str, amount: float = 1, **labels: str):
+    if not ENABLED:
+        return
+    key = _labels(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+def timed(name: str, **labels: str):
+    """Decorator recording the call latency in the histogram ``name``; a no-op when metrics are off."""
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def timed_fn(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0, **labels)
+        return timed_fn
+    return wrap
+
+
+def register(name: str, fn: Callable[[], float], kind: str = "gauge"):
+    """A value read at scrape time, e.g. counters another object already keeps."""
+    if ENABLED:
+        with _lock:
+            _callbacks[name] = (kind, fn)
+
+
+def touch_session(session_id: str, now: Optional[float] = None):
+    if not ENABLED:
+        return
+    with _lock:
+        _sessions[session_id] = time.monotonic() if now is None else now
+
+
+def active_sessions(now: Optional[float] = None) -> int:
+    now = time.monotonic() if now is None else now
+    with _lock:
+        for sid in [sid for sid, seen in _sessions.items() if now - seen > SESSION_TTL]:
+            del _sessions[sid]
+        return len(_sessions)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _callbacks.clear()
+        _sessions.clear()
+
+
+# ---- exposition ----
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+
+def _fmt_num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        histograms = {name: {k: (list(h.counts), h.sum, h.count) for k, h in series.items()}
+                      for name, series in _histograms.items()}
+        counters = {name: dict(series) for name, series in _counters.items()}
+        callbacks = dict(_callbacks)
+    out: List[str] = []
+    for name in sorted(histograms):
+        out.append(f"# TYPE {name} histogram")
+        for labels, (counts, total, count) in sorted(histograms[name].items()):
+            cumulative = 0
+            for le, n in zip([*map(repr, BUCKETS), "+Inf"], counts):
+                cumulative += n
+                out.append(f"{name}_bucket{_fmt_labels(labels, (('le', le),))} {cumulative}")
+            out.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_num(total)}")
+            out.append(f"{name}_count{_fmt_labels(labels)} {count}")
+    for name in sorted(counters):
+        out.append(f"# TYPE {name} counter")
+        for labels, value in sorted(counters[name].items()):
+            out.append(f"{name}{_fmt_labels(labels)} {_fmt_num(value)}")
+    for name, (kind, fn) in sorted(callbacks.items()):
+        out.append(f"# TYPE {name} {kind}")
+        out.append(f"{name} {_fmt_num(fn())}")
+    out.append("# TYPE clf_active_sessions gauge")
+    out.append(f"clf_active_sessions {active_sessions()}")
+    return "\n".join(out) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread; calling it again returns the running server."""
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
@@ -0,0 +1,149 @@
+# mock_exam.py
+"""Random CLF-C02-style mock exams sampled from the whole question bank.
+
+``build_bank_index`` runs once per process: it packs every question into a
+shared QuestionStore (global id = store index) and groups the ids into strata
+by answer kind (single/multi) and topic tag. With tagger.py tags the topic is
+the CLF-C02 domain, and the ids are also indexed by AWS service, per stratum.
+``sample_exam`` then only draws ids, so a session holds k integers and
+generating an exam is O(k), not O(bank size); filtering by service costs the
+size of that service's posting lists.
+"""
+import random
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from core import ExamIndex, Question
+from store import QuestionStore, QuestionView
+from tagger import QuestionTags
+
+EXAM_LENGTH = 65  # scored + unscored questions on the real CLF-C02
+
+Stratum = Tuple[str, str]  # (answer kind, topic tag)
+
+
+def answer_kind(q: Question) -> str:
+    return "multi" if len(q.correct) > 1 else "single"
+
+
+@dataclass
+class BankIndex:
+    store: QuestionStore
+    files: List[str]
+    file_of: array                 # global id -> index into files
+    strata: Dict[Stratum, array]   # stratum -> global ids
+    services: Dict[str, array] = field(default_factory=dict)  # AWS service -> global ids
+    service_strata: Dict[str, Dict[Stratum, array]] = field(default_factory=dict)  # service -> stratum -> ids
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def file_name(self, gid: int) -> str:
+        return self.files[self.file_of[gid]]
+
+    def tags(self) -> List[str]:
+        return sorted({tag for _, tag in self.strata})
+
+
+def build_bank_index(index: ExamIndex, tag_of: Optional[Callable[[Question], str]] = None,
+                     tags: Optional[Mapping[str, Sequence[QuestionTags]]] = None) -> BankIndex:
+    """Shared index over every question.
+
+    The topic of a question is its domain in ``tags`` (file name -> tags in
+    question order, see tagger.TagIndex.tag_files), else ``tag_of(q)``, else "all".
+    """
+    files = list(index.files)
+    file_of = array("I")
+    strata: Dict[Stratum, array] = {}
+    services: Dict[str, array] = {}
+    service_strata: Dict[str, Dict[Stratum, array]] = {}
+    gid = 0
+    for fi, name in enumerate(files):
+        file_tags = tags.get(name) if tags is not None else None
+        for i, q in enumerate(index.files[name]):
+            file_of.append(fi)
+            if file_tags is not None:
+                topic = file_tags[i].domain
+            else:
+                topic = tag_of(q) if tag_of else "all"
+            stratum = (answer_kind(q), topic)
+            strata.setdefault(stratum, array("I")).append(gid)
+            for service in file_tags[i].services if file_tags is not None else ():
+                services.setdefault(service, array("I")).append(gid)
+                service_strata.setdefault(service, {}).setdefault(stratum, array("I")).append(gid)
+            gid += 1
+    store = QuestionStore.from_questions(q for name in files for q in index.files[name])
+    return BankIndex(store, files, file_of, strata, services, service_strata)
+
+
+def _allocate(sizes: Dict[Stratum, int], k: int) -> Dict[Stratum, int]:
+    """Split k across strata in proportion to their sizes (largest remainder)."""
+    total = sum(sizes.values())
+    exact = {key: k * n / total for key, n in sizes.items()}
+    counts = {key: int(x) for key, x in exact.items()}
+    by_remainder = sorted(sizes, key=lambda key: (counts[key] - exact[key], key))
+    for key in by_remainder[:k - sum(counts.values())]:
+        counts[key] += 1
+    return counts
+
+
+def sample_exam(bank: BankIndex, k: int = EXAM_LENGTH, seed: Optional[int] = None, stratify: bool = True,
+                tags: Optional[Iterable[str]] = None, services: Optional[Iterable[str]] = None) -> List[int]:
+    """Global ids of a k-question mock exam, in random order.
+
+    With ``stratify`` each (answer kind, tag) group gets its proportional share;
+    ``tags`` restricts the exam to those topics and ``services`` to questions
+    about any of those AWS services. The same seed gives the same exam.
+    """
+    rng = random.Random(seed)
+    wanted = None if tags is None else set(tags)
+    strata = {key: ids for key, ids in bank.strata.items() if wanted is None or key[1] in wanted}
+    if services is not None:
+        postings = [bank.service_strata.get(s, {}) for s in set(services)]
+        picked: Dict[Stratum, array] = {}
+        for key in strata:
+            lists = [p[key] for p in postings if key in p]
+            if len(lists) == 1:
+                picked[key] = lists[0]
+            elif lists:
+                picked[key] = array("I", sorted(set().union(*lists)))
+        strata = picked
+    available = sum(len(ids) for ids in strata.values())
+    k = min(k, available)
+    if k == 0:
+        return []
+
+    if stratify:
+        ids: List[int] = []
+        for key, n in _allocate({key: len(v) for key, v in strata.items()}, k).items():
+            if n:
+                ids += rng.sample(strata[key], n)
+    elif wanted is None and services is None:
+        ids = rng.sample(range(len(bank)), k)
+    else:
+        # draw positions over the concatenated strata without building it
+        keys = sorted(strata)
+        ids = []
+        for pos in sorted(rng.sample(range(available), k)):
+            for key in keys:
+                if pos < len(strata[key]):
+                    ids.append(strata[key][pos])
+                    break
+                pos -= len(strata[key])
+    rng.shuffle(ids)
+    return ids
+
+
+class ExamSelection(Sequence):
+    """Questions of a sampled exam, resolved from the shared store on access."""
+
+    def __init__(self, bank: BankIndex, ids: Sequence[int]):
+        self.bank = bank
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> QuestionView:
+        return self.bank.store[self.ids[i]]
@@ -0,0 +1,52 @@
+import streamlit as st
+
+from analytics import LETTERS, Rollup
+
+st.title("📊 Answer analytics")
+
+
+@st.cache_resource(show_spinner=False)
+def load_rollup() -> Rollup:
+    return Rollup()
+
+
+rollup = load_rollup()
+rollup.refresh()
+if not rollup.events:
+    st.info("No answers recorded yet. Submit some answers on the exam page first.")
+    st.stop()
+
+min_answered = st.slider("Smallest attempt counted for discrimination and scores (answers)", 1, 65, 10)
+stats = rollup.question_stats(min_answered)
+scores = rollup.attempt_scores(min_answered)
+
+a, b, c = st.columns(3)
+a.metric("Answers", f"{rollup.events:,}")
+b.metric("Questions answered", f"{len(stats):,}")
+c.metric("Attempts", f"{len(scores):,}")
+
+st.subheader("Hardest questions")
+st.caption("Accuracy is the share of correct answers. Discrimination is accuracy in the top 27% of "
+           "attempts minus the bottom 27%; near zero or negative means the question does not separate "
+           "strong from weak candidates.")
+min_question_answers = st.number_input("Only questions answered at least", min_value=1, value=5, step=1)
+shown = stats[stats["answered"] >= min_question_answers]
+st.dataframe(
+    shown[["qid", "answered", "accuracy", "discrimination", "top_distractor", "top_distractor_rate"]
+          + [f"pick_{L}" for L in LETTERS]],
+    hide_index=True,
+    column_config={
+        "accuracy": st.column_config.ProgressColumn("accuracy", format="percent", min_value=0, max_value=1),
+        "top_distractor_rate": st.column_config.NumberColumn("distractor picked", format="percent"),
+        **{f"pick_{L}": st.column_config.NumberColumn(L, format="percent") for L in LETTERS},
+    },
+)
+
+st.subheader("Score distribution per exam")
+dist = rollup.score_distribution(min_answered)
+if dist.empty:
+    st.write("No attempts with enough answers yet.")
+else:
+    dist.columns = [f"{lo}–{lo + 10}%" for lo in dist.columns]
+    st.bar_chart(dist.T)
+    st.dataframe(dist)
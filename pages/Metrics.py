@@ -0,0 +1,14 @@
+import streamlit as st
+
+import metrics
+
+st.title("📈 Metrics")
+
+if not metrics.ENABLED:
+    st.info("Metrics are off. Start the app with `CLF_METRICS=1` to collect them.")
+    st.stop()
+
+text = metrics.render()
+st.caption(f"{metrics.active_sessions()} active sessions · Prometheus text format")
+st.download_button("⬇️ Download metrics", text, file_name="metrics.prom", mime="text/plain")
+st.code(text, language="text")
@@ -0,0 +1,111 @@
+# parse_cache.py
+"""Persistent parse cache shared by every process on the machine.
+
+Entries are JSON files named after sha256(path, content hash, PARSER_VERSION),
+so an edited exam or a parser change is simply a miss. Writes go to a temp
+file and are renamed into place, readers treat a missing or broken entry as a
+miss, and eviction tolerates files removed by another process, so several
+workers can share one directory without locks. Hits refresh the entry's
+mtime; eviction removes the oldest entries until the total size fits.
+
+Configure with CLF_PARSE_CACHE_DIR (default .cache/parse) and
+CLF_PARSE_CACHE_MAX_MB (default 64).
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core import PARSER_VERSION, Option, Question, parse_exam
+
+DEFAULT_DIR = Path(os.environ.get("CLF_PARSE_CACHE_DIR", ".cache/parse"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("CLF_PARSE_CACHE_MAX_MB", "64")) * 2**20)
+
+
+def _encode(qs: List[Question]) -> bytes:
+    rows = [[q.number, q.question, [[o.letter, o.text] for o in q.options], q.correct] for q in qs]
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(raw: bytes) -> List[Question]:
+    return [
+        Question(number=n, question=text, options=[Option(L, t) for L, t in opts], correct=correct)
+        for n, text, opts, correct in json.loads(raw)
+    ]
+
+
+class ParseCache:
+    def __init__(self, directory: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def key(self, path: Path, data: bytes) -> str:
+        h = hashlib.sha256()
+        h.update(str(path).encode("utf-8") + b"\0")
+        h.update(hashlib.sha256(data).digest())
+        h.update(f"\0parser-v{PARSER_VERSION}".encode("ascii"))
+        return h.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Question]]:
+        entry = self._entry(key)
+        try:
+            qs = _decode(entry.read_bytes())
+        except (OSError, ValueError, TypeError):
+            self.stats["misses"] += 1
+            return None
+        try:
+            os.utime(entry)  # LRU: most recently used has the newest mtime
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return qs
+
+    def put(self, key: str, qs: List[Question]):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_encode(qs))
+                os.replace(tmp, self._entry(key))
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError:
+            return  # a read-only or full disk only costs us the cache
+        self.stats["writes"] += 1
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for p in self.directory.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                self.stats["evictions"] += 1
+            except OSError:
+                pass  # already evicted by another worker, or still open on Windows
+            total -= size
+
+    def parse(self, path: Path, data: bytes) -> List[Question]:
+        """Questions for the given file contents, parsing only on a cache miss."""
+        key = self.key(path, data)
+        qs = self.get(key)
+        if qs is None:
+            qs = parse_exam(data.decode("utf-8"))
+            self.put(key, qs)
+        return qs
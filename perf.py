@@ -0,0 +1,61 @@
+# perf.py
+"""Wall-time of each section of a Streamlit rerun.
+
+    with rerun_timer("full") as timer:
+        with timer.section("sidebar"):
+            ...
+
+Every finished rerun is logged to the "exam.perf" logger as one line; set
+CLF_PERF_LOG=1 to print those lines to stderr. With metrics on (see
+metrics.py) the timings also feed the rerun histograms and counters.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import metrics
+
+log = logging.getLogger("exam.perf")
+if os.environ.get("CLF_PERF_LOG") and not log.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+
+
+class RerunTimer:
+    def __init__(self, scope: str):
+        self.scope = scope
+        self.sections: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.total = 0.0
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0.0) + time.perf_counter() - t0
+
+    def report(self) -> str:
+        parts = " ".join(f"{name}={sec * 1000:.1f}ms" for name, sec in self.sections.items())
+        return f"{self.scope} rerun {self.total * 1000:.1f}ms {parts}".rstrip()
+
+
+@contextmanager
+def rerun_timer(scope: str) -> Iterator[RerunTimer]:
+    """Time one rerun; logs even when the script ends with st.stop() or st.rerun()."""
+    timer = RerunTimer(scope)
+    try:
+        yield timer
+    finally:
+        timer.total = time.perf_counter() - timer.started
+        log.info(timer.report())
+        if metrics.ENABLED:
+            metrics.inc("clf_reruns_total", scope=scope)
+            metrics.observe("clf_rerun_seconds", timer.total, scope=scope)
+            for name, seconds in timer.sections.items():
+                metrics.observe("clf_rerun_section_seconds", seconds, scope=scope, section=name)
@@ -0,0 +1,156 @@
+# search.py
+"""Full-text search over every question and its options.
+
+An inverted index (term -> {doc: term frequency}) ranked with BM25. The last
+query word, or any word ending in "*", also matches every indexed term it
+prefixes. A single exam can be re-indexed with ``update_file`` after it
+changes. Postings are frozen into numpy arrays on first use, so a query costs
+a few vectorized passes no matter how long the postings are. Updates and
+queries take one lock, so a file watcher thread can re-index while sessions
+search.
+
+    python search.py trusted advisor
+"""
+import bisect
+import math
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core import ExamIndex, Question, load_all_exams, tokenize
+
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_TERMS = 50
+
+
+@dataclass
+class SearchHit:
+    file: str
+    position: int  # index of the question within its file
+    question: Question
+    score: float
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.docs: List[Optional[Tuple[str, int, Question]]] = []  # doc id -> (file, position, question)
+        self.doc_len: List[int] = []
+        self.file_docs: Dict[str, List[int]] = {}
+        self.n_docs = 0
+        self._total_len = 0
+        self._frozen: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._norm: Optional[np.ndarray] = None
+        self._vocab: Optional[List[str]] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_exam_index(cls, index: ExamIndex) -> "SearchIndex":
+        si = cls()
+        for name, qs in index.files.items():
+            si.update_file(name, qs)
+        return si
+
+    # ---- updates ----
+    def update_file(self, name: str, questions: Iterable[Question]):
+        """(Re)index one exam file; pass no questions to drop it."""
+        with self._lock:
+            self.remove_file(name)
+            ids: List[int] = []
+            for pos, q in enumerate(questions):
+                doc = len(self.docs)
+                terms = Counter(tokenize(" ".join([q.question, *(o.text for o in q.options)])))
+                for term, tf in terms.items():
+                    self.postings.setdefault(term, {})[doc] = tf
+                self.docs.append((name, pos, q))
+                length = sum(terms.values())
+                self.doc_len.append(length)
+                self._total_len += length
+                self.n_docs += 1
+                ids.append(doc)
+            if ids:
+                self.file_docs[name] = ids
+            self._invalidate()
+
+    def remove_file(self, name: str):
+        with self._lock:
+            for doc in self.file_docs.pop(name, []):
+                _, _, q = self.docs[doc]
+                for term in set(tokenize(" ".join([q.question, *(o.text for o in q.options)]))):
+                    posting = self.postings[term]
+                    del posting[doc]
+                    if not posting:
+                        del self.postings[term]
+                self.docs[doc] = None
+                self._total_len -= self.doc_len[doc]
+                self.doc_len[doc] = 0
+                self.n_docs -= 1
+            self._invalidate()
+
+    def _invalidate(self):
+        # document lengths feed every BM25 weight, so any change refreezes all postings
+        self._frozen.clear()
+        self._norm = None
+        self._vocab = None
+
+    # ---- query ----
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Doc ids of a term and their BM25 term weights (without idf)."""
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            if self._norm is None:
+                avgdl = self._total_len / self.n_docs
+                self._norm = K1 * (1 - B + B * np.asarray(self.doc_len, dtype=np.float64) / avgdl)
+            posting = self.postings[term]
+            docs = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            tf = np.fromiter(posting.values(), dtype=np.float64, count=len(posting))
+            frozen = self._frozen[term] = (docs, tf * (K1 + 1) / (tf + self._norm[docs]))
+        return frozen
+
+    def _expand(self, prefix: str) -> List[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        i = bisect.bisect_left(self._vocab, prefix)
+        out: List[str] = []
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            out.append(self._vocab[i])
+            i += 1
+        # keep the most common expansions; rare ones barely move the ranking
+        return sorted(out, key=lambda t: -len(self.postings[t]))[:MAX_PREFIX_TERMS]
+
+    def search(self, query: str, limit: int = 20, prefix_last: bool = True) -> List[SearchHit]:
+        with self._lock:
+            return self._search(query, limit, prefix_last)
+
+    def _search(self, query: str, limit: int, prefix_last: bool) -> List[SearchHit]:
+        words = query.lower().split()
+        if not words or not self.n_docs:
+            return []
+
+        scores = np.zeros(len(self.docs), dtype=np.float64)
+        for i, word in enumerate(words):
+            is_prefix = word.endswith("*") or (prefix_last and i == len(words) - 1)
+            for token in tokenize(word):
+                terms = self._expand(token) if is_prefix else ([token] if token in self.postings else [])
+                for term in terms:
+                    docs, weight = self._postings(term)
+                    idf = math.log(1 + (self.n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    scores[docs] += idf * weight
+
+        hits = np.flatnonzero(scores)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [SearchHit(*self.docs[d], float(scores[d])) for d in hits.tolist()]
+
+
+if __name__ == "__main__":
+    index = SearchIndex.from_exam_index(load_all_exams(Path("exams")))
+    for hit in index.search(" ".join(sys.argv[1:])):
+        print(f"{hit.score:6.2f}  {hit.file}#{hit.question.number}  {hit.question.question}")
@@ -0,0 +1,196 @@
+# srs.py
+"""Spaced repetition (SM-2) backed by a local SQLite database.
+
+Cards are keyed by a stable question id (file, number and content hash, see
+``question_uid``), so an edited question starts over as a new card. The
+database runs in WAL mode so several app workers can read while one writes.
+Reviews are buffered and written in one transaction per batch; ``due``
+flushes first and is served by the (user, due) index. Cards whose question
+left the bank (not in ``known``) are listed in a temporary table once per bank
+version, usually a handful, so ``due`` skips them in SQL and ``due_count``
+subtracts them from an index-only count.
+
+Configure the location with CLF_SRS_DB (default data/srs.sqlite3).
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Tuple
+
+from core import Question, question_hash
+
+DEFAULT_DB_PATH = Path(os.environ.get("CLF_SRS_DB", "data/srs.sqlite3"))
+DAY = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    user TEXT NOT NULL,
+    qid TEXT NOT NULL,
+    ease REAL NOT NULL,
+    interval_days REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    due REAL NOT NULL,
+    last_review REAL NOT NULL,
+    PRIMARY KEY (user, qid)
+);
+CREATE INDEX IF NOT EXISTS cards_user_due ON cards (user, due);
+CREATE TABLE IF NOT EXISTS reviews (
+    user TEXT NOT NULL,
+    qid TEXT NOT NULL,
+    ts REAL NOT NULL,
+    grade INTEGER NOT NULL
+);
+"""
+
+
+def question_uid(file_name: str, q: Question) -> str:
+    return f"{file_name}#{q.number}#{question_hash(q)[:16]}"
+
+
+@dataclass
+class Card:
+    ease: float = 2.5
+    interval_days: float = 0.0
+    reps: int = 0
+    lapses: int = 0
+    due: float = 0.0
+    last_review: float = 0.0
+
+
+def sm2(card: Card, grade: int, now: float) -> Card:
+    """Next card state after a review graded 0 (blackout) .. 5 (perfect)."""
+    if grade >= 3:
+        if card.reps == 0:
+            interval = 1.0
+        elif card.reps == 1:
+            interval = 6.0
+        else:
+            interval = round(card.interval_days * card.ease)
+        reps, lapses = card.reps + 1, card.lapses
+    else:
+        interval, reps, lapses = 1.0, 0, card.lapses + 1
+    ease = max(1.3, card.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return Card(ease, interval, reps, lapses, now + interval * DAY, now)
+
+
+class Scheduler:
+    """Thread-safe; one instance per process is enough."""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, batch_size: int = 32, max_delay: float = 5.0):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._pending_cards: Dict[Tuple[str, str], Card] = {}
+        self._pending_reviews: List[Tuple[str, str, float, int]] = []
+        self._oldest_pending = 0.0
+        self._known: Optional[Collection[str]] = None  # the collection temp.orphan_qids was built from
+
+    def card(self, user: str, qid: str) -> Optional[Card]:
+        with self._lock:
+            return self._card(user, qid)
+
+    def _card(self, user: str, qid: str) -> Optional[Card]:
+        pending = self._pending_cards.get((user, qid))
+        if pending is not None:
+            return pending
+        row = self.db.execute(
+            "SELECT ease, interval_days, reps, lapses, due, last_review FROM cards WHERE user=? AND qid=?",
+            (user, qid),
+        ).fetchone()
+        return Card(*row) if row else None
+
+    def review(self, user: str, qid: str, grade: int, now: Optional[float] = None) -> Card:
+        now = time.time() if now is None else now
+        with self._lock:
+            card = sm2(self._card(user, qid) or Card(), grade, now)
+            if not self._pending_reviews:
+                self._oldest_pending = time.monotonic()
+            if self._known is not None and qid not in self._known:
+                self._known = None  # a card outside the bank: rebuild the orphan list on next use
+            self._pending_cards[(user, qid)] = card
+            self._pending_reviews.append((user, qid, now, grade))
+            if (len(self._pending_reviews) >= self.batch_size
+                    or time.monotonic() - self._oldest_pending >= self.max_delay):
+                self._flush()
+        return card
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending_reviews:
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO cards (user, qid, ease, interval_days, reps, lapses, due, last_review) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(user, qid, c.ease, c.interval_days, c.reps, c.lapses, c.due, c.last_review)
+                 for (user, qid), c in self._pending_cards.items()],
+            )
+            self.db.executemany("INSERT INTO reviews (user, qid, ts, grade) VALUES (?, ?, ?, ?)",
+                                self._pending_reviews)
+        self._pending_cards.clear()
+        self._pending_reviews.clear()
+
+    def _use_known(self, known: Collection[str]):
+        """List the card ids missing from ``known`` in temp.orphan_qids. Rebuilt only when another
+        collection is passed, so callers hand in an immutable one (e.g. the cached uid map of the bank)."""
+        if known is self._known:
+            return
+        qids = self.db.execute("SELECT DISTINCT qid FROM cards").fetchall()
+        with self.db:
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS orphan_qids (qid TEXT PRIMARY KEY) WITHOUT ROWID")
+            self.db.execute("DELETE FROM orphan_qids")
+            self.db.executemany("INSERT INTO orphan_qids (qid) VALUES (?)",
+                                ((qid,) for (qid,) in qids if qid not in known))
+        self._known = known
+
+    def due(self, user: str, now: Optional[float] = None, limit: int = 20,
+            known: Optional[Collection[str]] = None) -> List[str]:
+        """Question ids due for review, most overdue first.
+
+        With ``known`` (e.g. the ids of the current bank), cards of deleted or
+        edited questions are skipped before the limit applies.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._flush()
+            if known is None:
+                rows = self.db.execute(
+                    "SELECT qid FROM cards WHERE user=? AND due<=? ORDER BY due LIMIT ?", (user, now, limit)
+                ).fetchall()
+            else:
+                self._use_known(known)
+                rows = self.db.execute(
+                    "SELECT qid FROM cards WHERE user=? AND due<=? AND qid NOT IN orphan_qids ORDER BY due LIMIT ?",
+                    (user, now, limit)).fetchall()
+            return [qid for (qid,) in rows]
+
+    def due_count(self, user: str, now: Optional[float] = None, known: Optional[Collection[str]] = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._flush()
+            if known is None:
+                return self.db.execute("SELECT COUNT(*) FROM cards WHERE user=? AND due<=?",
+                                       (user, now)).fetchone()[0]
+            self._use_known(known)
+            # CROSS JOIN keeps SQLite from scanning every due card: one lookup per orphan instead
+            return self.db.execute(
+                "SELECT (SELECT COUNT(*) FROM cards WHERE user=:user AND due<=:now) - "
+                "(SELECT COUNT(*) FROM orphan_qids o CROSS JOIN cards c ON c.user=:user AND c.qid=o.qid "
+                "WHERE c.due<=:now)", {"user": user, "now": now}).fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.db.close()
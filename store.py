@@ -0,0 +1,139 @@
+# store.py
+"""Columnar, read-only question storage for large banks.
+
+A QuestionStore keeps every question's text in one UTF-8 buffer with u32
+offsets, option letters as one byte each and correct answers as a bitmask
+(bit 0 = "A"). Indexing returns a QuestionView, which has the same attributes
+as core.Question, so the UI and build_prompt work on it unchanged.
+"""
+from array import array
+from typing import Iterable, Iterator, List
+
+from core import Option, Question
+
+
+def letters_to_mask(letters: Iterable[str]) -> int:
+    mask = 0
+    for L in letters:
+        mask |= 1 << (ord(L) - ord("A"))
+    return mask
+
+
+def mask_to_letters(mask: int) -> List[str]:
+    out: List[str] = []
+    bit = 0
+    while mask:
+        if mask & 1:
+            out.append(chr(ord("A") + bit))
+        mask >>= 1
+        bit += 1
+    return out
+
+
+class QuestionView:
+    """A question inside a QuestionStore; attributes are decoded on access."""
+
+    __slots__ = ("_store", "_idx")
+
+    def __init__(self, store: "QuestionStore", idx: int):
+        self._store = store
+        self._idx = idx
+
+    @property
+    def id(self) -> int:
+        return self._idx
+
+    @property
+    def number(self) -> int:
+        return self._store.numbers[self._idx]
+
+    @property
+    def question(self) -> str:
+        return self._store._text(self._store._q_text[self._idx])
+
+    @property
+    def options(self) -> List[Option]:
+        s = self._store
+        return [
+            Option(chr(s._opt_letters[j]), s._text(s._opt_text[j]))
+            for j in range(s._opt_start[self._idx], s._opt_start[self._idx + 1])
+        ]
+
+    @property
+    def correct(self) -> List[str]:
+        return mask_to_letters(self._store.correct_mask[self._idx])
+
+    def to_question(self) -> Question:
+        return Question(number=self.number, question=self.question, options=self.options, correct=self.correct)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, QuestionView):
+            return self._store is other._store and self._idx == other._idx
+        if isinstance(other, Question):
+            return self.to_question() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._idx))
+
+    def __repr__(self) -> str:
+        return f"QuestionView({self._idx}, number={self.number})"
+
+
+class QuestionStore:
+    """Immutable columnar bank; build it with ``QuestionStore.from_questions``."""
+
+    __slots__ = ("numbers", "correct_mask", "_q_text", "_opt_start", "_opt_letters", "_opt_text",
+                 "_offsets", "_buf", "__weakref__")
+
+    def __init__(self):
+        self.numbers = array("I")
+        self.correct_mask = array("Q")
+        self._q_text = array("I")        # string id of the question text
+        self._opt_start = array("I", [0])
+        self._opt_letters = bytearray()
+        self._opt_text = array("I")      # string id of each option text
+        self._offsets = array("I", [0])  # string id -> [offsets[id], offsets[id + 1]) in _buf
+        self._buf = b""
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[Question]) -> "QuestionStore":
+        store = cls()
+        ids = {}
+        buf = bytearray()
+
+        def intern(s: str) -> int:
+            sid = ids.get(s)
+            if sid is None:
+                sid = ids[s] = len(ids)
+                buf.extend(s.encode("utf-8"))
+                store._offsets.append(len(buf))
+            return sid
+
+        for q in questions:
+            store.numbers.append(q.number)
+            store.correct_mask.append(letters_to_mask(q.correct))
+            store._q_text.append(intern(q.question))
+            for o in q.options:
+                store._opt_letters.append(ord(o.letter))
+                store._opt_text.append(intern(o.text))
+            store._opt_start.append(len(store._opt_letters))
+        store._buf = bytes(buf)
+        store._opt_letters = bytes(store._opt_letters)
+        return store
+
+    def _text(self, sid: int) -> str:
+        return self._buf[self._offsets[sid]:self._offsets[sid + 1]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def __getitem__(self, idx: int) -> QuestionView:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        return QuestionView(self, idx)
+
+    def __iter__(self) -> Iterator[QuestionView]:
+        return (QuestionView(self, i) for i in range(len(self)))
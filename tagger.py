@@ -0,0 +1,380 @@
+# tagger.py
+"""Offline topic tagging: CLF-C02 domain and AWS services per question.
+
+    python tagger.py [--exams exams]   # tag every exam, update the tag cache, print a summary
+
+A question's text and its correct options are tokenized (core.tokenize) and
+run once through an Aho-Corasick automaton over word tokens, built from the
+AWS service dictionary and per-domain keyword lists below. Every match votes
+for a domain (a service votes for the domain it belongs to); the most voted
+domain wins, ties going to the more specific domain in DOMAINS order.
+
+Tags are cached in one JSON file keyed by core.question_hash, so a run only
+tags questions that are new or were edited. Configure the location with
+CLF_TAGS_PATH (default data/tags.json).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Generic, Iterable, Iterator, List, Mapping, Sequence, Tuple, TypeVar
+
+from core import Question, exam_sort_key, parse_exam, question_hash, tokenize
+
+DEFAULT_TAGS_PATH = Path(os.environ.get("CLF_TAGS_PATH", "data/tags.json"))
+TAGGER_VERSION = 1  # bump whenever the dictionary or the scoring changes; invalidates the cache
+
+CONCEPTS = "Cloud Concepts"
+SECURITY = "Security and Compliance"
+TECHNOLOGY = "Cloud Technology and Services"
+BILLING = "Billing, Pricing, and Support"
+DOMAINS = (BILLING, SECURITY, CONCEPTS, TECHNOLOGY)  # tie-break order: most specific first
+DEFAULT_DOMAIN = CONCEPTS  # questions with no match are usually about cloud benefits
+
+# service -> (domain, aliases); aliases are matched as whole lowercased words
+SERVICES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    # security, identity and compliance
+    "IAM": (SECURITY, ("iam", "identity and access management")),
+    "IAM Identity Center": (SECURITY, ("iam identity center", "aws single sign on", "aws sso")),
+    "Cognito": (SECURITY, ("cognito",)),
+    "Artifact": (SECURITY, ("aws artifact",)),
+    "Shield": (SECURITY, ("aws shield", "shield advanced", "shield standard")),
+    "WAF": (SECURITY, ("waf", "web application firewall")),
+    "Firewall Manager": (SECURITY, ("firewall manager",)),
+    "Network Firewall": (SECURITY, ("aws network firewall",)),
+    "GuardDuty": (SECURITY, ("guardduty", "guard duty")),
+    "Inspector": (SECURITY, ("amazon inspector", "aws inspector")),
+    "Macie": (SECURITY, ("macie",)),
+    "Detective": (SECURITY, ("amazon detective",)),
+    "Security Hub": (SECURITY, ("security hub",)),
+    "KMS": (SECURITY, ("kms", "key management service")),
+    "CloudHSM": (SECURITY, ("cloudhsm", "cloud hsm")),
+    "Certificate Manager": (SECURITY, ("certificate manager", "acm")),
+    "Secrets Manager": (SECURITY, ("secrets manager",)),
+    "Directory Service": (SECURITY, ("directory service", "managed microsoft ad")),
+    "Audit Manager": (SECURITY, ("audit manager",)),
+    "Resource Access Manager": (SECURITY, ("resource access manager",)),
+    "Config": (SECURITY, ("aws config", "config rules")),
+    "CloudTrail": (SECURITY, ("cloudtrail", "cloud trail")),
+    # billing, pricing and support
+    "Organizations": (BILLING, ("aws organizations", "aws organization", "consolidated billing")),
+    "Billing and Cost Management": (BILLING, ("billing and cost management", "billing console",
+                                              "billing dashboard", "cost allocation tags")),
+    "Budgets": (BILLING, ("aws budgets", "budgets")),
+    "Cost Explorer": (BILLING, ("cost explorer",)),
+    "Cost and Usage Report": (BILLING, ("cost and usage report", "cost and usage reports", "cur")),
+    "Pricing Calculator": (BILLING, ("pricing calculator", "simple monthly calculator")),
+    "TCO Calculator": (BILLING, ("tco calculator", "total cost of ownership")),
+    "Compute Optimizer": (BILLING, ("compute optimizer",)),
+    "Billing Conductor": (BILLING, ("billing conductor",)),
+    "Trusted Advisor": (BILLING, ("trusted advisor",)),
+    "Support": (BILLING, ("aws support", "support plan", "support plans", "support api")),
+    "Health Dashboard": (BILLING, ("health dashboard", "personal health dashboard", "service health dashboard")),
+    "Marketplace": (BILLING, ("aws marketplace", "marketplace")),
+    "Professional Services": (BILLING, ("professional services",)),
+    "IQ": (BILLING, ("aws iq",)),
+    "re:Post": (BILLING, ("re post", "repost")),
+    "Partner Network": (BILLING, ("partner network", "apn")),
+    "Knowledge Center": (BILLING, ("knowledge center",)),
+    # compute
+    "EC2": (TECHNOLOGY, ("ec2", "elastic compute cloud")),
+    "Auto Scaling": (TECHNOLOGY, ("auto scaling", "autoscaling")),
+    "Elastic Load Balancing": (TECHNOLOGY, ("elastic load balancing", "elastic load balancer", "elb", "alb", "nlb",
+                                            "application load balancer", "network load balancer")),
+    "Lambda": (TECHNOLOGY, ("lambda",)),
+    "Elastic Beanstalk": (TECHNOLOGY, ("elastic beanstalk", "beanstalk")),
+    "Lightsail": (TECHNOLOGY, ("lightsail",)),
+    "Batch": (TECHNOLOGY, ("aws batch",)),
+    "ECS": (TECHNOLOGY, ("ecs", "elastic container service")),
+    "EKS": (TECHNOLOGY, ("eks", "elastic kubernetes service")),
+    "ECR": (TECHNOLOGY, ("ecr", "elastic container registry")),
+    "Fargate": (TECHNOLOGY, ("fargate",)),
+    "Outposts": (TECHNOLOGY, ("outposts", "outpost")),
+    "Wavelength": (TECHNOLOGY, ("wavelength",)),
+    "Local Zones": (TECHNOLOGY, ("local zones", "local zone")),
+    # storage
+    "S3": (TECHNOLOGY, ("s3", "simple storage service")),
+    "S3 Glacier": (TECHNOLOGY, ("glacier",)),
+    "EBS": (TECHNOLOGY, ("ebs", "elastic block store")),
+    "EFS": (TECHNOLOGY, ("efs", "elastic file system")),
+    "FSx": (TECHNOLOGY, ("fsx",)),
+    "Instance Store": (TECHNOLOGY, ("instance store",)),
+    "Storage Gateway": (TECHNOLOGY, ("storage gateway",)),
+    "Backup": (TECHNOLOGY, ("aws backup",)),
+    "Snow Family": (TECHNOLOGY, ("snowball", "snowcone", "snowmobile", "snow family")),
+    "DataSync": (TECHNOLOGY, ("datasync",)),
+    "Transfer Family": (TECHNOLOGY, ("transfer family",)),
+    # databases
+    "RDS": (TECHNOLOGY, ("rds", "relational database service")),
+    "Aurora": (TECHNOLOGY, ("aurora",)),
+    "DynamoDB": (TECHNOLOGY, ("dynamodb",)),
+    "ElastiCache": (TECHNOLOGY, ("elasticache",)),
+    "Redshift": (TECHNOLOGY, ("redshift",)),
+    "DocumentDB": (TECHNOLOGY, ("documentdb",)),
+    "Neptune": (TECHNOLOGY, ("neptune",)),
+    "Keyspaces": (TECHNOLOGY, ("keyspaces",)),
+    "QLDB": (TECHNOLOGY, ("qldb", "quantum ledger database")),
+    "MemoryDB": (TECHNOLOGY, ("memorydb",)),
+    "Database Migration Service": (TECHNOLOGY, ("database migration service", "dms")),
+    # networking and content delivery
+    "VPC": (TECHNOLOGY, ("vpc", "virtual private cloud")),
+    "VPC Flow Logs": (TECHNOLOGY, ("flow logs",)),
+    "CloudFront": (TECHNOLOGY, ("cloudfront",)),
+    "Route 53": (TECHNOLOGY, ("route 53", "route53")),
+    "Direct Connect": (TECHNOLOGY, ("direct connect",)),
+    "Site-to-Site VPN": (TECHNOLOGY, ("aws vpn", "site to site vpn", "vpn connection", "client vpn")),
+    "Transit Gateway": (TECHNOLOGY, ("transit gateway",)),
+    "Global Accelerator": (TECHNOLOGY, ("global accelerator",)),
+    "API Gateway": (TECHNOLOGY, ("api gateway",)),
+    "PrivateLink": (TECHNOLOGY, ("privatelink",)),
+    # management, developer tools and integration
+    "CloudWatch": (TECHNOLOGY, ("cloudwatch", "cloud watch")),
+    "CloudFormation": (TECHNOLOGY, ("cloudformation", "cloud formation")),
+    "Systems Manager": (TECHNOLOGY, ("systems manager",)),
+    "OpsWorks": (TECHNOLOGY, ("opsworks",)),
+    "Service Catalog": (TECHNOLOGY, ("service catalog",)),
+    "Control Tower": (TECHNOLOGY, ("control tower",)),
+    "Management Console": (TECHNOLOGY, ("management console",)),
+    "CLI": (TECHNOLOGY, ("aws cli", "command line interface")),
+    "SDK": (TECHNOLOGY, ("sdk", "sdks", "software development kit")),
+    "CDK": (TECHNOLOGY, ("aws cdk", "cloud development kit")),
+    "Quick Starts": (TECHNOLOGY, ("quick start", "quick starts")),
+    "X-Ray": (TECHNOLOGY, ("x ray",)),
+    "CodeCommit": (TECHNOLOGY, ("codecommit",)),
+    "CodeBuild": (TECHNOLOGY, ("codebuild",)),
+    "CodeDeploy": (TECHNOLOGY, ("codedeploy",)),
+    "CodePipeline": (TECHNOLOGY, ("codepipeline",)),
+    "CodeStar": (TECHNOLOGY, ("codestar",)),
+    "Cloud9": (TECHNOLOGY, ("cloud9",)),
+    "CloudShell": (TECHNOLOGY, ("cloudshell",)),
+    "SNS": (TECHNOLOGY, ("sns", "simple notification service")),
+    "SQS": (TECHNOLOGY, ("sqs", "simple queue service")),
+    "SES": (TECHNOLOGY, ("ses", "simple email service")),
+    "EventBridge": (TECHNOLOGY, ("eventbridge", "cloudwatch events")),
+    "Step Functions": (TECHNOLOGY, ("step functions",)),
+    "Amazon MQ": (TECHNOLOGY, ("amazon mq",)),
+    # analytics, ML and end-user services
+    "Athena": (TECHNOLOGY, ("athena",)),
+    "EMR": (TECHNOLOGY, ("emr", "elastic mapreduce")),
+    "Glue": (TECHNOLOGY, ("aws glue",)),
+    "Kinesis": (TECHNOLOGY, ("kinesis",)),
+    "QuickSight": (TECHNOLOGY, ("quicksight",)),
+    "OpenSearch Service": (TECHNOLOGY, ("opensearch", "elasticsearch service")),
+    "SageMaker": (TECHNOLOGY, ("sagemaker",)),
+    "Rekognition": (TECHNOLOGY, ("rekognition",)),
+    "Comprehend": (TECHNOLOGY, ("comprehend",)),
+    "Polly": (TECHNOLOGY, ("polly",)),
+    "Lex": (TECHNOLOGY, ("amazon lex",)),
+    "Transcribe": (TECHNOLOGY, ("transcribe",)),
+    "Translate": (TECHNOLOGY, ("amazon translate",)),
+    "Textract": (TECHNOLOGY, ("textract",)),
+    "Kendra": (TECHNOLOGY, ("kendra",)),
+    "Connect": (TECHNOLOGY, ("amazon connect",)),
+    "WorkSpaces": (TECHNOLOGY, ("workspaces",)),
+    "AppStream 2.0": (TECHNOLOGY, ("appstream",)),
+    "Amplify": (TECHNOLOGY, ("amplify",)),
+    "AppSync": (TECHNOLOGY, ("appsync",)),
+    "IoT Core": (TECHNOLOGY, ("iot core",)),
+    "Migration Hub": (CONCEPTS, ("migration hub",)),
+    "Application Migration Service": (CONCEPTS, ("application migration service",)),
+    "Well-Architected Tool": (CONCEPTS, ("well architected tool",)),
+}
+SERVICE_NAMES = tuple(sorted(SERVICES, key=str.lower))
+
+DOMAIN_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    CONCEPTS: (
+        "elasticity", "agility", "scalability", "high availability", "highly available", "fault tolerance",
+        "fault tolerant", "loose coupling", "loosely coupled", "loosely couple", "decouple", "decoupling",
+        "well architected", "design for failure", "economies of scale", "economy of scale", "capex", "opex",
+        "capital expenses", "capital expenditure", "variable expenses", "cloud adoption framework", "caf",
+        "migration", "migrate", "rehost", "replatform", "refactor", "global reach", "go global",
+        "benefits of", "advantages of", "deployment model", "hybrid", "on premises",
+    ),
+    SECURITY: (
+        "shared responsibility", "security", "secure", "compliance", "compliant", "encryption", "encrypt",
+        "encrypted", "mfa", "multi factor authentication", "least privilege", "password policy", "root user",
+        "access keys", "credentials", "ddos", "vulnerabilities", "vulnerability", "audit", "auditing",
+        "penetration testing", "firewall", "security group", "security groups", "network acl", "nacl",
+        "permissions", "governance", "pci", "hipaa", "soc", "iso", "abuse",
+    ),
+    TECHNOLOGY: (
+        "region", "regions", "availability zone", "availability zones", "edge location", "edge locations",
+        "data center", "data centers", "serverless", "container", "containers", "database", "relational",
+        "nosql", "compute", "storage", "infrastructure as code", "caching", "content delivery",
+    ),
+    BILLING: (
+        "pricing", "price", "prices", "cost", "costs", "bill", "billing", "billed", "invoice", "pay as you go",
+        "reserved instances", "reserved instance", "spot instances", "spot instance", "on demand instances",
+        "savings plans", "savings plan", "dedicated hosts", "dedicated host", "dedicated instances", "free tier",
+        "basic support", "developer support", "business support", "enterprise support", "enterprise on ramp",
+        "technical account manager", "tam", "concierge", "discount", "discounts", "budget", "charges", "charged",
+    ),
+}
+
+T = TypeVar("T")
+
+
+class Automaton(Generic[T]):
+    """Aho-Corasick over word tokens: every pattern occurrence in one pass, overlaps included."""
+
+    def __init__(self, patterns: Iterable[Tuple[Sequence[str], T]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[T]] = [[]]
+        for tokens, value in patterns:
+            state = 0
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = self._goto[state][token] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(value)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and token not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(token, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, tokens: Iterable[str]) -> Iterator[T]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            yield from out[state]
+
+
+@dataclass(frozen=True)
+class QuestionTags:
+    domain: str
+    services: Tuple[str, ...]  # in order of first mention
+
+
+Match = Tuple[str, str]  # ("service", name) or ("domain", domain)
+
+
+def _patterns() -> Iterator[Tuple[List[str], Match]]:
+    for name, (_, aliases) in SERVICES.items():
+        for alias in aliases:
+            yield tokenize(alias), ("service", name)
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        for keyword in keywords:
+            yield tokenize(keyword), ("domain", domain)
+
+
+class Tagger:
+    def __init__(self):
+        self.automaton: Automaton[Match] = Automaton(_patterns())
+
+    def tag(self, q: Question) -> QuestionTags:
+        text = " ".join([q.question] + [o.text for o in q.options if o.letter in q.correct])
+        votes: Counter = Counter()
+        services: Dict[str, None] = {}
+        for kind, value in self.automaton.find(tokenize(text)):
+            if kind == "service":
+                services.setdefault(value, None)
+                votes[SERVICES[value][0]] += 1
+            else:
+                votes[value] += 1
+        if not votes:
+            return QuestionTags(DEFAULT_DOMAIN, ())
+        best = max(votes.values())
+        return QuestionTags(next(d for d in DOMAINS if votes[d] == best), tuple(services))
+
+
+class TagIndex:
+    """Persistent question-hash -> tags cache; only unseen questions are tagged."""
+
+    def __init__(self, path: Path = DEFAULT_TAGS_PATH, tagger: Tagger = None):
+        self.path = Path(path)
+        self.tagger = tagger or Tagger()
+        self.stats: Dict[str, int] = {"cached": 0, "tagged": 0}
+        self._tags: Dict[str, QuestionTags] = {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            if raw.get("version") == TAGGER_VERSION:
+                self._tags = {h: QuestionTags(d, tuple(s)) for h, (d, s) in raw["tags"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self._dirty = False
+
+    def tag_files(self, files: Mapping[str, Sequence[Question]]) -> Dict[str, List[QuestionTags]]:
+        """Tags per file, in question order; new tags are merged into the cache and saved.
+
+        Cached tags of questions not in ``files`` are kept, so tagging a subset
+        (one changed exam) does not drop the rest of the bank.
+        """
+        out: Dict[str, List[QuestionTags]] = {}
+        for name, questions in files.items():
+            tags = out[name] = []
+            for q in questions:
+                h = question_hash(q)
+                t = self._tags.get(h)
+                if t is None:
+                    t = self._tags[h] = self.tagger.tag(q)
+                    self.stats["tagged"] += 1
+                    self._dirty = True
+                else:
+                    self.stats["cached"] += 1
+                tags.append(t)
+        if self._dirty:
+            self.save()
+        return out
+
+    def save(self):
+        """Write the cache atomically; best effort, like parse_cache.ParseCache."""
+        payload = {"version": TAGGER_VERSION,
+                   "tags": {h: [t.domain, list(t.services)] for h, t in self._tags.items()}}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+                os.replace(tmp, self.path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError:
+            return  # a read-only or full disk only costs us the cache; stays dirty for the next save
+        self._dirty = False
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tag exam questions with CLF-C02 domains and AWS services.")
+    ap.add_argument("--exams", type=Path, default=Path("exams"))
+    ap.add_argument("--tags", type=Path, default=DEFAULT_TAGS_PATH)
+    ap.add_argument("--top", type=int, default=15, help="most mentioned services to list")
+    args = ap.parse_args()
+
+    paths = sorted(args.exams.glob("*.md"), key=lambda p: exam_sort_key(p.name))
+    files = {p.name: parse_exam(p.read_text(encoding="utf-8")) for p in paths}
+    t0 = time.perf_counter()
+    index = TagIndex(args.tags)
+    tags = index.tag_files(files)
+    elapsed = time.perf_counter() - t0
+
+    flat = [t for ts in tags.values() for t in ts]
+    print(f"{len(flat)} questions: {index.stats['tagged']} tagged, {index.stats['cached']} cached "
+          f"in {elapsed * 1000:.0f} ms -> {args.tags}")
+    for domain, n in Counter(t.domain for t in flat).most_common():
+        print(f"  {domain:<32} {n}")
+    services = Counter(s for t in flat for s in t.services)
+    print("  " + ", ".join(f"{s} ({n})" for s, n in services.most_common(args.top)))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,10 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-max-regression", type=float, default=25.0,
+                     help="fail benchmark tests slower than baseline by more than this percent")
+    parser.addoption("--bench-scales", default="1",
+                     help="comma-separated corpus scales for benchmark tests, e.g. 1,10,100")
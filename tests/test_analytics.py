@@ -0,0 +1,57 @@
+import pytest
+
+from analytics import EventLog, Rollup
+from store import letters_to_mask
+
+A, B, C = (letters_to_mask([L]) for L in "ABC")
+
+
+def _attempt(log: EventLog, exam: str, answers, now: float = 0.0) -> int:
+    attempt = log.start_attempt(exam, "default", now=now)
+    for qid, selected, correct in answers:
+        log.record(attempt, qid, selected, correct, now=now)
+    return attempt
+
+
+def test_events_are_batched_and_rollups_fold_in_only_new_ones(tmp_path):
+    db = tmp_path / "analytics.sqlite3"
+    log = EventLog(db, batch_size=100, max_delay=3600)
+    rollup = Rollup(db, chunk_size=2)
+    _attempt(log, "exam-1.md", [("q1", A, A), ("q2", B, A)])
+    assert rollup.refresh() == 0  # nothing flushed yet
+
+    log.flush()
+    assert rollup.refresh() == 2
+    _attempt(log, "exam-1.md", [("q1", C, A), ("q2", A, A), ("q2", B, A)])
+    log.flush()
+    assert rollup.refresh() == 3 and rollup.refresh() == 0
+
+    stats = rollup.question_stats(min_answered=1).set_index("qid")
+    assert stats.loc["q1", "answered"] == 2 and stats.loc["q1", "accuracy"] == 0.5
+    assert stats.loc["q2", "accuracy"] == pytest.approx(1 / 3)
+    assert stats.loc["q2", "pick_B"] == pytest.approx(2 / 3) and stats.loc["q2", "pick_C"] == 0
+    assert (stats.loc["q2", "top_distractor"], stats.loc["q2", "top_distractor_rate"]) == ("B", pytest.approx(2 / 3))
+
+    scores = rollup.attempt_scores(min_answered=1)
+    assert scores["score"].tolist() == [50.0, 0.0]  # the re-answered q2 counts once, last answer wins
+
+
+def test_discrimination_and_score_distribution(tmp_path):
+    db = tmp_path / "analytics.sqlite3"
+    log = EventLog(db, batch_size=1)
+    strong = [("easy", A, A), ("hard", A, A), ("mid", A, A)]
+    weak = [("easy", A, A), ("hard", B, A), ("mid", B, A)]
+    for i in range(4):
+        _attempt(log, "exam-1.md", strong)
+        _attempt(log, "exam-2.md", weak)
+
+    rollup = Rollup(db)
+    rollup.refresh()
+    stats = rollup.question_stats(min_answered=3).set_index("qid")
+    assert stats.loc["hard", "discrimination"] == 1.0
+    assert stats.loc["easy", "discrimination"] == 0.0
+    assert stats.loc["easy", "top_distractor"] != stats.loc["easy", "top_distractor"]  # NaN: no wrong picks
+
+    dist = rollup.score_distribution(min_answered=3)
+    assert dist.loc["exam-1.md", 90] == 4 and dist.loc["exam-2.md", 30] == 4
+    assert dist.to_numpy().sum() == 8
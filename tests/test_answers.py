@@ -0,0 +1,28 @@
+from answers import is_correct, review_markdown, review_positions, score
+from core import Option, Question
+from store import QuestionStore, letters_to_mask
+
+SINGLE = Question(1, "What is S3?", [Option("A", "Object storage"), Option("B", "A queue")], ["A"])
+MULTI = Question(2, "Pick two", [Option("A", "x"), Option("B", "y"), Option("C", "z")], ["A", "C"])
+
+
+def test_score_and_filter_resolve_content_from_shared_questions():
+    questions = [SINGLE, MULTI]
+    answers = {0: letters_to_mask(["B"]), 1: letters_to_mask(["C", "A"])}
+    assert not is_correct(SINGLE, answers[0]) and is_correct(MULTI, answers[1])
+    assert score(questions, answers) == 1
+    assert review_positions(questions, answers, only_incorrect=False) == [0, 1]
+    assert review_positions(questions, answers, only_incorrect=True) == [0]
+
+
+def test_review_markdown_marks_selected_and_correct_options():
+    md = review_markdown(SINGLE, letters_to_mask(["B"]))
+    assert md.startswith("### Question 1 — ❌ Incorrect")
+    assert "- ✅ A. Object storage" in md and "- ❌ B. A queue" in md
+    assert "**Your answer:** B" in md
+
+
+def test_store_views_render_like_parsed_questions():
+    view = QuestionStore.from_questions([MULTI])[0]
+    selected = letters_to_mask(["A", "B"])
+    assert review_markdown(view, selected) == review_markdown(MULTI, selected)
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import bank as bank_module
+from bank import build_bank, load_exam, open_bank
+from core import parse_exam
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def test_bank_roundtrip_matches_parser(tmp_path):
+    files = sorted(EXAMS.glob("*.md"))
+    bank = open_bank(build_bank(files, tmp_path / "exams.bank"))
+    assert bank is not None
+    for f in files:
+        assert bank.questions(f.name) == parse_exam(f.read_text(encoding="utf-8"))
+
+
+def test_load_exam_falls_back_when_source_changed(tmp_path):
+    exam = tmp_path / "practice-exam-1.md"
+    exam.write_text("1. Old?\nA. Yes\nB. No\n<details><summary>Answer</summary>\nCorrect answer: A\n</details>\n",
+                    encoding="utf-8")
+    bank = open_bank(build_bank([exam], tmp_path / "exams.bank"))
+    assert load_exam(exam, bank)[0].question == "Old?"
+
+    exam.write_text(exam.read_text(encoding="utf-8").replace("Old?", "New?"), encoding="utf-8")
+    assert load_exam(exam, bank)[0].question == "New?"
+
+
+def test_load_exam_ignores_bank_from_another_parser_version(tmp_path, monkeypatch):
+    exam = tmp_path / "practice-exam-1.md"
+    exam.write_text("1. Q?\nA. Yes\nB. No\n<details><summary>Answer</summary>\nCorrect answer: A\n</details>\n",
+                    encoding="utf-8")
+    monkeypatch.setattr(bank_module, "PARSER_VERSION", bank_module.PARSER_VERSION - 1)
+    bank = open_bank(build_bank([exam], tmp_path / "exams.bank"))
+    monkeypatch.undo()
+    assert bank.parser_version != bank_module.PARSER_VERSION
+    calls = []
+    monkeypatch.setattr(bank, "questions", lambda name: calls.append(name))
+    assert load_exam(exam, bank)[0].correct == ["A"] and calls == []
+
+
+def test_open_bank_rejects_missing_or_foreign_files(tmp_path):
+    assert open_bank(tmp_path / "missing.bank") is None
+    (tmp_path / "junk.bank").write_bytes(b"not a bank at all, definitely not" * 4)
+    assert open_bank(tmp_path / "junk.bank") is None
+
+
+def test_open_bank_rejects_truncated_files(tmp_path):
+    data = build_bank(sorted(EXAMS.glob("*.md"))[:2], tmp_path / "exams.bank").read_bytes()
+    for size in (20, 40, 1000, len(data) // 2, len(data) - 1):
+        cut = tmp_path / f"cut-{size}.bank"
+        cut.write_bytes(data[:size])
+        assert open_bank(cut) is None, size
+    (tmp_path / "long.bank").write_bytes(data + b"\0")
+    assert open_bank(tmp_path / "long.bank") is None
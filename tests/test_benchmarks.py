@@ -0,0 +1,37 @@
+import pytest
+
+from benchmarks.suite import is_calibrated, load_baseline, regressions, run_suite
+
+
+@pytest.mark.benchmark
+def test_hot_paths_do_not_regress(request):
+    scales = [int(s) for s in request.config.getoption("--bench-scales").split(",")]
+    max_pct = request.config.getoption("--bench-max-regression")
+    baseline = load_baseline()
+    if not is_calibrated(baseline):
+        pytest.skip("no calibrated benchmarks/baseline.json; create it with python -m benchmarks.suite --save")
+
+    failed = regressions(run_suite(scales), baseline, max_pct)
+    assert not failed, "\n".join(failed)
+
+
+def test_regressions_flags_only_slowdowns_over_threshold():
+    baseline = {"parse_exam@1x": {"items_per_s": 1000.0, "relative": 1.0},
+                "build_prompt@1x": {"items_per_s": 1000.0, "relative": 1.0}}
+    results = {
+        "parse_exam@1x": {"items_per_s": 700.0, "relative": 0.7},
+        "build_prompt@1x": {"items_per_s": 900.0, "relative": 0.9},
+        "parse_options@1x": {"items_per_s": 1.0, "relative": 0.001},
+    }
+    failed = regressions(results, baseline, 25.0)
+    assert len(failed) == 1 and failed[0].startswith("parse_exam@1x")
+
+
+def test_regressions_compare_throughput_relative_to_calibration():
+    baseline = {"parse_exam@1x": {"items_per_s": 1000.0, "relative": 2.0}}
+    slower_machine = {"parse_exam@1x": {"items_per_s": 500.0, "relative": 2.0}}
+    assert regressions(slower_machine, baseline, 25.0) == []
+    faster_machine = {"parse_exam@1x": {"items_per_s": 1000.0, "relative": 1.0}}
+    assert len(regressions(faster_machine, baseline, 25.0)) == 1
+    assert not is_calibrated({"parse_exam@1x": {"items_per_s": 1000.0}})
+
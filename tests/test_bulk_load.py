@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from core import load_all_exams, parse_exam
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def test_load_all_exams_in_parallel_matches_serial():
+    parallel = load_all_exams(EXAMS, max_workers=2)
+    serial = load_all_exams(EXAMS, max_workers=1)
+    assert parallel.files == serial.files and parallel.offsets == serial.offsets
+    assert list(parallel.files)[:3] == ["practice-exam-1.md", "practice-exam-2.md", "practice-exam-3.md"]
+    assert set(parallel.timings) == set(parallel.files)
+
+
+def test_global_ids_cover_every_question():
+    index = load_all_exams(EXAMS, max_workers=1)
+    expected = parse_exam((EXAMS / "practice-exam-2.md").read_text(encoding="utf-8"))
+    assert index.total == sum(len(qs) for qs in index.files.values())
+    gid = index.global_id("practice-exam-2.md", 3)
+    assert index.lookup(gid) == ("practice-exam-2.md", expected[3])
+    assert index.lookup(index.total - 1)[1] is list(index.files.values())[-1][-1]
+
+
+def test_load_all_exams_reads_through_bank_and_parse_cache(tmp_path, monkeypatch):
+    import bank
+    from parse_cache import ParseCache
+
+    files = sorted(EXAMS.glob("*.md"))
+    cache = ParseCache(tmp_path / "cache")
+    monkeypatch.setattr(bank, "_process_sources", (bank.open_bank(bank.build_bank(files[:-1], tmp_path / "b")), cache))
+    index = load_all_exams(EXAMS, max_workers=1, loader=bank.load_exam_cached)
+    assert index.files == load_all_exams(EXAMS, max_workers=1).files
+    assert cache.stats["misses"] == 1 and cache.stats["writes"] == 1  # only the file missing from the bank
@@ -0,0 +1,60 @@
+import time
+from pathlib import Path
+
+from core import Option, Question, format_exam, load_all_exams, parse_exam
+from dedup import dedup_index, find_duplicates
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def _q(number, text, options, correct="A"):
+    return Question(number, text, [Option(chr(65 + i), t) for i, t in enumerate(options)], list(correct))
+
+
+def test_near_duplicates_cluster_and_distinct_questions_do_not():
+    opts = ["AWS CloudTrail", "Amazon Inspector", "AWS Trusted Advisor", "EC2 Instance Usage Report"]
+    qs = [
+        _q(1, "Which AWS service would help you determine who terminated several critical EC2 instances?", opts),
+        _q(2, "Which of the following AWS services would help you determine who terminated several critical "
+              "EC2 instances?", list(reversed(opts)), correct="D"),
+        _q(3, "Which of the following is an example of horizontal scaling in the AWS Cloud?",
+           ["Adding more EC2 instances", "Adding RAM", "A larger instance", "More CPU"]),
+    ]
+    assert find_duplicates(qs, threshold=0.5) == [[0, 1]]
+    assert find_duplicates([]) == []
+
+
+def test_every_pair_in_a_bucket_is_compared_and_answers_must_match():
+    opts = ["Amazon S3", "Amazon EBS", "Amazon EFS", "Amazon FSx"]
+    text = "Which AWS storage service offers durable object storage for any amount of data?"
+    qs = [
+        _q(1, text, opts, correct="B"),  # same words, different answer: never merged
+        _q(2, text, opts),
+        _q(3, text, opts),
+        _q(4, text, list(reversed(opts)), correct="D"),  # same answer text under another letter
+    ]
+    assert find_duplicates(qs) == [[1, 2, 3]]
+
+
+def test_many_copies_of_one_question_stay_fast():
+    opts = ["Amazon S3", "Amazon EBS", "Amazon EFS", "Amazon FSx"]
+    text = "Which AWS storage service offers durable object storage for any amount of data?"
+    qs = [_q(i, text, opts) for i in range(5000)] + [_q(5000, text, opts, correct="B")]
+    qs += [_q(5001 + i, " ".join(f"w{i}x{j}" for j in range(8)), [f"o{i}a", f"o{i}b"]) for i in range(2000)]
+    t0 = time.perf_counter()
+    clusters = find_duplicates(qs)
+    assert time.perf_counter() - t0 < 5.0  # comparing every pair in the bucket took minutes
+    assert clusters == [list(range(5000))]  # the copy with another answer stays out
+
+
+def test_dedup_report_and_merged_bank_on_real_exams():
+    index = load_all_exams(EXAMS, max_workers=1)
+    report = dedup_index(index)
+    assert report.clusters, "the practice exams are known to overlap"
+    for cluster in report.clusters:
+        assert cluster == sorted(cluster)
+
+    unique = report.unique_questions()
+    assert len(unique) == index.total - sum(len(c) - 1 for c in report.clusters)
+    assert [q.number for q in unique] == list(range(1, len(unique) + 1))
+    assert parse_exam(format_exam(unique)) == unique
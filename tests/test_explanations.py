@@ -0,0 +1,49 @@
+import json
+
+from core import LANGS, Option, Question, build_prompt, question_hash
+from explanations import ExplanationStore, generate, ingest, read_jsonl, stub_explanation
+
+
+def test_lookup_goes_through_a_bounded_lru(tmp_path):
+    store = ExplanationStore(tmp_path / "e.sqlite3", lru_size=2)
+    store.put_many([("h1", "English", "one", ""), ("h2", "English", "two", ""), ("h3", "English", "three", "")])
+    assert [store.get(h, "English") for h in ("h1", "h2", "h1", "h3")] == ["one", "two", "one", "three"]
+    assert store.stats == {"memory_hits": 1, "db_hits": 3, "misses": 0, "invalidations": 0}
+    assert list(store._lru) == [("h1", "English"), ("h3", "English")]  # h2 was least recently used
+    assert store.get("h1", "Russian") is None and store.stats["misses"] == 1
+
+    store.put("h1", "English", "one, revised")
+    assert store.get("h1", "English") == "one, revised"
+    # a second process sees the same rows
+    assert ExplanationStore(tmp_path / "e.sqlite3").get("h3", "English") == "three"
+
+
+def test_writes_from_another_process_invalidate_the_lru(tmp_path):
+    app = ExplanationStore(tmp_path / "e.sqlite3")
+    app.put("h1", "English", "placeholder")
+    assert app.get("h1", "English") == "placeholder"
+    assert app.get("h1", "English") == "placeholder" and app.stats["memory_hits"] == 1
+
+    ingest(ExplanationStore(tmp_path / "e.sqlite3"), [{"hash": "h1", "lang": "English", "explanation": "real"}])
+    assert app.get("h1", "English") == "real" and app.stats["invalidations"] == 1
+
+
+def test_ingest_jsonl_and_stub_generation(tmp_path):
+    q = Question(1, "What is AWS?", [Option("A", "A cloud provider"), Option("B", "A database")], ["A"])
+    h = question_hash(q)
+    prompts = tmp_path / "prompts.jsonl"
+    prompts.write_text("".join(
+        json.dumps({"file": "x.md", "number": 1, "hash": h, "lang": lang, "prompt": build_prompt(q, lang)}) + "\n"
+        for lang in LANGS
+    ), encoding="utf-8")
+    explained = tmp_path / "explained.jsonl"
+    explained.write_text(json.dumps({"hash": h, "lang": "English", "explanation": "AWS is a cloud."}) + "\n\n",
+                         encoding="utf-8")
+
+    store = ExplanationStore(tmp_path / "e.sqlite3")
+    assert ingest(store, read_jsonl([explained]), source="manual") == 1
+    assert generate(store, read_jsonl([prompts])) == len(LANGS) - 1  # English already explained
+    assert store.get(h, "English") == "AWS is a cloud."
+    assert store.get(h, "Russian") == stub_explanation(build_prompt(q, "Russian"))
+    assert "A" in store.get(h, "Russian")
+    assert len(store) == len(LANGS)
@@ -0,0 +1,37 @@
+import json
+
+from benchmarks.corpus import synthetic_exam
+from core import LANGS, PromptTemplate, build_prompt, parse_exam
+from export_prompts import export_prompts
+
+
+def test_compiled_templates_match_str_format():
+    fields = {"question": "Q {x}?", "options": "A. a\nB. b", "correct": "A"}
+    for template in ["{question}|{options}|{correct}", "{{literal}} {question}", "{correct!r:>5}"]:
+        assert PromptTemplate(template).render(**fields) == template.format(**fields)
+
+
+def test_export_shards_every_question_and_language(tmp_path):
+    exams = tmp_path / "exams"
+    exams.mkdir()
+    for i in (1, 2):
+        (exams / f"practice-exam-{i}.md").write_text(synthetic_exam(9, seed=i), encoding="utf-8")
+    out = tmp_path / "prompts"
+    (out).mkdir()
+    (out / "practice-exam-1-00099.jsonl").write_text("stale\n", encoding="utf-8")
+
+    manifest = export_prompts(exams, out, shard_size=20, max_workers=2)
+
+    assert manifest["records"] == 2 * 9 * len(LANGS)
+    assert all(s["records"] <= 20 for s in manifest["shards"])
+    files = sorted(p.name for p in out.glob("*.jsonl"))
+    assert files == sorted(s["file"] for s in manifest["shards"])
+    assert not list(out.glob("*.tmp"))
+
+    records = [json.loads(line) for p in sorted(out.glob("practice-exam-2-*.jsonl"))
+               for line in p.read_text(encoding="utf-8").splitlines()]
+    questions = parse_exam((exams / "practice-exam-2.md").read_text(encoding="utf-8"))
+    assert len(records) == len(questions) * len(LANGS)
+    first = records[len(LANGS)]
+    assert first["number"] == questions[1].number and first["lang"] == LANGS[0]
+    assert first["prompt"] == build_prompt(questions[1], LANGS[0])
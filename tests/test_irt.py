@@ -0,0 +1,80 @@
+import numpy as np
+
+from irt import AdaptiveTest, ItemParams, fit_2pl, load_params, pass_mark, save_params
+
+
+def _simulate(rng, theta, a, b, per_attempt=30):
+    attempt, item = [], []
+    for j in range(len(theta)):
+        attempt += [j] * per_attempt
+        item += list(rng.choice(len(a), per_attempt, replace=False))
+    attempt, item = np.array(attempt), np.array(item)
+    p = 1 / (1 + np.exp(-a[item] * (theta[attempt] - b[item])))
+    return attempt, item, rng.random(len(p)) < p
+
+
+def test_fit_recovers_item_difficulty_order():
+    rng = np.random.default_rng(0)
+    b_true = np.linspace(-2, 2, 40)
+    attempt, item, correct = _simulate(rng, rng.normal(size=1500), np.ones(40), b_true)
+    a, b, theta = fit_2pl(attempt, item, correct, 40)
+    assert np.corrcoef(b, b_true)[0, 1] > 0.95
+    assert a.min() >= 0.2 and a.max() <= 3.0 and abs(theta.mean()) < 1e-6
+
+
+def test_params_roundtrip_and_bank_alignment(tmp_path):
+    path = tmp_path / "irt.npz"
+    save_params(path, ["f.md#1#x", "f.md#2#y"], np.array([1.5, 0.5]), np.array([-1.0, 2.0]))
+    params = ItemParams.for_bank(load_params(path), {"f.md#2#y": 0, "f.md#3#z": 1}, 2)
+    assert params.a.tolist() == [0.5, 1.0] and params.b.tolist() == [2.0, 0.0]
+    assert params.fitted.tolist() == [True, False] and params.calibrated
+    assert load_params(tmp_path / "missing.npz") == {}
+
+
+def test_pass_mark_gives_75_percent_expected_score():
+    a, b = np.ones(100), np.linspace(-2, 2, 100)
+    cut = pass_mark(a, b)
+    assert abs((1 / (1 + np.exp(-a * (cut - b)))).mean() - 0.75) < 1e-6
+
+
+def test_adaptive_test_targets_ability_and_stops_when_confident():
+    params = ItemParams(np.ones(500), np.linspace(-3, 3, 500))
+    test = AdaptiveTest(params, min_items=10, max_items=65)
+    first = test.start()
+    assert abs(params.b[first]) < 0.01  # most informative at the prior mean
+    while True:
+        nxt = test.answer(True)
+        if nxt is None:
+            break
+        assert params.b[nxt] > params.b[first]  # harder items after right answers
+    assert 10 <= len(test.ids) < 65 and len(set(test.ids)) == len(test.ids)
+    assert test.pass_probability >= 0.95 and test.ability[0] > params.cut
+
+    weak = AdaptiveTest(params)
+    weak.start()
+    while weak.answer(False) is not None:
+        pass
+    assert weak.pass_probability <= 0.05 and len(weak.ids) == weak.min_items
+
+
+def test_ties_are_broken_at_random_per_session():
+    params = ItemParams(np.ones(200), np.zeros(200))  # nothing fitted yet: every item ties
+    firsts = {AdaptiveTest(params, rng=np.random.default_rng(seed)).start() for seed in range(20)}
+    assert len(firsts) > 10
+    test = AdaptiveTest(params, rng=np.random.default_rng(1))
+    test.start()
+    while test.answer(True) is not None:
+        pass
+    assert len(set(test.ids)) == len(test.ids) and test.ids != list(range(len(test.ids)))
+    again = AdaptiveTest(params, rng=np.random.default_rng(1))
+    assert again.start() == test.ids[0]
+
+
+def test_uncalibrated_bank_runs_a_fixed_length_exam():
+    params = ItemParams.for_bank({}, {f"f.md#{i}#x": i for i in range(200)}, 200)  # nothing fitted yet
+    assert not params.calibrated and ItemParams(np.ones(3), np.zeros(3)).calibrated
+    test = AdaptiveTest(params, min_items=10, max_items=65, rng=np.random.default_rng(0))
+    test.start()
+    while test.answer(False) is not None:
+        pass
+    assert len(test.ids) == 65  # no confident fail after 10 answers
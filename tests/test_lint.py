@@ -0,0 +1,99 @@
+import textwrap
+from pathlib import Path
+
+from lint import ERROR, WARNING, lint_paths, lint_text, main
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def _codes(md: str):
+    return [(d.line, d.severity, d.code) for d in lint_text(textwrap.dedent(md).strip())]
+
+
+def test_reports_each_problem_with_its_line():
+    md = """
+    1. Pick two (Choose TWO)
+    - A. Alpha
+    - B. Beta
+    <details><summary>Answer</summary>
+    Correct answer: A
+    </details>
+
+    2. Unknown letter
+    - A. Alpha
+    - A. Again
+    continued text
+    <details><summary>Answer</summary>
+    Correct answer: A, F
+    </details>
+
+    3. No answer block
+    - A. Alpha
+    - B. Beta
+
+    3. No correct line
+    - A. Alpha
+    - B. Beta
+    <details><summary>Answer</summary>
+    It is B and C
+    </details>
+    """
+    assert _codes(md) == [
+        (1, ERROR, "choose-count"),
+        (10, ERROR, "duplicate-option"),
+        (11, WARNING, "unlabeled-option"),
+        (13, ERROR, "unknown-answer-letter"),
+        (16, ERROR, "no-answer-block"),
+        (20, WARNING, "multi-answer-unmarked"),
+        (23, WARNING, "no-correct-line"),
+    ]
+
+
+def test_missing_answer_and_lazy_numbering():
+    md = """
+    1. First
+    - A. Alpha
+    - B. Beta
+    <details><summary>Answer</summary>
+    Correct answer: X
+    </details>
+
+    1. Second (select three.)
+    - A. Alpha
+    - B. Beta
+    - C. Gamma
+    <details><summary>Answer</summary>Correct answer: A, B, C</details>
+    """
+    assert _codes(md) == [(4, ERROR, "missing-answer"), (5, ERROR, "unknown-answer-letter")]
+
+
+def test_bundled_exams_have_no_errors(tmp_path, capsys):
+    diagnostics = lint_paths(sorted(EXAMS.glob("*.md")))
+    assert not [d for d in diagnostics if d.severity == ERROR]
+    assert main([str(EXAMS)]) == 0
+
+    bad = tmp_path / "bad.md"
+    bad.write_text("1. Question\n- A. Alpha\n- B. Beta\n", encoding="utf-8")
+    assert main([str(bad), str(EXAMS / "practice-exam-1.md")]) == 1
+    assert f"{bad}:1: error no-answer-block" in capsys.readouterr().out
+
+
+def test_duplicate_number_unless_every_question_is_one():
+    block = "{}. Q\n- A. Alpha\n- B. Beta\n<details><summary>Answer</summary>Correct answer: A</details>\n"
+    assert _codes("".join(block.format(n) for n in (1, 2, 2))) == [(9, ERROR, "duplicate-number")]
+    assert _codes("".join(block.format(n) for n in (1, 1, 1))) == []
+
+
+def test_correct_answer_line_lists_only_letters():
+    block = "1. Q\n- A. Alpha\n- B. Beta\n- C. Gamma\n- D. Delta\n<details><summary>Answer</summary>\n{}\n</details>\n"
+    for line in ("Correct answer: B", "Correct answer: A, C.", "Correct answer: B/D", "Correct answer: AC",
+                 "Correct answer: Ac"):
+        assert [c for _, _, c in _codes(block.format(line)) if c != "multi-answer-unmarked"] == []
+    # the app reads every letter on the line: B, E, C, A... but only B was meant
+    assert _codes(block.format("Correct answer: B (because it is cheaper)")) == [
+        (1, WARNING, "multi-answer-unmarked"),
+        (7, ERROR, "malformed-answer-line"),
+        (7, ERROR, "answer-mismatch"),
+    ]
+    assert [c for _, _, c in _codes(block.format("Correct answer: A and C"))] == [
+        "multi-answer-unmarked", "malformed-answer-line", "answer-mismatch"]  # read as A, D, C
@@ -0,0 +1,10 @@
+from benchmarks.loadtest import summarize
+
+
+def test_loadtest_summary_reports_percentiles_per_action():
+    samples = [("answer", i / 1000) for i in range(1, 101)] + [("open", 0.5)]
+    report = summarize(samples, wall=2.0, users=1)
+    assert report["reruns"] == 101 and report["reruns_per_s"] == 50.5
+    assert report["actions"]["answer"]["count"] == 100
+    assert abs(report["actions"]["answer"]["p50_ms"] - 50.5) < 1e-6
+    assert report["actions"]["open"]["p99_ms"] == 500.0
@@ -0,0 +1,59 @@
+import urllib.request
+
+import metrics
+
+
+def test_disabled_metrics_leave_functions_untouched(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    metrics.reset()
+
+    def f(x):
+        return x + 1
+
+    assert metrics.timed("clf_f_seconds")(f) is f
+    metrics.inc("clf_calls_total")
+    metrics.observe("clf_f_seconds", 0.1)
+    assert "clf_calls_total" not in metrics.render()
+
+
+def test_histograms_and_counters_render_as_prometheus_text(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    metrics.reset()
+
+    @metrics.timed("clf_f_seconds", kind="test")
+    def f(x):
+        return x * 2
+
+    assert f(21) == 42
+    metrics.observe("clf_rerun_seconds", 0.003, scope="full")
+    metrics.observe("clf_rerun_seconds", 20.0, scope="full")
+    metrics.inc("clf_reruns_total", scope="full")
+    metrics.inc("clf_reruns_total", scope="full")
+    metrics.register("clf_parse_cache_hits_total", lambda: 7, kind="counter")
+    metrics.touch_session("a")
+    metrics.touch_session("b", now=-1e9)  # long expired
+
+    lines = metrics.render().splitlines()
+    assert "# TYPE clf_rerun_seconds histogram" in lines
+    assert 'clf_rerun_seconds_bucket{scope="full",le="0.0025"} 0' in lines
+    assert 'clf_rerun_seconds_bucket{scope="full",le="0.005"} 1' in lines
+    assert 'clf_rerun_seconds_bucket{scope="full",le="10.0"} 1' in lines
+    assert 'clf_rerun_seconds_bucket{scope="full",le="+Inf"} 2' in lines
+    assert 'clf_rerun_seconds_count{scope="full"} 2' in lines
+    assert 'clf_f_seconds_count{kind="test"} 1' in lines
+    assert 'clf_reruns_total{scope="full"} 2' in lines
+    assert "clf_parse_cache_hits_total 7" in lines
+    assert "clf_active_sessions 1" in lines
+    metrics.reset()
+
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    metrics.reset()
+    metrics.inc("clf_reruns_total", scope="question")
+    server = metrics.serve(0)
+    port = server.server_address[1]
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert 'clf_reruns_total{scope="question"} 1' in resp.read().decode()
+    metrics.reset()
@@ -0,0 +1,59 @@
+from collections import Counter
+from pathlib import Path
+
+from core import load_all_exams
+from mock_exam import EXAM_LENGTH, ExamSelection, answer_kind, build_bank_index, sample_exam
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def _bank(**kwargs):
+    return build_bank_index(load_all_exams(EXAMS, max_workers=1), **kwargs)
+
+
+def test_same_seed_same_exam_and_ids_resolve_to_questions():
+    bank = _bank()
+    ids = sample_exam(bank, seed=7)
+    assert len(ids) == EXAM_LENGTH == len(set(ids))
+    assert sample_exam(bank, seed=7) == ids
+    assert sample_exam(bank, seed=8) != ids
+
+    exam = ExamSelection(bank, ids)
+    assert len(exam) == EXAM_LENGTH
+    assert exam[0] in load_all_exams(EXAMS, max_workers=1).files[bank.file_name(ids[0])]
+
+
+def test_stratified_sample_keeps_answer_kind_mix():
+    bank = _bank()
+    share = len(bank.strata[("multi", "all")]) / len(bank)
+    kinds = Counter(answer_kind(bank.store[i]) for i in sample_exam(bank, seed=1))
+    assert abs(kinds["multi"] - round(EXAM_LENGTH * share)) <= 1
+
+
+def test_tag_filter_limits_topics():
+    bank = _bank(tag_of=lambda q: "s3" if "S3" in q.question else "other")
+    ids = sample_exam(bank, k=10, seed=3, tags=["s3"])
+    assert ids and all("S3" in bank.store[i].question for i in ids)
+    unstratified = sample_exam(bank, k=10, seed=3, tags=["s3"], stratify=False)
+    assert len(unstratified) == 10 and all("S3" in bank.store[i].question for i in unstratified)
+    assert sample_exam(bank, tags=["nothing"]) == []
+
+
+def test_domain_tags_and_service_index_drive_drills(tmp_path):
+    from tagger import SECURITY, TagIndex
+
+    index = load_all_exams(EXAMS, max_workers=1)
+    bank = build_bank_index(index, tags=TagIndex(tmp_path / "tags.json").tag_files(index.files))
+    assert SECURITY in bank.tags()
+    assert "S3" in bank.services and "EC2" in bank.services
+
+    ids = sample_exam(bank, k=10, seed=3, tags=[SECURITY])
+    assert len(ids) == 10 and all(i in bank.strata[(answer_kind(bank.store[i]), SECURITY)] for i in ids)
+    s3 = set(bank.services["S3"])
+    for stratify in (True, False):
+        ids = sample_exam(bank, k=5, seed=3, services=["S3"], stratify=stratify)
+        assert len(ids) == 5 and set(ids) <= s3
+    assert sample_exam(bank, services=["No Such Service"]) == []
+    either = s3 | set(bank.services["EC2"])
+    expected = {i for i in either if i in bank.strata[(answer_kind(bank.store[i]), SECURITY)]}
+    assert set(sample_exam(bank, k=len(bank), services=["S3", "EC2"], tags=[SECURITY])) == expected
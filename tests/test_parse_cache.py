@@ -0,0 +1,56 @@
+import os
+import time
+from pathlib import Path
+
+import core
+from parse_cache import ParseCache
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def test_warm_start_skips_parsing(tmp_path, monkeypatch):
+    path = EXAMS / "practice-exam-1.md"
+    data = path.read_bytes()
+    expected = core.parse_exam(data.decode("utf-8"))
+    assert ParseCache(tmp_path).parse(path, data) == expected
+
+    def fail(_):
+        raise AssertionError("parsed on a warm start")
+
+    monkeypatch.setattr("parse_cache.parse_exam", fail)
+    cache = ParseCache(tmp_path)  # fresh process, same directory
+    assert cache.parse(path, data) == expected
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 0
+
+
+def test_key_changes_with_content_and_parser_version(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    k = cache.key(Path("exams/a.md"), b"1. Q")
+    assert k != cache.key(Path("exams/a.md"), b"1. Q!")
+    assert k != cache.key(Path("exams/b.md"), b"1. Q")
+    monkeypatch.setattr("parse_cache.PARSER_VERSION", core.PARSER_VERSION + 1)
+    assert k != cache.key(Path("exams/a.md"), b"1. Q")
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ParseCache(tmp_path)
+    (tmp_path / "deadbeef.json").write_text("{not json", encoding="utf-8")
+    assert cache.get("deadbeef") is None and cache.stats["misses"] == 1
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    path = EXAMS / "practice-exam-1.md"
+    qs = core.parse_exam(path.read_text(encoding="utf-8"))
+    cache = ParseCache(tmp_path, max_bytes=10**9)
+    for key in ("old", "used", "new"):
+        cache.put(key, qs)
+    now = time.time()
+    os.utime(tmp_path / "old.json", (now - 30, now - 30))
+    os.utime(tmp_path / "used.json", (now - 20, now - 20))
+    os.utime(tmp_path / "new.json", (now - 10, now - 10))
+    assert cache.get("used") is not None  # touch: now the newest
+
+    cache.max_bytes = 2 * (tmp_path / "new.json").stat().st_size
+    cache.evict()
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["new", "used"]
+    assert cache.stats["evictions"] == 1
@@ -1,6 +1,10 @@
+import re
 import textwrap
+from pathlib import Path
 
-from core import parse_options, parse_exam, Option
+from core import Option, Question, _extract_correct_letters, format_exam, iter_exam, parse_exam, parse_options
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
 
 
 def test_parse_options_handles_letters_and_bullets():
@@ -39,3 +43,85 @@ def test_parse_exam_extracts_questions_and_correct_letters():
     assert [o.letter for o in qs[0].options] == ["A", "B", "C"]
     assert qs[0].correct == ["A", "C"]
     assert qs[1].correct == ["B"]
+
+
+# The original single-regex parser, kept as the reference for iter_exam.
+LEGACY_QUESTION_BLOCK_RE = re.compile(
+    r"(\d+)\.\s*(.*?)\n(.*?)<details[^>]*?>\s*<summary[^>]*?>\s*Answer\s*</summary>(.*?)</details>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def legacy_parse_exam(markdown_text):
+    out = []
+    for number_str, q_text, options_raw, details_raw in LEGACY_QUESTION_BLOCK_RE.findall(markdown_text):
+        options = parse_options(options_raw)
+        correct = _extract_correct_letters(details_raw, {o.letter for o in options})
+        out.append(Question(int(number_str), q_text.strip(), options, correct))
+    return out
+
+
+def test_parse_exam_matches_legacy_regex_on_all_exams():
+    for path in sorted(EXAMS.glob("*.md")):
+        text = path.read_text(encoding="utf-8")
+        assert parse_exam(text) == legacy_parse_exam(text), path.name
+
+
+def test_numbered_list_inside_answer_block_matches_legacy():
+    md = textwrap.dedent("""
+        1. Which is cheaper?
+        A. On-Demand
+        B. Spot
+        <details><summary>Answer</summary>
+        Explanation:
+        1. first reason
+        2. second reason
+        Correct answer: B
+        </details>
+
+        2. Next
+        A. Alpha
+        B. Beta
+        <details><summary>Answer</summary>Correct answer: A</details>
+    """).strip()
+    issues = []
+    qs = list(iter_exam(md.splitlines(), on_issue=issues.append))
+    assert qs == legacy_parse_exam(md)
+    assert [(q.number, q.correct) for q in qs] == [(1, ["B"]), (2, ["A"])] and issues == []
+
+
+def test_iter_exam_streams_from_file_object():
+    path = EXAMS / "practice-exam-1.md"
+    with open(path, encoding="utf-8") as f:
+        first = next(iter_exam(f))
+    assert first == parse_exam(path.read_text(encoding="utf-8"))[0]
+
+
+def test_iter_exam_reports_malformed_blocks_with_line_numbers():
+    md = textwrap.dedent("""
+        1. No answer block here
+        A. Alpha
+        B. Beta
+
+        2. Unclosed details
+        A. Alpha
+        B. Beta
+        <details><summary>Answer</summary>
+        Correct answer: B
+
+        3. Fine
+        A. Alpha
+        B. Beta
+        <details><summary>Answer</summary>Correct answer: A</details>
+    """).strip()
+    issues = []
+    qs = list(iter_exam(md.splitlines(), on_issue=issues.append))
+    assert [(q.number, q.correct) for q in qs] == [(2, ["B"]), (3, ["A"])]
+    assert [i.line for i in issues] == [1, 5]
+    assert "no answer block" in issues[0].message and "</details>" in issues[1].message
+
+
+def test_format_exam_roundtrips_every_exam():
+    for path in sorted(EXAMS.glob("*.md")):
+        qs = parse_exam(path.read_text(encoding="utf-8"))
+        assert parse_exam(format_exam(qs, path.stem)) == qs, path.name
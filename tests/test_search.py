@@ -0,0 +1,38 @@
+from core import Option, Question
+from search import SearchIndex
+
+
+def _q(number, text, *options):
+    return Question(number, text, [Option(chr(65 + i), t) for i, t in enumerate(options)], ["A"])
+
+
+def _index():
+    si = SearchIndex()
+    si.update_file("a.md", [
+        _q(1, "Which service gives cost optimization checks?", "AWS Trusted Advisor", "Amazon S3"),
+        _q(2, "Who terminated my EC2 instances?", "AWS CloudTrail", "AWS Config"),
+    ])
+    si.update_file("b.md", [_q(1, "What does Trusted Advisor check? Trusted Advisor only.", "Security", "Cost")])
+    return si
+
+
+def test_bm25_ranks_matching_questions_first():
+    hits = _index().search("trusted advisor")
+    assert [(h.file, h.question.number) for h in hits] == [("b.md", 1), ("a.md", 1)]
+    assert hits[0].score > hits[1].score > 0
+
+
+def test_prefix_queries():
+    si = _index()
+    assert [h.question.number for h in si.search("cloudtr")] == [2]
+    assert si.search("cloudtr", prefix_last=False) == []
+    assert [h.file for h in si.search("cloud* instances", prefix_last=False)] == ["a.md"]
+
+
+def test_update_file_replaces_only_that_file():
+    si = _index()
+    si.update_file("a.md", [_q(1, "Which service records API calls?", "AWS CloudTrail")])
+    assert [h.file for h in si.search("trusted")] == ["b.md"]
+    assert [(h.file, h.position) for h in si.search("cloudtrail")] == [("a.md", 0)]
+    si.update_file("b.md", [])
+    assert si.search("trusted") == [] and si.n_docs == 1
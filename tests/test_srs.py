@@ -0,0 +1,55 @@
+from core import Option, Question
+from srs import DAY, Card, Scheduler, question_uid, sm2
+
+
+def test_sm2_intervals_grow_and_reset_on_lapse():
+    c = sm2(Card(), 4, now=0)
+    assert (c.reps, c.interval_days, c.due) == (1, 1.0, DAY)
+    c = sm2(c, 4, now=c.due)
+    assert c.interval_days == 6.0
+    c = sm2(c, 5, now=c.due)
+    assert c.interval_days == round(6 * 2.5) and c.ease > 2.5
+    c = sm2(c, 1, now=c.due)
+    assert (c.reps, c.interval_days, c.lapses) == (0, 1.0, 1)
+
+
+def test_reviews_are_batched_persisted_and_due_in_order(tmp_path):
+    db = tmp_path / "srs.sqlite3"
+    s = Scheduler(db, batch_size=100, max_delay=3600)
+    s.review("ann", "q1", 1, now=0)      # due after 1 day
+    s.review("ann", "q2", 4, now=0)
+    s.review("ann", "q2", 4, now=DAY)    # due 6 days later
+    s.review("bob", "q1", 4, now=0)
+    assert s.card("ann", "q2").interval_days == 6.0  # pending reviews are visible before a flush
+    assert Scheduler(db).due("ann", now=10 * DAY) == []  # nothing written yet
+
+    assert s.due("ann", now=2 * DAY) == ["q1"]
+    assert s.due("ann", now=10 * DAY) == ["q1", "q2"]
+    assert s.due_count("bob", now=2 * DAY) == 1
+    assert Scheduler(db).due("ann", now=10 * DAY) == ["q1", "q2"]
+    assert s.db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 4
+    assert s.db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_due_skips_unknown_cards_before_the_limit(tmp_path):
+    s = Scheduler(tmp_path / "srs.sqlite3")
+    for i in range(5):
+        s.review("ann", f"gone{i}", 1, now=i)  # cards of questions no longer in the bank
+    s.review("ann", "live", 1, now=10)
+    assert s.due("ann", now=2 * DAY, limit=3) == ["gone0", "gone1", "gone2"]
+    assert s.due("ann", now=2 * DAY, limit=3, known={"live"}) == ["live"]
+    assert s.due_count("ann", now=2 * DAY, known={"live"}) == 1
+    known = {"live", "new"}
+    assert s.due_count("ann", now=2 * DAY, known=known) == 1
+    s.review("ann", "new", 1, now=0)
+    s.review("ann", "stale", 1, now=0)  # e.g. answered in an exam started before an edit
+    assert s.due("ann", now=2 * DAY, known=known) == ["new", "live"]
+    assert s.due_count("ann", now=2 * DAY, known=known) == 2
+    assert s.due_count("bob", now=2 * DAY, known=known) == 0
+
+
+def test_question_uid_changes_when_content_changes():
+    q = Question(3, "What is S3?", [Option("A", "Storage"), Option("B", "Queue")], ["A"])
+    uid = question_uid("practice-exam-1.md", q)
+    assert uid.startswith("practice-exam-1.md#3#")
+    assert question_uid("practice-exam-1.md", Question(3, "What is S3?", q.options, ["B"])) != uid
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from core import Option, Question, build_prompt, parse_exam
+from store import QuestionStore, letters_to_mask, mask_to_letters
+
+EXAMS = Path(__file__).resolve().parents[1] / "exams"
+
+
+def test_mask_roundtrip():
+    assert letters_to_mask(["A", "C"]) == 0b101
+    assert mask_to_letters(0b10010) == ["B", "E"]
+    assert mask_to_letters(0) == []
+
+
+def test_store_views_match_parsed_questions():
+    qs = parse_exam((EXAMS / "practice-exam-1.md").read_text(encoding="utf-8"))
+    store = QuestionStore.from_questions(qs)
+    assert len(store) == len(qs)
+    for q, view in zip(qs, store):
+        assert view == q
+        assert (view.number, view.question, view.options, view.correct) == (q.number, q.question, q.options, q.correct)
+    assert store[-1] == qs[-1]
+
+
+def test_build_prompt_accepts_store_views():
+    q = Question(7, "What is S3?", [Option("A", "Object storage"), Option("B", "A queue")], ["A"])
+    view = QuestionStore.from_questions([q])[0]
+    assert build_prompt(view, "English") == build_prompt(q, "English")
+
+
+def test_slotted_dataclasses_have_no_instance_dict():
+    assert not hasattr(Option("A", "x"), "__dict__")
+    assert not hasattr(Question(1, "q", [], []), "__dict__")
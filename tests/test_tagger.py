@@ -0,0 +1,56 @@
+from core import Option, Question
+from tagger import BILLING, CONCEPTS, SECURITY, TECHNOLOGY, Automaton, Tagger, TagIndex
+
+
+def _q(text, correct_text="", number=1):
+    return Question(number, text, [Option("A", correct_text or "None of these"), Option("B", "Amazon EC2")], ["A"])
+
+
+def test_automaton_finds_overlapping_phrases_on_word_boundaries():
+    auto = Automaton([(["key", "management", "service"], "kms"), (["management"], "mgmt"), (["s3"], "s3")])
+    assert list(auto.find("aws key management service and s3".split())) == ["mgmt", "kms", "s3"]  # in order of the last word
+    assert list(auto.find(["s3x", "keys"])) == []
+
+
+def test_tags_come_from_question_and_correct_options_only():
+    tagger = Tagger()
+    t = tagger.tag(_q("Which service protects against DDoS attacks?", "AWS Shield"))
+    assert (t.domain, t.services) == (SECURITY, ("Shield",))
+    t = tagger.tag(_q("Which service stores objects?", "Amazon S3 (Simple Storage Service)"))
+    assert (t.domain, t.services) == (TECHNOLOGY, ("S3",))  # EC2 is only a distractor
+    assert tagger.tag(_q("Which support plan includes a Technical Account Manager?")).domain == BILLING
+    assert tagger.tag(_q("What is a benefit of moving to the cloud?", "Go global in minutes")).domain == CONCEPTS
+
+
+def test_tag_index_is_incremental_and_persistent(tmp_path):
+    path = tmp_path / "tags.json"
+    files = {"a.md": [_q("Where are AWS CloudTrail logs stored?", "Amazon S3")], "b.md": [_q("What is IAM?")]}
+    first = TagIndex(path)
+    tags = first.tag_files(files)
+    assert first.stats == {"cached": 0, "tagged": 2}
+    assert tags["a.md"][0].services == ("CloudTrail", "S3")
+
+    files["b.md"] = [_q("What does AWS Budgets do?")]
+    second = TagIndex(path)
+    tags = second.tag_files(files)
+    assert second.stats == {"cached": 1, "tagged": 1}
+    assert tags["b.md"][0].services == ("Budgets",)
+    assert TagIndex(path).tag_files(files) == tags
+
+
+def test_tagging_a_subset_keeps_the_rest_of_the_cache(tmp_path):
+    path = tmp_path / "tags.json"
+    files = {"a.md": [_q("What is Amazon S3?")], "b.md": [_q("What is IAM?")]}
+    TagIndex(path).tag_files(files)
+    TagIndex(path).tag_files({"b.md": [_q("What does AWS Budgets do?")]})
+    again = TagIndex(path)
+    again.tag_files({"a.md": files["a.md"]})
+    assert again.stats == {"cached": 1, "tagged": 0}
+
+
+def test_saving_is_best_effort(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+    index = TagIndex(blocker / "tags.json")  # its folder cannot be created
+    tags = index.tag_files({"a.md": [_q("What is Amazon S3?")]})
+    assert tags["a.md"][0].services == ("S3",) and list(tmp_path.iterdir()) == [blocker]
@@ -0,0 +1,78 @@
+import os
+import time
+
+from benchmarks.corpus import synthetic_exam
+from watcher import ExamWatcher, parse_file
+
+
+def _write(path, text, bump=0):
+    path.write_text(text, encoding="utf-8")
+    if bump:  # make the edit visible even on coarse mtime clocks
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+
+def test_refresh_reparses_only_changed_files_and_keeps_old_snapshots(tmp_path):
+    for i in (1, 2, 10):
+        _write(tmp_path / f"practice-exam-{i}.md", synthetic_exam(3, seed=i))
+    parsed = []
+    watcher = ExamWatcher(tmp_path, loader=lambda p: parsed.append(p.name) or parse_file(p))
+
+    changes = watcher.refresh()
+    first = watcher.snapshot
+    assert changes.added == ["practice-exam-1.md", "practice-exam-10.md", "practice-exam-2.md"]
+    assert first.files == ("practice-exam-1.md", "practice-exam-2.md", "practice-exam-10.md")
+    assert not watcher.refresh() and watcher.snapshot is first
+
+    parsed.clear()
+    _write(tmp_path / "practice-exam-2.md", synthetic_exam(5, seed=9), bump=10**9)
+    _write(tmp_path / "practice-exam-3.md", synthetic_exam(1))
+    (tmp_path / "practice-exam-10.md").unlink()
+    changes = watcher.refresh()
+    second = watcher.snapshot
+
+    assert (changes.added, changes.changed, changes.removed) == (
+        ["practice-exam-3.md"], ["practice-exam-2.md"], ["practice-exam-10.md"])
+    assert sorted(parsed) == ["practice-exam-2.md", "practice-exam-3.md"]
+    assert second.files == ("practice-exam-1.md", "practice-exam-2.md", "practice-exam-3.md")
+    assert second.questions["practice-exam-1.md"] is first.questions["practice-exam-1.md"]
+    assert len(second.questions["practice-exam-2.md"]) == 5
+    # the earlier snapshot is untouched
+    assert len(first.questions["practice-exam-2.md"]) == 3 and "practice-exam-10.md" in first.questions
+
+
+def test_background_polling_picks_up_new_files(tmp_path):
+    watcher = ExamWatcher(tmp_path, interval=0.05, debounce=0)
+    watcher.refresh()
+    seen = []
+    watcher.on_change(lambda snapshot, changes: seen.append(changes.added))
+    watcher.start(force_polling=True)
+    try:
+        assert watcher.mode == "polling"
+        _write(tmp_path / "practice-exam-1.md", synthetic_exam(2))
+        deadline = time.monotonic() + 5
+        while not watcher.snapshot.files and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert watcher.snapshot.files == ("practice-exam-1.md",)
+        assert seen == [["practice-exam-1.md"]]
+    finally:
+        watcher.stop()
+
+
+def test_seeded_snapshot_is_kept_and_only_later_edits_are_parsed(tmp_path):
+    from core import load_all_exams
+    from watcher import scan
+
+    for i in (1, 2):
+        _write(tmp_path / f"practice-exam-{i}.md", synthetic_exam(3, seed=i))
+    parsed = []
+    watcher = ExamWatcher(tmp_path, loader=lambda p: parsed.append(p.name) or parse_file(p))
+    stats = scan(tmp_path)
+    assert watcher.seed(load_all_exams(tmp_path, max_workers=1).files, stats)
+    assert watcher.snapshot.files == ("practice-exam-1.md", "practice-exam-2.md")
+    assert not watcher.seed({}, {})  # only the first snapshot can be seeded
+    assert not watcher.refresh() and parsed == []
+
+    _write(tmp_path / "practice-exam-2.md", synthetic_exam(4, seed=5), bump=10**9)
+    assert watcher.refresh().changed == ["practice-exam-2.md"] and parsed == ["practice-exam-2.md"]
+    assert len(watcher.snapshot.questions["practice-exam-2.md"]) == 4
@@ -0,0 +1,207 @@
+# watcher.py
+"""Keeps the parsed exams in step with the exams folder while the app runs.
+
+``ExamWatcher.refresh`` compares every *.md's (mtime, size) with the previous
+scan and parses only files that were added or changed. It then publishes a new
+immutable ``BankSnapshot`` with a single reference swap. Unchanged files share
+their QuestionStore with the previous snapshot. A session that holds a
+snapshot (or one of its stores) keeps seeing exactly that version until it
+restarts.
+
+The first snapshot comes from ``refresh`` or from ``seed``, which takes
+exams already loaded elsewhere (the app loads them in a process pool, from
+the bank and parse cache), so startup parses the corpus once. ``start``
+refreshes on inotify events via watchdog when that package is installed, and
+otherwise polls every ``interval`` seconds, once a first snapshot exists.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from core import ExamIndex, Question, exam_sort_key, parse_exam
+from store import QuestionStore
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional dependency: fall back to polling
+    Observer = None
+    FileSystemEventHandler = object
+
+log = logging.getLogger("exam.watcher")
+
+Stat = Tuple[int, int]  # (mtime_ns, size)
+
+
+@dataclass(frozen=True)
+class BankSnapshot:
+    version: int
+    files: Tuple[str, ...]                  # exam file names in exam order
+    questions: Mapping[str, QuestionStore]  # read-only
+    stats: Mapping[str, Stat] = field(repr=False)
+
+    def exam_index(self) -> ExamIndex:
+        """The snapshot as a core.ExamIndex over its stores (no copies, no timings)."""
+        index = ExamIndex(files={}, offsets={}, timings={})
+        for name in self.files:
+            index.files[name] = self.questions[name]
+            index.offsets[name] = index.total
+            index.total += len(self.questions[name])
+        return index
+
+
+@dataclass
+class Changes:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def parse_file(path: Path) -> List[Question]:
+    return parse_exam(path.read_text(encoding="utf-8"))
+
+
+def scan(folder: Path) -> Dict[str, Stat]:
+    if not folder.is_dir():
+        return {}
+    out: Dict[str, Stat] = {}
+    with os.scandir(folder) as it:
+        for entry in it:
+            if entry.name.endswith(".md") and entry.is_file():
+                st = entry.stat()
+                out[entry.name] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, wake: threading.Event):
+        self.wake = wake
+
+    def on_any_event(self, event):
+        paths = [getattr(event, "src_path", ""), getattr(event, "dest_path", "")]
+        if any(str(p).endswith(".md") for p in paths):
+            self.wake.set()
+
+
+class ExamWatcher:
+    def __init__(self, folder: Path, loader: Callable[[Path], List[Question]] = parse_file,
+                 interval: float = 2.0, debounce: float = 0.2):
+        self.folder = Path(folder)
+        self.loader = loader
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshot = BankSnapshot(0, (), MappingProxyType({}), MappingProxyType({}))
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+        self._listeners: List[Callable[[BankSnapshot, Changes], None]] = []
+        self.ready = threading.Event()  # set once a first snapshot is in place
+
+    def on_change(self, callback: Callable[[BankSnapshot, Changes], None]):
+        """Called from the watcher thread after each snapshot swap that changed something."""
+        self._listeners.append(callback)
+
+    def seed(self, files: Mapping[str, Sequence[Question]], stats: Mapping[str, Stat]) -> bool:
+        """Publish the first snapshot from exams loaded elsewhere; False if one already exists.
+
+        Listeners are not called: there is nothing they could have seen before.
+
+        ``stats`` must come from a ``scan`` taken before the files were read, so
+        an edit made during the load is picked up by the next refresh.
+        """
+        with self._refresh_lock:
+            if self.ready.is_set():
+                return False
+            questions = {name: QuestionStore.from_questions(qs) for name, qs in files.items()}
+            stats = {name: stat for name, stat in stats.items() if name in questions}
+            self.snapshot = BankSnapshot(1, tuple(sorted(questions, key=exam_sort_key)),
+                                         MappingProxyType(questions), MappingProxyType(stats))
+            self.ready.set()
+        return True
+
+    def refresh(self) -> Changes:
+        """Rescan the folder, re-parse what changed and swap in a new snapshot."""
+        with self._refresh_lock:
+            old = self.snapshot
+            stats = scan(self.folder)
+            changes = Changes(
+                added=sorted(set(stats) - set(old.stats)),
+                changed=sorted(n for n in stats if n in old.stats and stats[n] != old.stats[n]),
+                removed=sorted(set(old.stats) - set(stats)),
+            )
+            self.ready.set()
+            if not changes:
+                return changes
+            questions = dict(old.questions)
+            for name in changes.removed:
+                questions.pop(name, None)
+            for name in changes.added + changes.changed:
+                try:
+                    questions[name] = QuestionStore.from_questions(self.loader(self.folder / name))
+                except (OSError, UnicodeDecodeError):
+                    # removed or half-written between scan and read: pick it up on the next pass
+                    stats.pop(name)
+                    if name in old.questions:
+                        stats[name] = old.stats[name]
+                    else:
+                        questions.pop(name, None)
+            files = tuple(sorted(questions, key=exam_sort_key))
+            self.snapshot = BankSnapshot(old.version + 1, files, MappingProxyType(questions),
+                                         MappingProxyType(stats))
+        for callback in self._listeners:
+            callback(self.snapshot, changes)
+        return changes
+
+    # ---- background ----
+    def start(self, force_polling: bool = False) -> "ExamWatcher":
+        if self._thread is not None:
+            return self
+        if Observer is not None and not force_polling and self.folder.is_dir():
+            self._observer = Observer()
+            self._observer.schedule(_Handler(self._wake), str(self.folder), recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, name="exam-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._observer is not None else "polling"
+
+    def _run(self):
+        # with inotify the timeout is only a safety net for missed events
+        timeout = self.interval if self._observer is None else max(self.interval, 30.0)
+        while not self._stop.is_set():
+            if self._wake.wait(timeout):
+                time.sleep(self.debounce)  # let an editor finish its burst of writes
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if not self.ready.is_set():  # the first snapshot is still being loaded or seeded
+                continue
+            try:
+                self.refresh()
+            except Exception:  # keep watching; the current snapshot stays in place
+                log.exception("refreshing %s failed", self.folder)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None